@@ -0,0 +1,172 @@
+"""
+Check if `BatchScene` follows the same rules as `Scene`
+
+Usage: `python -m games.arkanoid.batch_parity <difficulty> <level> [log_file ...]
+[--games B] [--frames N] [--seed S]`
+
+If the log files are specified, the commands recorded in each log file are
+replayed in a game of `Scene` and a game of `BatchScene`. Otherwise, `B` games
+are updated with the random commands for `N` frames, and the game is reset
+when it's over or passed. The direction of the ball forced to be served after
+150 frames is different because of the different random number generators,
+so the ball speed of `BatchScene` is set to the one of `Scene` at that frame.
+The scene information and the number of times catching the ball are compared
+at each frame.
+"""
+
+import argparse
+import random
+import sys
+
+import numpy as np
+
+from mlgame.recorder import load_log_file
+
+from .game.batch import ACTION_CODES, BatchScene
+from .game.gamecore import Scene, GameStatus
+from .game.gameobject import PlatformAction, SERVE_BALL_ACTIONS
+
+def load_commands(log_file_path) -> list:
+    """
+    Load the commands of the ml client "ml" from a log file
+    """
+    return load_log_file(log_file_path)["ml"]["command"]
+
+def get_random_command(rng, scene_info, random_ratio, can_serve):
+    """
+    Get a random command, or the command moving the platform toward the ball
+    at the probability of 1 - `random_ratio`
+
+    @param can_serve Whether the serving commands can be chosen
+    """
+    if rng.random() < random_ratio:
+        actions = [action for action in PlatformAction
+            if can_serve or action not in SERVE_BALL_ACTIONS]
+        return rng.choice(actions).value
+
+    ball_x = scene_info["ball"][0] + 2
+    platform_x = scene_info["platform"][0] + 20
+    if ball_x > platform_x:
+        return PlatformAction.MOVE_RIGHT.value
+    if ball_x < platform_x:
+        return PlatformAction.MOVE_LEFT.value
+    return PlatformAction.NONE.value
+
+def check_parity(difficulty, level: int, num_games: int, num_frames: int,
+        seed = None, command_lists = None) -> list:
+    """
+    Update `Scene` and `BatchScene` with the same commands and compare them
+
+    @param difficulty The difficulty "EASY" or "NORMAL"
+    @param level The level of the bricks
+    @param num_games The number of games. It's ignored if `command_lists` is specified.
+    @param num_frames The number of frames to be updated.
+           It's ignored if `command_lists` is specified.
+    @param seed The seed of the random commands and the forced serving
+    @param command_lists The list of the recorded commands of each game.
+           If it's specified, each game ends when it's over or passed or
+           its commands are used up. Otherwise, the games are updated with
+           the random commands, and the games with the smaller index choose
+           more random commands. The games with the odd index never serve
+           the ball, so the ball is forced to be served.
+    @return A list of the descriptions of the mismatches. It's empty if
+            `BatchScene` has the same result as `Scene`.
+    """
+    if command_lists is not None:
+        num_games = len(command_lists)
+        num_frames = max((len(commands) for commands in command_lists), default = 0)
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    scenes = [Scene(difficulty, level) for _ in range(num_games)]
+    batch_scene = BatchScene(num_games, difficulty, level, seed, auto_reset = False)
+    random_ratios = [0.05 + 0.9 * i / num_games for i in range(num_games)]
+    running = [True] * num_games
+
+    def get_command(game_id, frame):
+        if command_lists is None:
+            return get_random_command(rng, scenes[game_id].get_scene_info(),
+                random_ratios[game_id], game_id % 2 == 0)
+
+        commands = command_lists[game_id]
+        if frame >= len(commands):
+            running[game_id] = False
+            return None
+        return commands[frame]
+
+    mismatches = []
+    for frame in range(num_frames):
+        commands = [get_command(game_id, frame) for game_id in range(num_games)]
+        actions = [PlatformAction(command) if command in PlatformAction.__members__
+            else PlatformAction.NONE for command in commands]
+        batch_scene.step(np.array([ACTION_CODES[action.value] for action in actions]))
+
+        for game_id, (scene, action) in enumerate(zip(scenes, actions)):
+            if not running[game_id]:
+                continue
+
+            was_served = scene._ball_served
+            status = scene.update(action)
+            # Sync the direction of the forced serving
+            if (not was_served and scene._ball_served and
+                    action not in SERVE_BALL_ACTIONS):
+                batch_scene.ball_speeds[game_id] = scene._ball._speed
+
+            expected = scene.get_scene_info()
+            result = batch_scene.get_scene_info(game_id)
+            if expected != result:
+                mismatches.append(
+                    "Frame {}, game {}: The scene information {} is expected, "
+                    "but got {}".format(frame, game_id, expected, result))
+            if scene.catch_ball_times != batch_scene.catch_ball_times[game_id]:
+                mismatches.append(
+                    "Frame {}, game {}: The catching ball times {} is expected, "
+                    "but got {}".format(frame, game_id, scene.catch_ball_times,
+                    batch_scene.catch_ball_times[game_id]))
+
+            if status != GameStatus.GAME_ALIVE:
+                if command_lists is None:
+                    scene.reset()
+                    batch_scene.reset([game_id])
+                else:
+                    running[game_id] = False
+
+        if mismatches or not any(running):
+            break
+
+    return mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog = "python -m games.arkanoid.batch_parity",
+        description = "Check if BatchScene follows the same rules as Scene")
+    parser.add_argument("difficulty", choices = ("EASY", "NORMAL"),
+        help = "The game style. Choices: %(choices)s")
+    parser.add_argument("level", type = int, help = "The level map")
+    parser.add_argument("log_files", nargs = "*", metavar = "log_file",
+        help = "The log files of which the commands are replayed. "
+        "If not specified, the random commands are used.")
+    parser.add_argument("--games", type = int, default = 64, metavar = "B",
+        help = "The number of games of the random commands [default: %(default)s]")
+    parser.add_argument("--frames", type = int, default = 5000, metavar = "N",
+        help = "The number of frames of the random commands [default: %(default)s]")
+    parser.add_argument("--seed", type = int, default = 0, metavar = "S",
+        help = "The seed of the random commands and the forced serving "
+        "[default: %(default)s]")
+    args = parser.parse_args()
+
+    command_lists = None
+    if args.log_files:
+        command_lists = [load_commands(path) for path in args.log_files]
+
+    mismatches = check_parity(args.difficulty, args.level, args.games, args.frames,
+        args.seed, command_lists)
+    if mismatches:
+        print("\n".join(mismatches))
+        sys.exit(1)
+
+    if command_lists is None:
+        print("BatchScene has the same result as Scene in {} games * {} frames"
+            .format(args.games, args.frames))
+    else:
+        print("BatchScene has the same result as Scene in {} log files"
+            .format(len(command_lists)))
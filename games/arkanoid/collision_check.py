@@ -0,0 +1,68 @@
+"""
+Check the collision cases of the ball and the platform which have been broken before
+
+Usage: `python -m games.arkanoid.collision_check`
+
+In each case, the platform moves, and then the ball moves and checks bouncing
+as `Scene.update()`. The position and the speed of the ball after bouncing and
+the number of times catching the ball are compared with the expected ones.
+"""
+
+import sys
+
+from .game.gamecore import Scene
+from .game.gameobject import Ball, Platform, PlatformAction
+
+# (description, ball position, ball speed, platform position, platform action,
+#  expected ball position, expected ball speed, expected catching ball times)
+CASES = (
+    ("The ball falls onto the still platform",
+        (100, 390), (7, 7), (75, 400), PlatformAction.NONE,
+        (107, 395), (7, -7), 1),
+    ("The platform slides into the ball",
+        (167, 399), (-7, 7), (125, 400), PlatformAction.MOVE_RIGHT,
+        (170, 406), (7, 7), 1),
+    ("The ball passes the top of the platform and hits its side",
+        (181, 403), (-7, 7), (140, 400), PlatformAction.NONE,
+        (180, 410), (7, 7), 1),
+)
+
+def run_case(ball_pos, ball_speed, platform_pos, platform_action):
+    """
+    Update the platform and the ball for a frame
+
+    @return A tuple (`ball_pos`, `ball_speed`, `catch_ball_times`) after bouncing
+    """
+    ball = Ball(ball_pos, Scene.area_rect, False)
+    platform = Platform(platform_pos, Scene.area_rect)
+    ball._speed = list(ball_speed)
+
+    platform.move(platform_action)
+    ball.move()
+    ball.check_bouncing(platform)
+
+    return ball.pos, tuple(ball._speed), ball.hit_platform_times
+
+def check_cases() -> list:
+    """
+    Run all cases
+
+    @return A list of the descriptions of the failed cases
+    """
+    failures = []
+    for (description, ball_pos, ball_speed, platform_pos, platform_action,
+            *expected) in CASES:
+        result = run_case(ball_pos, ball_speed, platform_pos, platform_action)
+        if result != tuple(expected):
+            failures.append("{}: The ball {} is expected, but got {}"
+                .format(description, tuple(expected), result))
+
+    return failures
+
+if __name__ == "__main__":
+    failures = check_cases()
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+    print("All {} cases passed".format(len(CASES)))
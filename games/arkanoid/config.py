@@ -20,6 +20,7 @@ import pygame
 
 GAME_SETUP = {
     "game": Arkanoid,
+    "support_headless": True,
     "ml_clients": [
         { "name": "ml" }
     ]
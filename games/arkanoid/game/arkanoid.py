@@ -3,9 +3,11 @@ import pygame
 from .gamecore import GameStatus, PlatformAction, Scene
 
 class Arkanoid:
-    def __init__(self, difficulty, level: int):
+    def __init__(self, difficulty, level: int, headless = False):
         self._scene = Scene(difficulty, level)
-        self._pygame_init()
+        self._headless = headless
+        if not self._headless:
+            self._pygame_init()
 
     def _pygame_init(self):
         """
@@ -27,7 +29,8 @@ class Arkanoid:
             if command["ml"] in PlatformAction.__members__ else PlatformAction.NONE)
 
         game_status = self._scene.update(command)
-        self._draw_screen()
+        if not self._headless:
+            self._draw_screen()
 
         if (game_status == GameStatus.GAME_OVER or
             game_status == GameStatus.GAME_PASS):
@@ -0,0 +1,425 @@
+"""
+The batched arkanoid game of which the states are stored in NumPy arrays
+
+`BatchScene` updates many rounds of the arkanoid game at once by the array
+operations. It follows the same rules as `Scene`, `Ball`, and `Platform`,
+but there is no sprite and no drawing. All games play the same level at
+the same difficulty. The collision and the bouncing are calculated by
+`mlgame.gamedev.physics.batch`.
+
+NumPy is required for this module.
+"""
+
+import numpy as np
+
+from mlgame.gamedev import physics
+from mlgame.gamedev.physics import batch as physics_batch
+
+from .gamecore import Difficulty, GameStatus, Scene, _load_level
+from .gameobject import PlatformAction
+
+# The code of each action used in the action array
+ACTION_CODES = {
+    PlatformAction.SERVE_TO_LEFT.value: 0,
+    PlatformAction.SERVE_TO_RIGHT.value: 1,
+    PlatformAction.MOVE_LEFT.value: 2,
+    PlatformAction.MOVE_RIGHT.value: 3,
+    PlatformAction.NONE.value: 4,
+}
+_ACTION_SERVE_TO_RIGHT = ACTION_CODES[PlatformAction.SERVE_TO_RIGHT.value]
+_ACTION_MOVE_LEFT = ACTION_CODES[PlatformAction.MOVE_LEFT.value]
+_ACTION_MOVE_RIGHT = ACTION_CODES[PlatformAction.MOVE_RIGHT.value]
+# The ball speed of each serving action code
+_SERVE_SPEEDS = np.array([(-7, -7), (7, -7)], dtype = np.int64)
+
+# The status of each status code used in the status array
+GAME_STATUSES = (
+    GameStatus.GAME_ALIVE.value,
+    GameStatus.GAME_OVER.value,
+    GameStatus.GAME_PASS.value,
+)
+_STATUS_ALIVE = 0
+_STATUS_OVER = 1
+_STATUS_PASS = 2
+
+# The initial objects of `Scene`
+_AREA_RECT = tuple(Scene.area_rect)
+_INIT_BALL_RECT = (93, 395, 5, 5)
+_INIT_PLATFORM_RECT = (75, 400, 40, 5)
+_PLATFORM_SHIFT_SPEED = 5
+_BRICK_SIZE = (25, 10)
+# The ball is forced to be served from this frame
+_FORCE_SERVING_FRAME = 150
+
+_MAX_ORDER = np.iinfo(np.int64).max
+
+class BatchScene:
+    """
+    Update many rounds of the arkanoid game at once
+
+    For example:
+    ```python
+    scene = BatchScene(1024, "NORMAL", 3, seed = 0)
+    while True:
+        actions = my_policy(scene.balls, scene.platforms, scene.bricks_alive)
+        dones, statuses, frames = scene.step(actions)
+    ```
+
+    The bricks of the level are shared by all games, and whether each brick
+    is alive in each game is stored in a bool array. The order of adding
+    the bricks to the group in `Scene` is also stored, because the ball bounces
+    off the first hit brick in that order, and the hard brick hit by the ball
+    is added back to the end of the group.
+
+    The ball is forced to be served at a random direction after 150 frames,
+    which is the same as `Scene`, but the random number generator is different.
+
+    @var num_games The number of games
+    @var brick_rects An int array of shape (number of bricks, 4).
+         The rect (x, y, width, height) of each brick in the level.
+    @var is_hard_brick A bool array of shape (number of bricks, ).
+         Whether the brick is a hard brick.
+    @var balls An int array of shape (num_games, 4). The rect of the ball.
+    @var ball_speeds An int array of shape (num_games, 2). The speed (x, y) of the ball.
+    @var ball_served A bool array of shape (num_games, ). Whether the ball is served.
+    @var platforms An int array of shape (num_games, 4). The rect of the platform.
+    @var platform_speeds An int array of shape (num_games, 2).
+         The speed (x, y) of the platform at the last frame.
+    @var bricks_alive A bool array of shape (num_games, number of bricks).
+         Whether the brick is not destroyed.
+    @var brick_hps An int array of shape (num_games, number of bricks).
+         The HP of the brick. It's 2 for the hard brick which is not hit, and 1 for
+         the normal brick or the hard brick which has been hit.
+    @var catch_ball_times An int array of shape (num_games, ).
+         The number of times the ball hits the platform.
+    @var statuses An int array of shape (num_games, ). The status code of each game,
+         which is the index of `GAME_STATUSES`.
+    @var frames An int array of shape (num_games, ). The frame number of each game.
+    """
+
+    def __init__(self, num_games: int, difficulty, level: int, seed = None,
+            auto_reset: bool = True):
+        """
+        Constructor
+
+        @param num_games The number of games
+        @param difficulty The difficulty "EASY" or "NORMAL"
+        @param level The level of the bricks
+        @param seed The seed of the random number generator for forcing to serve the ball
+        @param auto_reset Whether to reset the game which is over or passed in `step()`.
+               If it's False, the game stays at the last frame and isn't updated
+               until it's reset by `reset()`.
+        """
+        if num_games < 1:
+            raise ValueError("The number of games should be positive")
+
+        self.num_games = num_games
+        self._enable_slide_ball = difficulty != Difficulty.EASY
+        self._auto_reset = auto_reset
+        self._rng = np.random.default_rng(seed)
+
+        bricks = _load_level(level)
+        num_bricks = len(bricks)
+        self.brick_rects = np.array([(x, y, *_BRICK_SIZE) for x, y, _ in bricks],
+            dtype = np.int64).reshape(num_bricks, 4)
+        self.is_hard_brick = np.array([type == 1 for _, _, type in bricks], dtype = bool)
+        self._init_brick_hps = np.where(self.is_hard_brick, 2, 1).astype(np.int8)
+
+        self.balls = np.zeros((num_games, 4), dtype = np.int64)
+        self.ball_speeds = np.zeros((num_games, 2), dtype = np.int64)
+        self.ball_served = np.zeros(num_games, dtype = bool)
+        self.platforms = np.zeros((num_games, 4), dtype = np.int64)
+        self.platform_speeds = np.zeros((num_games, 2), dtype = np.int64)
+        self.bricks_alive = np.zeros((num_games, num_bricks), dtype = bool)
+        self.brick_hps = np.zeros((num_games, num_bricks), dtype = np.int8)
+        # The order of adding the brick to the group in `Scene`
+        self._brick_orders = np.zeros((num_games, num_bricks), dtype = np.int64)
+        self._next_brick_orders = np.zeros(num_games, dtype = np.int64)
+        self.catch_ball_times = np.zeros(num_games, dtype = np.int64)
+        self.statuses = np.zeros(num_games, dtype = np.int8)
+        self.frames = np.zeros(num_games, dtype = np.int64)
+
+        self.reset()
+
+    def reset(self, game_ids = None):
+        """
+        Reset the games to the initial state
+
+        @param game_ids The indices of the games to be reset. If it's None,
+               reset all games.
+        """
+        if game_ids is None:
+            game_ids = np.arange(self.num_games)
+        game_ids = np.asarray(game_ids, dtype = np.int64)
+        if game_ids.size == 0:
+            return
+
+        self.balls[game_ids] = _INIT_BALL_RECT
+        self.ball_speeds[game_ids] = 0
+        self.ball_served[game_ids] = False
+        self.platforms[game_ids] = _INIT_PLATFORM_RECT
+        self.platform_speeds[game_ids] = 0
+        self.bricks_alive[game_ids] = True
+        self.brick_hps[game_ids] = self._init_brick_hps
+        self._brick_orders[game_ids] = np.arange(self.brick_rects.shape[0])
+        self._next_brick_orders[game_ids] = self.brick_rects.shape[0]
+        self.catch_ball_times[game_ids] = 0
+        self.statuses[game_ids] = _STATUS_ALIVE
+        self.frames[game_ids] = 0
+
+    def step(self, actions):
+        """
+        Update all games for one frame
+
+        If `auto_reset` is True, the game which is over or passed at this frame
+        is reset after updating, so the returned arrays are the only place to
+        get its result. Otherwise, only the alive games are updated.
+
+        @param actions An int array of shape (num_games, ). The action code
+               defined in `ACTION_CODES` for each game.
+        @return A tuple (`dones`, `statuses`, `frames`). `dones` is a bool array
+                of which the element is True if the game is over or passed.
+                `statuses` and `frames` are the status code and the frame number
+                of each game at this frame before resetting.
+        """
+        actions = np.asarray(actions, dtype = np.int64)
+        if actions.shape != (self.num_games, ):
+            raise ValueError("The shape of the actions should be ({}, )"
+                .format(self.num_games))
+
+        game_ids = np.flatnonzero(self.statuses == _STATUS_ALIVE)
+        actions = actions[game_ids]
+        self.frames[game_ids] += 1
+
+        self._move_platforms(game_ids, actions)
+
+        serving = ~self.ball_served[game_ids]
+        self._wait_for_serving_balls(game_ids[serving], actions[serving])
+        self._move_balls(game_ids[~serving])
+
+        passed = ~self.bricks_alive[game_ids].any(axis = 1)
+        over = self.balls[game_ids, 1] >= self.platforms[game_ids, 1] + self.platforms[game_ids, 3]
+        self.statuses[game_ids] = np.where(passed, _STATUS_PASS,
+            np.where(over, _STATUS_OVER, _STATUS_ALIVE))
+
+        statuses = self.statuses.copy()
+        frames = self.frames.copy()
+        dones = statuses != _STATUS_ALIVE
+        if self._auto_reset:
+            self.reset(np.flatnonzero(dones))
+
+        return dones, statuses, frames
+
+    def _move_platforms(self, game_ids, actions):
+        """
+        Move the platforms as `Platform.move()`
+        """
+        area_left, _, area_width, _ = _AREA_RECT
+        platform_x = self.platforms[game_ids, 0]
+        moving_left = (actions == _ACTION_MOVE_LEFT) & (platform_x > area_left)
+        moving_right = ((actions == _ACTION_MOVE_RIGHT) &
+            (platform_x + self.platforms[game_ids, 2] < area_left + area_width))
+
+        speed_x = np.where(moving_left, -_PLATFORM_SHIFT_SPEED,
+            np.where(moving_right, _PLATFORM_SHIFT_SPEED, 0))
+        self.platform_speeds[game_ids, 0] = speed_x
+        self.platforms[game_ids, 0] += speed_x
+
+    def _wait_for_serving_balls(self, game_ids, actions):
+        """
+        Stick the balls on the platforms, and serve them if the action is serving
+        """
+        if game_ids.size == 0:
+            return
+
+        # Force to serve the ball after 150 frames
+        forced = ((self.frames[game_ids] >= _FORCE_SERVING_FRAME) &
+            (actions > _ACTION_SERVE_TO_RIGHT))
+        actions = actions.copy()
+        actions[forced] = self._rng.integers(0, 2, size = np.count_nonzero(forced))
+
+        # The same as setting `Rect.centerx`
+        self.balls[game_ids, 0] = (self.platforms[game_ids, 0] +
+            self.platforms[game_ids, 2] // 2 - self.balls[game_ids, 2] // 2)
+
+        serving = actions <= _ACTION_SERVE_TO_RIGHT
+        serving_ids = game_ids[serving]
+        self.ball_speeds[serving_ids] = _SERVE_SPEEDS[actions[serving]]
+        self.ball_served[serving_ids] = True
+
+    def _move_balls(self, game_ids):
+        """
+        Move the balls and bounce them off the bricks, the platforms, and the wall
+        """
+        if game_ids.size == 0:
+            return
+
+        balls = self.balls[game_ids]
+        speeds = self.ball_speeds[game_ids]
+        last_balls = balls.copy()
+        balls[:, :2] += speeds
+
+        hits = (physics_batch.collide_or_contact(balls, self.brick_rects) &
+            self.bricks_alive[game_ids])
+        hit_rows = np.flatnonzero(hits.any(axis = 1))
+        if hit_rows.size > 0:
+            self._hit_bricks(game_ids[hit_rows], balls, speeds, hits[hit_rows], hit_rows)
+
+        self._bounce_off_platforms(game_ids, last_balls, balls, speeds)
+        physics_batch.bounce_in_box_ip(balls, speeds, _AREA_RECT)
+
+        self.balls[game_ids] = balls
+        self.ball_speeds[game_ids] = speeds
+
+    def _hit_bricks(self, game_ids, balls, speeds, hits, rows):
+        """
+        Destroy the hit bricks and bounce the balls off them as `Ball.check_hit_brick()`
+
+        @param game_ids The games of which the ball hits any brick
+        @param balls The rects of the balls to be updated in place
+        @param speeds The speeds of the balls to be updated in place
+        @param hits The bool array of shape (len(game_ids), number of bricks)
+               of the hit bricks
+        @param rows The indices in `balls` and `speeds` of the games
+        """
+        # Find the first two hit bricks in the order of the group
+        brick_orders = self._brick_orders[game_ids]
+        hit_orders = np.where(hits, brick_orders, _MAX_ORDER)
+        first_ids = hit_orders.argmin(axis = 1)
+        hit_orders[np.arange(game_ids.size), first_ids] = _MAX_ORDER
+        second_ids = hit_orders.argmin(axis = 1)
+
+        first_rects = self.brick_rects[first_ids]
+        second_rects = self.brick_rects[second_ids]
+        combined = ((hits.sum(axis = 1) == 2) &
+            ((first_rects[:, 1] == second_rects[:, 1]) |
+             (first_rects[:, 0] == second_rects[:, 0])))
+        union_topleft = np.minimum(first_rects[:, :2], second_rects[:, :2])
+        union_bottomright = np.maximum(first_rects[:, :2] + first_rects[:, 2:],
+            second_rects[:, :2] + second_rects[:, 2:])
+        union_rects = np.hstack((union_topleft, union_bottomright - union_topleft))
+        hit_rects = np.where(combined[:, None], union_rects, first_rects)
+
+        self.bricks_alive[game_ids] &= ~hits
+
+        hit_balls = balls[rows]
+        hit_speeds = speeds[rows]
+        physics_batch.bounce_off_ip(hit_balls, hit_speeds, hit_rects,
+            np.zeros((game_ids.size, 2), dtype = np.int64))
+        balls[rows] = hit_balls
+        speeds[rows] = hit_speeds
+
+        # The hard brick is added back if it's hit at the normal speed at the first time
+        hit_hard_bricks = hits & self.is_hard_brick & (np.abs(hit_speeds[:, 0]) == 7)[:, None]
+        if not hit_hard_bricks.any():
+            return
+
+        brick_hps = self.brick_hps[game_ids]
+        brick_hps[hit_hard_bricks] -= 1
+        self.brick_hps[game_ids] = brick_hps
+
+        added_back = hit_hard_bricks & (brick_hps > 0)
+        added_rows = np.flatnonzero(added_back.any(axis = 1))
+        if added_rows.size > 0:
+            self._add_bricks_back(game_ids[added_rows], added_back[added_rows],
+                brick_orders[added_rows])
+
+    def _add_bricks_back(self, game_ids, added_back, brick_orders):
+        """
+        Make the bricks alive again and move them to the end of the group order
+        in their original order
+        """
+        added_orders = np.where(added_back, brick_orders, _MAX_ORDER)
+        ranks = added_orders.argsort(axis = 1).argsort(axis = 1)
+        self._brick_orders[game_ids] = np.where(added_back,
+            self._next_brick_orders[game_ids, None] + ranks, brick_orders)
+        self._next_brick_orders[game_ids] += added_back.sum(axis = 1)
+        self.bricks_alive[game_ids] |= added_back
+
+    def _bounce_off_platforms(self, game_ids, last_balls, balls, speeds):
+        """
+        Bounce the balls off the platforms and slice them as `Ball.check_bouncing()`
+        """
+        platforms = self.platforms[game_ids]
+        # `collide_or_contact()` of each ball and its platform
+        hit = np.all((balls[:, :2] <= platforms[:, :2] + platforms[:, 2:]) &
+            (balls[:, :2] + balls[:, 2:] >= platforms[:, :2]), axis = 1)
+        # The additional check for passing the corner of the platform
+        below_top = balls[:, 1] + balls[:, 3] > platforms[:, 1]
+        hit |= below_top & np.isfinite(
+            physics_batch.swept_aabb(last_balls, balls, platforms)[0])
+        # The platform slides into the ball. It rarely happens, so the corner
+        # routines are checked one by one.
+        sliding_into = below_top & ~hit & np.all(
+            (last_balls[:, :2] < platforms[:, :2] + platforms[:, 2:]) &
+            (last_balls[:, :2] + last_balls[:, 2:] > platforms[:, :2]), axis = 1)
+        for row in np.flatnonzero(sliding_into):
+            hit[row] = _bottom_corners_collide(last_balls[row], balls[row], platforms[row])
+
+        rows = np.flatnonzero(hit)
+        if rows.size == 0:
+            return
+
+        self.catch_ball_times[game_ids[rows]] += 1
+
+        hit_balls = balls[rows]
+        hit_speeds = speeds[rows]
+        last_speeds_x = hit_speeds[:, 0].copy()
+        platform_speeds = self.platform_speeds[game_ids[rows]]
+        physics_batch.bounce_off_ip(hit_balls, hit_speeds, platforms[rows], platform_speeds)
+
+        # Slice the ball when the ball goes up after bouncing (not game over)
+        if self._enable_slide_ball:
+            platform_speeds_x = platform_speeds[:, 0]
+            directions = np.where(last_speeds_x > 0, 1, -1)
+            sliced_speeds_x = np.where(platform_speeds_x == 0, 7 * directions,
+                np.where(last_speeds_x * platform_speeds_x > 0,
+                    10 * directions, -7 * directions))
+            hit_speeds[:, 0] = np.where(hit_speeds[:, 1] < 0,
+                sliced_speeds_x, hit_speeds[:, 0])
+
+        balls[rows] = hit_balls
+        speeds[rows] = hit_speeds
+
+    def get_brick_ids(self, game_id: int):
+        """
+        Get the indices of the alive bricks of a game in the order of the group in `Scene`
+
+        @return An int array of the indices in `brick_rects`
+        """
+        brick_ids = np.flatnonzero(self.bricks_alive[game_id])
+        return brick_ids[np.argsort(self._brick_orders[game_id, brick_ids])]
+
+    def get_scene_info(self, game_id: int) -> dict:
+        """
+        Get the scene information of a game, which is the same as the one
+        of `Scene.get_scene_info()`
+        """
+        brick_ids = self.get_brick_ids(game_id)
+        is_full_hp = self.brick_hps[game_id, brick_ids] == 2
+
+        return {
+            "frame": int(self.frames[game_id]),
+            "status": GAME_STATUSES[self.statuses[game_id]],
+            "ball": _to_pos(self.balls[game_id]),
+            "platform": _to_pos(self.platforms[game_id]),
+            "bricks": [_to_pos(self.brick_rects[i]) for i in brick_ids[~is_full_hp]],
+            "hard_bricks": [_to_pos(self.brick_rects[i]) for i in brick_ids[is_full_hp]]
+        }
+
+def _bottom_corners_collide(last_rect, rect, target_rect):
+    """
+    Check if the routine of the bottom-left or the bottom-right corner of
+    the moving rect collides the target rect
+    """
+    last_left, last_top, width, height = (int(v) for v in last_rect)
+    left, top = int(rect[0]), int(rect[1])
+    target_rect = tuple(int(v) for v in target_rect)
+
+    return (physics.rect_collideline_xy(target_rect,
+                last_left, last_top + height, left, top + height) or
+            physics.rect_collideline_xy(target_rect,
+                last_left + width, last_top + height, left + width, top + height))
+
+def _to_pos(rect):
+    return int(rect[0]), int(rect[1])
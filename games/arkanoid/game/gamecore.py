@@ -1,10 +1,11 @@
+import os.path
 import pygame
 import random
 
 from mlgame.utils.enum import StringEnum, auto
 
 from .gameobject import (
-    Ball, Platform, Brick, HardBrick, PlatformAction, SERVE_BALL_ACTIONS
+    Ball, Platform, Brick, BrickGroup, HardBrick, PlatformAction, SERVE_BALL_ACTIONS
 )
 
 class Difficulty(StringEnum):
@@ -16,6 +17,42 @@ class GameStatus(StringEnum):
     GAME_OVER = auto()
     GAME_PASS = auto()
 
+# The parsed level data, {level: ((pos_x, pos_y, type), ...)}
+_level_cache = {}
+
+def _load_level(level: int) -> tuple:
+    """
+    Load the bricks of the level from "level_data/<level>.dat"
+
+    The first line of the file is the offset of the bricks, and each of
+    the following lines is the position and the type of a brick.
+    The file is parsed only once, and the result is cached for the later scenes.
+
+    @return A tuple of (pos_x, pos_y, type) of the bricks,
+            and the positions are already added with the offset
+    """
+    bricks = _level_cache.get(level)
+    if bricks is not None:
+        return bricks
+
+    def get_coordinate_and_type(string):
+        string = string.rstrip("\n").split(' ')
+        return int(string[0]), int(string[1]), int(string[2])
+
+    dir_path = os.path.dirname(__file__)
+    level_file_path = os.path.join(dir_path, "level_data/{0}.dat".format(level))
+
+    bricks = []
+    with open(level_file_path, 'r') as input_file:
+        offset_x, offset_y, _ = get_coordinate_and_type(input_file.readline())
+        for input_pos in input_file:
+            pos_x, pos_y, type = get_coordinate_and_type(input_pos)
+            bricks.append((pos_x + offset_x, pos_y + offset_y, type))
+
+    bricks = tuple(bricks)
+    _level_cache[level] = bricks
+    return bricks
+
 class Scene:
     area_rect = pygame.Rect(0, 0, 200, 500)
 
@@ -25,6 +62,8 @@ class Scene:
         self._frame_count = 0
         self._game_status = GameStatus.GAME_ALIVE
         self._ball_served = False
+        # The scene information of the current frame
+        self._scene_info = None
 
         self._create_scene()
 
@@ -39,46 +78,38 @@ class Scene:
         self._platform = Platform((75, 400), Scene.area_rect, self._group_move)
 
     def _create_bricks(self, level: int):
-        def get_coordinate_and_type(string):
-            string = string.rstrip("\n").split(' ')
-            return int(string[0]), int(string[1]), int(string[2])
-
-        self._group_brick = pygame.sprite.RenderPlain()
+        self._group_brick = BrickGroup()
         self._brick_container = []
 
-        import os.path
-        dir_path = os.path.dirname(__file__)
-        level_file_path = os.path.join(dir_path, "level_data/{0}.dat".format(level))
-
-        with open(level_file_path, 'r') as input_file:
-            offset_x, offset_y, _ = get_coordinate_and_type(input_file.readline())
-            for input_pos in input_file:
-                pos_x, pos_y, type = get_coordinate_and_type(input_pos.rstrip("\n"))
-                BrickType = {
-                    0: Brick,
-                    1: HardBrick,
-                }.get(type, Brick)
+        for pos_x, pos_y, type in _load_level(level):
+            BrickType = {
+                0: Brick,
+                1: HardBrick,
+            }.get(type, Brick)
 
-                brick = BrickType((pos_x + offset_x, pos_y + offset_y),
-                    self._group_brick)
-                self._brick_container.append(brick)
+            brick = BrickType((pos_x, pos_y), self._group_brick)
+            self._brick_container.append(brick)
 
     def reset(self):
         self._frame_count = 0
         self._game_status = GameStatus.GAME_ALIVE
         self._ball_served = False
+        self._scene_info = None
         self._ball.reset()
         self._platform.reset()
-        self._group_brick.empty()
-        self._group_brick.add(*self._brick_container)
 
-        # Reset the HP of hard bricks
+        # Reset the HP of hard bricks before adding them back to the group,
+        # so that they are regarded as hard bricks by the group.
         for brick in self._brick_container:
             if isinstance(brick, HardBrick):
                 brick.reset()
 
+        self._group_brick.empty()
+        self._group_brick.add(*self._brick_container)
+
     def update(self, platform_action: PlatformAction) -> GameStatus:
         self._frame_count += 1
+        self._scene_info = None
         self._platform.move(platform_action)
 
         if not self._ball_served:
@@ -120,23 +151,21 @@ class Scene:
     def get_scene_info(self) -> dict:
         """
         Get the scene information
+
+        The scene information is generated once per frame, and the same object
+        is returned until the scene is updated or reset. It shouldn't be modified.
         """
-        scene_info = {
-            "frame": self._frame_count,
-            "status": self._game_status.value,
-            "ball": self._ball.pos,
-            "platform": self._platform.pos,
-            "bricks": [],
-            "hard_bricks": []
-        }
-
-        for brick in self._group_brick:
-            if isinstance(brick, HardBrick) and brick.hp == 2:
-                scene_info["hard_bricks"].append(brick.pos)
-            else:
-                scene_info["bricks"].append(brick.pos)
-
-        return scene_info
+        if self._scene_info is None:
+            self._scene_info = {
+                "frame": self._frame_count,
+                "status": self._game_status.value,
+                "ball": self._ball.pos,
+                "platform": self._platform.pos,
+                "bricks": self._group_brick.get_brick_positions(),
+                "hard_bricks": self._group_brick.get_hard_brick_positions()
+            }
+
+        return self._scene_info
 
     @property
     def catch_ball_times(self) -> int:
@@ -1,27 +1,45 @@
 import pygame
 from pygame import Rect, Surface
-from pygame.math import Vector2
 from pygame.sprite import Sprite
 import random
 
 from mlgame.gamedev import physics
 from mlgame.utils.enum import StringEnum, auto
 
-class Brick(Sprite):
-    def __init__(self, init_pos, *groups):
-        super().__init__(*groups)
+BRICK_COLOR = (244, 158, 66)        # Orange
+HARD_BRICK_COLOR = (209, 31, 31)    # Red
 
-        self.rect = Rect(init_pos[0], init_pos[1], 25, 10)
-        self.image = self._create_surface((244, 158, 66))   # Orange
+# The images shared by the bricks of the same size and color,
+# {((width, height), color): Surface}
+_brick_surfaces = {}
 
-    def _create_surface(self, color):
-        surface = Surface((self.rect.width, self.rect.height))
+def _get_brick_surface(size, color):
+    """
+    Get the shared image of the brick of the specified size and color
+
+    The image is created at the first request and reused afterward,
+    so it shouldn't be modified.
+    """
+    surface = _brick_surfaces.get((size, color))
+    if surface is None:
+        width, height = size
+        surface = Surface(size)
         surface.fill(color)
         pygame.draw.line(surface, (0, 0, 0),
-            (self.rect.width - 1, 0), (self.rect.width - 1, self.rect.height - 1))
+            (width - 1, 0), (width - 1, height - 1))
         pygame.draw.line(surface, (0, 0, 0),
-            (0, self.rect.height - 1), (self.rect.width - 1, self.rect.height - 1))
-        return surface
+            (0, height - 1), (width - 1, height - 1))
+        _brick_surfaces[(size, color)] = surface
+
+    return surface
+
+class Brick(Sprite):
+    def __init__(self, init_pos, *groups):
+        # The rect is set before adding to groups for the grid index of `BrickGroup`
+        self.rect = Rect(init_pos[0], init_pos[1], 25, 10)
+        super().__init__(*groups)
+
+        self.image = _get_brick_surface(self.rect.size, BRICK_COLOR)
 
     @property
     def pos(self):
@@ -29,6 +47,8 @@ class Brick(Sprite):
 
 class HardBrick(Brick):
     def __init__(self, init_pos, *groups):
+        # The HP is set before adding to groups for classifying by `BrickGroup`
+        self.hp = 2
         super().__init__(init_pos, *groups)
 
         self.reset()
@@ -36,7 +56,7 @@ class HardBrick(Brick):
     def reset(self):
         self.hp = 2
         # Override the origin color
-        self.image = self._create_surface((209, 31, 31))    # Red
+        self.image = _get_brick_surface(self.rect.size, HARD_BRICK_COLOR)
 
     def hit(self):
         """
@@ -45,10 +65,104 @@ class HardBrick(Brick):
         @return The remaining HP
         """
         self.hp -= 1
-        self.image = self._create_surface((244, 158, 66))   # Orange
+        self.image = _get_brick_surface(self.rect.size, BRICK_COLOR)
 
         return self.hp
 
+class BrickGroup(pygame.sprite.RenderPlain):
+    """
+    The sprite group of bricks with a uniform grid index
+
+    Each brick is registered to the grid cells which its rect covers, including
+    the right and bottom border. The index is updated when a brick is added to or
+    removed from the group, so the bricks near a rect can be found without
+    scanning the whole group.
+
+    The positions of the bricks and the hard bricks are also maintained in
+    the order of the group. A hard brick is regarded as a normal brick if its
+    HP is not full when it's added to the group.
+    """
+    def __init__(self, *sprites, cell_size = 32):
+        """
+        Constructor
+
+        @param sprites The bricks to be added
+        @param cell_size The width and the height of a grid cell
+        """
+        self._cell_size = cell_size
+        # {(cell_x, cell_y): {brick: None}}
+        self._cells = {}
+        # The order of the brick added to the group
+        self._add_orders = {}
+        self._next_add_order = 0
+        # {brick: pos}
+        self._brick_positions = {}
+        self._hard_brick_positions = {}
+
+        super().__init__(*sprites)
+
+    def _iter_cells(self, rect: Rect):
+        """
+        Iterate the cells covered by the rect, including the right and bottom border
+        """
+        cell_size = self._cell_size
+        for cell_x in range(rect.left // cell_size, rect.right // cell_size + 1):
+            for cell_y in range(rect.top // cell_size, rect.bottom // cell_size + 1):
+                yield cell_x, cell_y
+
+    def add_internal(self, sprite, *args):
+        super().add_internal(sprite, *args)
+
+        self._add_orders[sprite] = self._next_add_order
+        self._next_add_order += 1
+        for cell in self._iter_cells(sprite.rect):
+            self._cells.setdefault(cell, {})[sprite] = None
+
+        if isinstance(sprite, HardBrick) and sprite.hp == 2:
+            self._hard_brick_positions[sprite] = sprite.pos
+        else:
+            self._brick_positions[sprite] = sprite.pos
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+
+        del self._add_orders[sprite]
+        for cell in self._iter_cells(sprite.rect):
+            bricks = self._cells[cell]
+            del bricks[sprite]
+            if not bricks:
+                del self._cells[cell]
+
+        self._brick_positions.pop(sprite, None)
+        self._hard_brick_positions.pop(sprite, None)
+
+    def get_bricks_near(self, rect: Rect) -> list:
+        """
+        Get the bricks registered to the cells covered by the rect
+
+        The bricks are sorted in the order of the group, which is the same
+        as the order of `sprites()`.
+        """
+        candidates = set()
+        for cell in self._iter_cells(rect):
+            bricks = self._cells.get(cell)
+            if bricks:
+                candidates.update(bricks)
+
+        return sorted(candidates, key = self._add_orders.__getitem__)
+
+    def get_brick_positions(self) -> list:
+        """
+        Get a list of the positions of the bricks, excluding the hard bricks with full HP
+        """
+        return list(self._brick_positions.values())
+
+    def get_hard_brick_positions(self) -> list:
+        """
+        Get a list of the positions of the hard bricks with full HP
+        """
+        return list(self._hard_brick_positions.values())
+
 class PlatformAction(StringEnum):
     SERVE_TO_LEFT = auto()
     SERVE_TO_RIGHT = auto()
@@ -143,14 +257,14 @@ class Ball(Sprite):
             self._platform_additional_check(platform)):
             self.hit_platform_times += 1
 
-            rect_after_bounce, speed_after_bounce = physics.bounce_off(
+            self.rect.x, self.rect.y, speed_x, speed_y = physics.bounce_off_xy(
                 self.rect, self._speed, platform.rect, platform._speed)
             # Check slicing ball when the ball goes up after bouncing (not game over)
-            if self._do_slide_ball and speed_after_bounce[1] < 0:
-                speed_after_bounce[0] = self._slice_ball(self._speed[0], platform._speed[0])
+            if self._do_slide_ball and speed_y < 0:
+                speed_x = self._slice_ball(self._speed[0], platform._speed[0])
 
-            self.rect = rect_after_bounce
-            self._speed = speed_after_bounce
+            self._speed[0] = speed_x
+            self._speed[1] = speed_y
 
         if physics.rect_break_or_contact_box(self.rect, self._play_area_rect):
             physics.bounce_in_box_ip(self.rect, self._speed, self._play_area_rect)
@@ -160,11 +274,19 @@ class Ball(Sprite):
         The additional checking for the condition that the ball passes the corner of the platform
         """
         if self.rect.bottom > platform.rect.top:
-            routine_a = (Vector2(self._last_pos.bottomleft), Vector2(self.rect.bottomleft))
-            routine_b = (Vector2(self._last_pos.bottomright), Vector2(self.rect.bottomright))
-
-            return (physics.rect_collideline(platform.rect, routine_a) or
-                    physics.rect_collideline(platform.rect, routine_b))
+            if physics.swept_aabb(self._last_pos, self.rect, platform.rect) is not None:
+                return True
+
+            # The platform slides into the ball, which isn't regarded as
+            # a collision by `swept_aabb()`. Check the routines of the bottom-left
+            # and the bottom-right corners, so that the ball is still caught.
+            last_pos = self._last_pos
+            if last_pos.colliderect(platform.rect):
+                rect = self.rect
+                return (physics.rect_collideline_xy(platform.rect,
+                            last_pos.left, last_pos.bottom, rect.left, rect.bottom) or
+                        physics.rect_collideline_xy(platform.rect,
+                            last_pos.right, last_pos.bottom, rect.right, rect.bottom))
 
         return False
 
@@ -186,7 +308,7 @@ class Ball(Sprite):
         else:
             return -7 if ball_speed_x > 0 else 7
 
-    def check_hit_brick(self, group_brick: pygame.sprite.RenderPlain) -> int:
+    def check_hit_brick(self, group_brick: BrickGroup) -> int:
         """
         Check if the ball hits bricks in the `group_brick`.
         The hit bricks will be removed from `group_brick`, but the alive hard brick will not.
@@ -195,8 +317,13 @@ class Ball(Sprite):
         @param group_brick The sprite group containing bricks
         @return The number of destroyed bricks
         """
-        hit_bricks = pygame.sprite.spritecollide(self, group_brick, 1,
-            physics.collide_or_contact)
+        # Only check the bricks near the ball. It's the same as
+        # `pygame.sprite.spritecollide(self, group_brick, 1, physics.collide_or_contact)`.
+        hit_bricks = [brick for brick in group_brick.get_bricks_near(self.rect)
+            if physics.collide_or_contact(self, brick)]
+        for brick in hit_bricks:
+            brick.kill()
+
         num_of_destroyed_brick = len(hit_bricks)
 
         if num_of_destroyed_brick > 0:
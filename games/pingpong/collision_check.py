@@ -0,0 +1,75 @@
+"""
+Check the collision cases of the ball and the platform which have been broken before
+
+Usage: `python -m games.pingpong.collision_check`
+
+In each case, the platform 1P moves, and then the ball moves and checks
+bouncing as `Scene.update()`. The ball is sliced by the moving platform
+if slicing is enabled, which is the same as the "HARD" difficulty. The rect and the speed of the ball after bouncing
+are compared with the expected ones.
+"""
+
+import sys
+
+from .game.gamecore import Scene, color_1P, color_2P
+from .game.gameobject import Ball, Blocker, Platform, PlatformAction
+
+# (description, ball position, ball speed, platform action, enable slicing,
+#  expected ball position, expected ball speed)
+CASES = (
+    ("The ball falls onto the still platform",
+        (100, 410), (3, 7), PlatformAction.NONE, False, (103, 415), (3, -7)),
+    ("The platform slides into the ball, which then falls onto the platform",
+        (116, 413), (7, 7), PlatformAction.MOVE_RIGHT, False, (123, 415), (7, -7)),
+    ("The platform slides into the slow ball, which is pushed out from the side",
+        (122, 416), (2, 7), PlatformAction.MOVE_RIGHT, False, (125, 423), (-2, 7)),
+    ("The ball passes by the corner of the platform and bounces off",
+        (76, 414), (-7, 7), PlatformAction.NONE, False, (69, 415), (-7, -7)),
+    ("The ball leaves the corner of the platform which it touches, and isn't sliced",
+        (115, 415), (-7, -7), PlatformAction.MOVE_LEFT, True, (108, 408), (-7, -7)),
+)
+
+def run_case(ball_pos, ball_speed, platform_action, enable_slide_ball):
+    """
+    Update the platform 1P and the ball for a frame
+
+    @return A tuple (`ball_pos`, `ball_speed`) after bouncing
+    """
+    area_rect = Scene.area_rect
+    ball = Ball(area_rect, enable_slide_ball)
+    platform_1P = Platform((80, area_rect.height - 80), area_rect, "1P", color_1P)
+    platform_2P = Platform((80, 50), area_rect, "2P", color_2P)
+    blocker = Blocker(1000, area_rect)
+
+    ball.rect.topleft = ball_pos
+    ball._speed = list(ball_speed)
+
+    platform_1P.move(platform_action)
+    ball.move()
+    ball.check_bouncing(platform_1P, platform_2P, blocker)
+
+    return ball.pos, ball.speed
+
+def check_cases() -> list:
+    """
+    Run all cases
+
+    @return A list of the descriptions of the failed cases
+    """
+    failures = []
+    for (description, ball_pos, ball_speed, platform_action, enable_slide_ball,
+            expected_pos, expected_speed) in CASES:
+        result = run_case(ball_pos, ball_speed, platform_action, enable_slide_ball)
+        if result != (expected_pos, expected_speed):
+            failures.append("{}: The ball {} is expected, but got {}"
+                .format(description, (expected_pos, expected_speed), result))
+
+    return failures
+
+if __name__ == "__main__":
+    failures = check_cases()
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+    print("All {} cases passed".format(len(CASES)))
@@ -32,6 +32,7 @@ import pygame
 
 GAME_SETUP = {
     "game": PingPong,
+    "support_headless": True,
     "ml_clients": [
         { "name": "ml_1P", "args": ("1P",) },
         { "name": "ml_2P", "args": ("2P",) }
@@ -173,44 +173,62 @@ class Ball(pygame.sprite.Sprite):
         # and preserve the speed after bouncing.
         hit_box = physics.rect_break_or_contact_box(self.rect, self._play_area_rect)
         if hit_box:
-            self.rect, speed_after_hit_box = (
-                physics.bounce_in_box(self.rect, self._speed, self._play_area_rect))
+            self.rect.x, self.rect.y, speed_x_after_hit_box, _ = (
+                physics.bounce_in_box_xy(self.rect, self._speed, self._play_area_rect))
 
         # If the ball hits the specified sprites, adjust the position again
         # and preserve the speed after bouncing.
         hit_sprite = self._check_ball_hit_sprites((platform_1p, platform_2p, blocker))
         if hit_sprite:
-            self.rect, speed_after_bounce = physics.bounce_off(
+            (self.rect.x, self.rect.y,
+             speed_x_after_bounce, speed_y_after_bounce) = physics.bounce_off_xy(
                 self.rect, self._speed,
                 hit_sprite.rect, hit_sprite._speed)
 
             # Check slicing ball when the ball is caught by the platform
             if (self._do_slide_ball and
-               ((hit_sprite is platform_1p and speed_after_bounce[1] < 0) or
-                (hit_sprite is platform_2p and speed_after_bounce[1] > 0))):
-                speed_after_bounce[0] = self._slice_ball(self._speed, hit_sprite._speed[0])
+               ((hit_sprite is platform_1p and speed_y_after_bounce < 0) or
+                (hit_sprite is platform_2p and speed_y_after_bounce > 0))):
+                speed_x_after_bounce = self._slice_ball(self._speed, hit_sprite._speed[0])
 
         # Decide the final speed
         if hit_box:
-            self._speed[0] = speed_after_hit_box[0]
+            self._speed[0] = speed_x_after_hit_box
         if hit_sprite:
-            self._speed[1] = speed_after_bounce[1]
+            self._speed[1] = speed_y_after_bounce
             if not hit_box:
-                self._speed[0] = speed_after_bounce[0]
+                self._speed[0] = speed_x_after_bounce
 
     def _check_ball_hit_sprites(self, sprites):
         """
-        Get the first sprite in the `sprites` that the ball hits
+        Get the sprite in the `sprites` that the ball hits first
 
         @param sprites An iterable object that storing the target sprites
-        @return The first sprite in the `sprites` that the ball hits.
+        @return The sprite that the ball hits at the earliest time in the movement.
+                If there are multiple ones, return the first one in the `sprites`.
                 Return None, if none of them is hit by the ball.
         """
+        hit_sprite = None
+        hit_time = 2
         for sprite in sprites:
-            if physics.moving_collide_or_contact(self, sprite):
-                return sprite
-
-        return None
+            impact = physics.swept_aabb(self.last_pos, self.rect, sprite.rect)
+            if impact:
+                impact_time = impact[0]
+            # The ball already overlaps the sprite at the start of the movement,
+            # such as the platform slides into the ball. Use the corner routines
+            # to check it, so that the ball is still pushed out.
+            elif ((self.last_pos.colliderect(sprite.rect) or
+                   physics.collide_or_contact(self, sprite)) and
+                  physics.moving_collide_or_contact_xy(self.last_pos, self.rect, sprite.rect)):
+                impact_time = 0
+            else:
+                continue
+
+            if impact_time < hit_time:
+                hit_sprite = sprite
+                hit_time = impact_time
+
+        return hit_sprite
 
     def _slice_ball(self, ball_speed, platform_speed_x):
         """
@@ -3,12 +3,14 @@ import pygame
 from .gamecore import GameStatus, PlatformAction, Scene, color_1P, color_2P
 
 class PingPong:
-    def __init__(self, difficulty, game_over_score: int):
+    def __init__(self, difficulty, game_over_score: int, headless = False):
         self._score = [0, 0]    # 1P, 2P
         self._game_over_score = game_over_score
         self._scene = Scene(difficulty)
 
-        self._pygame_init()
+        self._headless = headless
+        if not self._headless:
+            self._pygame_init()
 
     def _pygame_init(self):
         pygame.display.init()
@@ -29,7 +31,8 @@ class PingPong:
             if command["ml_2P"] in PlatformAction.__members__ else PlatformAction.NONE)
 
         game_status = self._scene.update(command_1P, command_2P)
-        self._draw_screen()
+        if not self._headless:
+            self._draw_screen()
 
         if game_status != GameStatus.GAME_ALIVE:
             print(game_status.value)
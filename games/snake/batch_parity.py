@@ -0,0 +1,130 @@
+"""
+Check if `BatchScene` follows the same rules as `Scene`
+
+Usage: `python -m games.snake.batch_parity [--games B] [--frames N] [--width W]
+[--height H] [--seed S]`
+
+`B` games of `Scene` and a `BatchScene` of `B` games are updated with the same
+random action sequences for `N` frames. The position of the food is different
+because of the different random number generators, so the food of
+`BatchScene` is set to the one of `Scene` after the food is placed. The scene
+information, the end of the game, and the score are compared at each frame.
+"""
+
+import argparse
+import random
+import sys
+
+import numpy as np
+
+from .game.batch import ACTION_CODES, BatchScene
+from .game.gamecore import Scene, GameStatus
+from .game.gameobject import SnakeAction
+from .config import board_size
+
+def get_random_action(rng, scene_info, random_ratio):
+    """
+    Get a random action, or the action going toward the food at the probability
+    of 1 - `random_ratio`
+    """
+    if rng.random() < random_ratio:
+        return rng.choice(list(SnakeAction))
+
+    head_x, head_y = scene_info["snake_head"]
+    food_x, food_y = scene_info["food"]
+    if food_x > head_x:
+        return SnakeAction.RIGHT
+    if food_x < head_x:
+        return SnakeAction.LEFT
+    if food_y > head_y:
+        return SnakeAction.DOWN
+    return SnakeAction.UP
+
+def check_parity(num_games: int, num_frames: int, width: int = 30, height: int = 30,
+        seed = None) -> list:
+    """
+    Update `Scene` and `BatchScene` with the same random actions and compare them
+
+    The games with the smaller index choose more random actions, and the others
+    go toward the food more often, so both the short and the long snakes are checked.
+
+    @param num_games The number of games
+    @param num_frames The number of frames to be updated
+    @param width The number of cells in a row of the game area
+    @param height The number of cells in a column of the game area
+    @param seed The seed of the random actions and the food
+    @return A list of the descriptions of the mismatches. It's empty if
+            `BatchScene` has the same result as `Scene`.
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    scenes = [Scene(width, height) for _ in range(num_games)]
+    batch_scene = BatchScene(num_games, width, height, seed)
+    random_ratios = [0.05 + 0.9 * i / num_games for i in range(num_games)]
+
+    def sync_food(game_id):
+        food_x, food_y = scenes[game_id].get_scene_info()["food"]
+        batch_scene.set_food_pos(game_id, (food_x // 10, food_y // 10))
+
+    for game_id in range(num_games):
+        sync_food(game_id)
+
+    mismatches = []
+    for frame in range(num_frames):
+        actions = [get_random_action(rng, scene.get_scene_info(), ratio)
+            for scene, ratio in zip(scenes, random_ratios)]
+        dones, scores, _ = batch_scene.step(
+            np.array([ACTION_CODES[action.value] for action in actions]))
+
+        for game_id, (scene, action) in enumerate(zip(scenes, actions)):
+            last_score = scene.score
+            status = scene.update(action)
+            is_over = status == GameStatus.GAME_OVER
+
+            if is_over != dones[game_id] or scene.score != scores[game_id]:
+                mismatches.append(
+                    "Frame {}, game {}: The game over {} and the score {} are "
+                    "expected, but got {} and {}".format(frame, game_id,
+                    is_over, scene.score, bool(dones[game_id]), scores[game_id]))
+
+            if is_over:
+                scene.reset()
+                sync_food(game_id)
+                continue
+            if scene.score != last_score:
+                sync_food(game_id)
+
+            expected = scene.get_scene_info()
+            result = batch_scene.get_scene_info(game_id)
+            if expected != result:
+                mismatches.append(
+                    "Frame {}, game {}: The scene information {} is expected, "
+                    "but got {}".format(frame, game_id, expected, result))
+
+        if mismatches:
+            break
+
+    return mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog = "python -m games.snake.batch_parity",
+        description = "Check if BatchScene follows the same rules as Scene")
+    parser.add_argument("--games", type = int, default = 64, metavar = "B",
+        help = "The number of games [default: %(default)s]")
+    parser.add_argument("--frames", type = int, default = 5000, metavar = "N",
+        help = "The number of frames to be updated [default: %(default)s]")
+    parser.add_argument("--width", type = board_size, default = 30, metavar = "W",
+        help = "The number of cells in a row of the game area [default: %(default)s]")
+    parser.add_argument("--height", type = board_size, default = 30, metavar = "H",
+        help = "The number of cells in a column of the game area [default: %(default)s]")
+    parser.add_argument("--seed", type = int, default = 0, metavar = "S",
+        help = "The seed of the random actions and the food [default: %(default)s]")
+    args = parser.parse_args()
+
+    mismatches = check_parity(args.games, args.frames, args.width, args.height, args.seed)
+    if mismatches:
+        print("\n".join(mismatches))
+        sys.exit(1)
+
+    print("BatchScene has the same result as Scene in {} games * {} frames"
+        .format(args.games, args.frames))
@@ -0,0 +1,138 @@
+"""
+Measure the frames per second of the snake game as the snake grows
+
+Usage: `python -m games.snake.benchmark [width] [height] [--frames N] [--draw]`
+
+The snake moves along a Hamiltonian cycle of the game area, so it never hits
+itself or the wall. It's grown to each measured length by `Scene.grow_snake()`
+instead of eating the food, because eating the food to fill a large game area
+takes too many frames. At each length, the time of `Scene.update()` and
+`Scene.get_scene_info()` for `N` frames is measured. With `--draw`, the time of
+drawing the game objects to a surface is also included.
+"""
+
+import argparse
+import time
+
+import pygame
+
+from .game.gamecore import Scene, GameStatus
+from .game.gameobject import SnakeAction
+from .config import board_size
+
+def get_hamiltonian_cycle(width: int, height: int) -> dict:
+    """
+    Get a Hamiltonian cycle of the cells in the game area
+
+    The cycle zigzags the rows without the first column, and goes back to
+    the first row along the first column. If `height` is odd, the zigzag is
+    along the columns instead.
+
+    @return A dict mapping a cell (x, y) to the next cell in the cycle
+    """
+    transposed = height % 2 == 1
+    if transposed:
+        width, height = height, width
+    if height % 2 == 1:
+        raise ValueError("Either the width or the height should be even")
+
+    cycle = []
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cycle.extend((x, y) for x in xs)
+    cycle.extend((0, y) for y in range(height - 1, -1, -1))
+
+    if transposed:
+        cycle = [(y, x) for x, y in cycle]
+
+    return {cell: cycle[(i + 1) % len(cycle)] for i, cell in enumerate(cycle)}
+
+def get_action(head_pos, next_cell):
+    """
+    Get the action for moving the snake head to the next cell
+    """
+    head_x, head_y = head_pos[0] // 10, head_pos[1] // 10
+    if next_cell[0] > head_x:
+        return SnakeAction.RIGHT
+    if next_cell[0] < head_x:
+        return SnakeAction.LEFT
+    if next_cell[1] > head_y:
+        return SnakeAction.DOWN
+    return SnakeAction.UP
+
+def get_measured_lengths(num_cells: int) -> list:
+    """
+    Get the increasing snake lengths to be measured. The longest one leaves
+    some cells free, because the snake may eat the food while measuring.
+    """
+    lengths = [4]
+    for ratio in (0.01, 0.1, 0.25, 0.5, 0.75, 0.9):
+        length = int(num_cells * ratio)
+        if length > lengths[-1]:
+            lengths.append(length)
+
+    return lengths
+
+def run_benchmark(width: int, height: int, num_frames: int, draw: bool):
+    """
+    Run the benchmark and print the frames per second at each snake length
+
+    @param width The number of cells in a row of the game area
+    @param height The number of cells in a column of the game area
+    @param num_frames The number of frames to be measured at each snake length
+    @param draw Whether to draw the game objects at each frame
+    """
+    next_cells = get_hamiltonian_cycle(width, height)
+    scene = Scene(width, height)
+    surface = pygame.Surface(scene.area_rect.size) if draw else None
+
+    def step():
+        head_pos = scene.get_scene_info()["snake_head"]
+        head_cell = (head_pos[0] // 10, head_pos[1] // 10)
+        status = scene.update(get_action(head_pos, next_cells[head_cell]))
+        if status == GameStatus.GAME_OVER:
+            raise RuntimeError("The snake is dead")
+
+    print("Game area: {} * {} cells".format(width, height))
+    print("{:>10} {:>12} {:>12}".format("length", "frames/s", "us/frame"))
+
+    # The length of the snake including the head
+    length = 4
+    for target_length in get_measured_lengths(width * height):
+        # Grow the snake while moving along the cycle, so that the new bodies
+        # are also on the cycle.
+        while length < target_length:
+            step()
+            scene.grow_snake()
+            length += 1
+
+        start_time = time.perf_counter()
+        for _ in range(num_frames):
+            step()
+            if surface:
+                scene.draw_gameobjects(surface)
+        elapsed_time = time.perf_counter() - start_time
+
+        # The snake may eat the food while measuring
+        length = len(scene.get_scene_info()["snake_body"]) + 1
+        print("{:>10} {:>12.0f} {:>12.1f}".format(
+            target_length, num_frames / elapsed_time, elapsed_time / num_frames * 1e6))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog = "python -m games.snake.benchmark",
+        description = "Measure the frames per second of the snake game as the snake grows")
+    parser.add_argument("width", type = board_size, nargs = "?", default = 30,
+        help = "The number of cells in a row of the game area [default: %(default)s]")
+    parser.add_argument("height", type = board_size, nargs = "?", default = 30,
+        help = "The number of cells in a column of the game area [default: %(default)s]")
+    parser.add_argument("--frames", type = int, default = 2000, metavar = "N",
+        help = "The number of frames to be measured at each snake length "
+            "[default: %(default)s]")
+    parser.add_argument("--draw", action = "store_true",
+        help = "Also draw the game objects at each frame")
+    args = parser.parse_args()
+
+    if args.width % 2 == 1 and args.height % 2 == 1:
+        parser.error("Either the width or the height should be even")
+
+    run_benchmark(args.width, args.height, args.frames, args.draw)
@@ -1,9 +1,32 @@
-GAME_VERSION = "1.1"
+GAME_VERSION = "1.2"
+
+from argparse import ArgumentTypeError
+
+def board_size(string):
+    value = int(string)
+    if not 5 <= value <= 200:
+        raise ArgumentTypeError("should be in the range [5, 200]")
+    return value
+
 GAME_PARAMS = {
     "()": {
         "prog": "snake",
         "description": "A simple snake game",
-        "game_usage": "%(prog)s"
+        "game_usage": "%(prog)s [width] [height]"
+    },
+    "width": {
+        "type": board_size,
+        "nargs": "?",
+        "default": 30,
+        "help": ("[Optional] The number of cells in a row of the game area. "
+            "It should be in the range [5, 200]. [default: %(default)s]")
+    },
+    "height": {
+        "type": board_size,
+        "nargs": "?",
+        "default": 30,
+        "help": ("[Optional] The number of cells in a column of the game area. "
+            "It should be in the range [5, 200]. [default: %(default)s]")
     }
 }
 
@@ -11,6 +34,7 @@ from .game.snake import Snake
 
 GAME_SETUP = {
     "game": Snake,
+    "support_headless": True,
     "ml_clients": [
         { "name": "ml" }
     ]
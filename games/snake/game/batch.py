@@ -0,0 +1,277 @@
+"""
+The batched snake game of which the states are stored in NumPy arrays
+
+`BatchScene` updates many rounds of the snake game at once by the array
+operations. It follows the same rules as `Scene` and `Snake`, but there is
+no sprite and no drawing. The positions are in cells instead of pixels,
+the cell (x, y) is at (10 * x, 10 * y) pixels in `Scene`.
+
+NumPy is required for this module.
+"""
+
+import numpy as np
+
+from .gameobject import SnakeAction
+
+# The code of each action used in the action array
+ACTION_CODES = {
+    SnakeAction.UP.value: 0,
+    SnakeAction.DOWN.value: 1,
+    SnakeAction.LEFT.value: 2,
+    SnakeAction.RIGHT.value: 3,
+    SnakeAction.NONE.value: 4,
+}
+_ACTION_NONE = ACTION_CODES[SnakeAction.NONE.value]
+# The moving delta (x, y) in cells of each action code
+_MOVE_DELTAS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)], dtype = np.int32)
+
+# The initial snake of `Snake`
+_INIT_HEAD = (4, 4)
+_INIT_BODIES = ((4, 3), (4, 2), (4, 1))
+_INIT_ACTION = ACTION_CODES[SnakeAction.DOWN.value]
+
+# The number of tries of sampling a random cell before picking from all free cells
+_FOOD_SAMPLING_TRIES = 4
+
+class BatchScene:
+    """
+    Update many rounds of the snake game at once
+
+    For example:
+    ```python
+    scene = BatchScene(1024, seed = 0)
+    while True:
+        actions = my_policy(scene.heads, scene.foods, scene.body_grid)
+        dones, scores, frames = scene.step(actions)
+    ```
+
+    The bodies of each game are stored in a ring buffer from the head to
+    the tail, so moving the snake only writes the old head position to the slot
+    before the first body. The number of bodies at each cell is also stored in
+    a grid for checking the collision in constant time. The game which is over
+    is reset automatically in `step()`.
+
+    The food is placed at a uniformly random cell not occupied by the snake,
+    which is the same as `Scene`, but the random number generator is different.
+
+    @var num_games The number of games
+    @var width The number of cells in a row of the game area
+    @var height The number of cells in a column of the game area
+    @var heads An int array of shape (num_games, 2). The cell (x, y) of the snake head.
+    @var foods An int array of shape (num_games, 2). The cell (x, y) of the food.
+    @var body_grid A uint8 array of shape (num_games, height, width).
+         The number of snake bodies at each cell, excluding the head.
+    @var scores An int array of shape (num_games, ). The number of eaten food.
+    @var frames An int array of shape (num_games, ). The frame number of each game.
+    """
+
+    def __init__(self, num_games: int, width: int = 30, height: int = 30, seed = None):
+        """
+        Constructor
+
+        @param num_games The number of games
+        @param width The number of cells in a row of the game area
+        @param height The number of cells in a column of the game area
+        @param seed The seed of the random number generator for placing the food
+        """
+        if num_games < 1:
+            raise ValueError("The number of games should be positive")
+        if width < 5 or height < 5:
+            raise ValueError("The game area should be at least 5 * 5 cells")
+
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self._rng = np.random.default_rng(seed)
+
+        # The bodies may overlap the tail after growing, so the capacity is
+        # larger than the number of cells.
+        self._capacity = width * height + 1
+        self._bodies = np.zeros((num_games, self._capacity, 2), dtype = np.int32)
+        # The index of the first body in the ring buffer
+        self._body_starts = np.zeros(num_games, dtype = np.int64)
+        self._body_lengths = np.zeros(num_games, dtype = np.int64)
+        self._actions = np.zeros(num_games, dtype = np.int64)
+
+        self.heads = np.zeros((num_games, 2), dtype = np.int32)
+        self.foods = np.zeros((num_games, 2), dtype = np.int32)
+        self.body_grid = np.zeros((num_games, height, width), dtype = np.uint8)
+        self.scores = np.zeros(num_games, dtype = np.int64)
+        self.frames = np.zeros(num_games, dtype = np.int64)
+
+        self.reset()
+
+    def reset(self, game_ids = None):
+        """
+        Reset the games to the initial state
+
+        @param game_ids The indices of the games to be reset. If it's None,
+               reset all games.
+        """
+        if game_ids is None:
+            game_ids = np.arange(self.num_games)
+        game_ids = np.asarray(game_ids, dtype = np.int64)
+        if game_ids.size == 0:
+            return
+
+        self.heads[game_ids] = _INIT_HEAD
+        self.body_grid[game_ids] = 0
+        for i, (x, y) in enumerate(_INIT_BODIES):
+            self._bodies[game_ids, i] = (x, y)
+            self.body_grid[game_ids, y, x] += 1
+        self._body_starts[game_ids] = 0
+        self._body_lengths[game_ids] = len(_INIT_BODIES)
+        self._actions[game_ids] = _INIT_ACTION
+        self.scores[game_ids] = 0
+        self.frames[game_ids] = 0
+
+        self._place_food(game_ids)
+
+    def step(self, actions):
+        """
+        Update all games for one frame
+
+        The game which is over at this frame is reset after updating, so
+        the returned arrays are the only place to get its result.
+
+        @param actions An int array of shape (num_games, ). The action code
+               defined in `ACTION_CODES` for each game.
+        @return A tuple (`dones`, `scores`, `frames`). `dones` is a bool array
+                of which the element is True if the game is over at this frame.
+                `scores` and `frames` are the score and the frame number of
+                each game at this frame before resetting.
+        """
+        actions = np.asarray(actions, dtype = np.int64)
+        if actions.shape != (self.num_games, ):
+            raise ValueError("The shape of the actions should be ({}, )"
+                .format(self.num_games))
+
+        game_ids = np.arange(self.num_games)
+        self.frames += 1
+
+        # If there is no action, take the same action as the last frame.
+        actions = np.where(actions == _ACTION_NONE, self._actions, actions)
+        # If the head will go back to the first body,
+        # take the same action as the last frame.
+        first_bodies = self._bodies[game_ids, self._body_starts]
+        going_back = np.all(self.heads + _MOVE_DELTAS[actions] == first_bodies, axis = 1)
+        actions = np.where(going_back, self._actions, actions)
+        self._actions = actions
+
+        # Move the tail to the position of the head, which becomes the first body
+        tail_ids = (self._body_starts + self._body_lengths - 1) % self._capacity
+        tails = self._bodies[game_ids, tail_ids]
+        self.body_grid[game_ids, tails[:, 1], tails[:, 0]] -= 1
+        self._body_starts = (self._body_starts - 1) % self._capacity
+        self._bodies[game_ids, self._body_starts] = self.heads
+        self.body_grid[game_ids, self.heads[:, 1], self.heads[:, 0]] += 1
+
+        self.heads += _MOVE_DELTAS[actions]
+
+        # Eat the food
+        eating = np.all(self.heads == self.foods, axis = 1)
+        eating_ids = game_ids[eating]
+        if eating_ids.size > 0:
+            self.scores[eating_ids] += 1
+            self._place_food(eating_ids)
+            self._grow(eating_ids)
+
+        # Hit the wall or the body
+        heads_x = self.heads[:, 0]
+        heads_y = self.heads[:, 1]
+        in_area = ((heads_x >= 0) & (heads_x < self.width) &
+            (heads_y >= 0) & (heads_y < self.height))
+        dones = ~in_area
+        dones[in_area] = self.body_grid[game_ids[in_area],
+            heads_y[in_area], heads_x[in_area]] > 0
+
+        scores = self.scores.copy()
+        frames = self.frames.copy()
+        self.reset(game_ids[dones])
+
+        return dones, scores, frames
+
+    def _grow(self, game_ids):
+        """
+        Add a new body at the tail of the snake
+        """
+        tail_ids = (self._body_starts[game_ids] + self._body_lengths[game_ids] - 1) % self._capacity
+        tails = self._bodies[game_ids, tail_ids]
+        self._bodies[game_ids, (tail_ids + 1) % self._capacity] = tails
+        self._body_lengths[game_ids] += 1
+        self.body_grid[game_ids, tails[:, 1], tails[:, 0]] += 1
+
+    def _get_free_mask(self, game_id):
+        """
+        Get a bool array of shape (height, width) of the cells not occupied by the snake
+        """
+        free_mask = self.body_grid[game_id] == 0
+        head_x, head_y = self.heads[game_id]
+        if 0 <= head_x < self.width and 0 <= head_y < self.height:
+            free_mask[head_y, head_x] = False
+        return free_mask
+
+    def _place_food(self, game_ids):
+        """
+        Place the food at a random cell not occupied by the snake
+
+        A random cell is sampled for each game at once, and it's accepted if it's
+        free. The games that fail several times pick from all free cells, so
+        the cell is still uniformly chosen from the free cells. If the snake
+        occupies all cells, the food stays at the same position.
+        """
+        for _ in range(_FOOD_SAMPLING_TRIES):
+            cells = self._rng.integers(0, self.width * self.height, size = game_ids.size)
+            cells_y, cells_x = np.divmod(cells, self.width)
+            free = ((self.body_grid[game_ids, cells_y, cells_x] == 0) &
+                ((self.heads[game_ids, 0] != cells_x) | (self.heads[game_ids, 1] != cells_y)))
+            self.foods[game_ids[free], 0] = cells_x[free]
+            self.foods[game_ids[free], 1] = cells_y[free]
+
+            game_ids = game_ids[~free]
+            if game_ids.size == 0:
+                return
+
+        for game_id in game_ids:
+            free_cells = np.flatnonzero(self._get_free_mask(game_id))
+            if free_cells.size > 0:
+                cell_y, cell_x = divmod(int(self._rng.choice(free_cells)), self.width)
+                self.foods[game_id] = (cell_x, cell_y)
+
+    def set_food_pos(self, game_id: int, pos):
+        """
+        Set the position of the food of a game, such as for replaying a game
+
+        @param game_id The index of the game
+        @param pos The cell (x, y) of the food
+        """
+        self.foods[game_id] = pos
+
+    def get_body_positions(self, game_id: int):
+        """
+        Get the cells of the snake bodies of a game from the head to the tail
+
+        @return An int array of shape (number of bodies, 2)
+        """
+        body_ids = ((self._body_starts[game_id] + np.arange(self._body_lengths[game_id]))
+            % self._capacity)
+        return self._bodies[game_id, body_ids]
+
+    def get_scene_info(self, game_id: int) -> dict:
+        """
+        Get the scene information of a game, which is the same as the one
+        of `Scene.get_scene_info()`
+
+        Because the game which is over is reset in `step()`, the status is
+        always "GAME_ALIVE".
+        """
+        return {
+            "frame": int(self.frames[game_id]),
+            "status": "GAME_ALIVE",
+            "snake_head": _to_pixel_pos(self.heads[game_id]),
+            "snake_body": [_to_pixel_pos(pos) for pos in self.get_body_positions(game_id)],
+            "food": _to_pixel_pos(self.foods[game_id])
+        }
+
+def _to_pixel_pos(cell):
+    return int(cell[0]) * 10, int(cell[1]) * 10
@@ -4,7 +4,7 @@ The file for managing gameobjects in the scene
 
 import random
 
-from pygame import Rect
+from pygame import Rect, Surface
 from pygame.sprite import Group
 
 from mlgame.utils.enum import StringEnum, auto
@@ -15,19 +15,85 @@ class GameStatus(StringEnum):
     GAME_OVER = auto()
     GAME_ALIVE = auto()
 
+class FreeCellIndex:
+    """
+    The index of the cells not occupied by the snake in the scene
+
+    The free cells are stored in a list for sampling and a dict mapping the cell
+    to its index in the list, so a cell can be occupied, released, or sampled
+    in constant time.
+    """
+    def __init__(self, area_rect: Rect, cell_size: int):
+        """
+        Constructor. All cells in the area are free.
+
+        @param area_rect The area of the scene
+        @param cell_size The width and the height of a cell
+        """
+        self._area_rect = area_rect
+        self._cells = [(x, y)
+            for x in range(area_rect.left, area_rect.right, cell_size)
+            for y in range(area_rect.top, area_rect.bottom, cell_size)]
+        self._indices = {cell: i for i, cell in enumerate(self._cells)}
+
+    def __len__(self):
+        return len(self._cells)
+
+    def occupy(self, pos):
+        """
+        Remove the cell at the position from the index if it's free
+        """
+        i = self._indices.pop(pos, None)
+        if i is None:
+            return
+
+        # Move the last cell to the removed slot
+        last_cell = self._cells.pop()
+        if i < len(self._cells):
+            self._cells[i] = last_cell
+            self._indices[last_cell] = i
+
+    def release(self, pos):
+        """
+        Add the cell at the position to the index if it's in the area and not free
+        """
+        if pos in self._indices or not self._area_rect.collidepoint(pos):
+            return
+
+        self._indices[pos] = len(self._cells)
+        self._cells.append(pos)
+
+    def sample(self):
+        """
+        Randomly pick a free cell
+
+        @return The position of the cell, or None if there is no free cell
+        """
+        if not self._cells:
+            return None
+        return self._cells[random.randrange(len(self._cells))]
+
 class Scene:
     """
     The main game scene
     """
 
-    area_rect = Rect(0, 0, 300, 300)
+    def __init__(self, width = 30, height = 30):
+        """
+        Constructor
 
-    def __init__(self):
+        @param width The number of cells in a row of the game area
+        @param height The number of cells in a column of the game area
+        """
+        # The size of a cell is 10 * 10 pixels
+        self.area_rect = Rect(0, 0, width * 10, height * 10)
         self._create_scene()
 
         self.score = 0
         self._frame = 0
         self._status = GameStatus.GAME_ALIVE
+        # The scene information of the current frame
+        self._scene_info = None
 
     def _create_scene(self):
         """
@@ -35,41 +101,84 @@ class Scene:
         """
         self._snake = Snake()
         self._food = Food()
+        self._create_free_cells()
         self._random_food_pos()
 
         self._draw_group = Group()
         self._draw_group.add(self._snake.head, *self._snake.body, self._food)
 
-    def _random_food_pos(self):
+        # The game area drawn at the last `draw_gameobjects()`. It's created at
+        # the first drawing, and only the cells changed since the last drawing
+        # are redrawn.
+        self._area_surface = None
+        self._changed_cells = []
+
+    def _create_free_cells(self):
         """
-        Randomly set the position of the food
+        Create the index of the cells not occupied by the snake
         """
-        while True:
-            candidate_pos = (
-                random.randrange(0, Scene.area_rect.width, 10),
-                random.randrange(0, Scene.area_rect.height, 10))
+        self._free_cells = FreeCellIndex(self.area_rect, 10)
+        self._free_cells.occupy(self._snake.head_pos)
+        for body in self._snake.body:
+            self._free_cells.occupy(body.pos)
 
-            if (candidate_pos != self._snake.head_pos and
-                not self._snake.is_body_pos(candidate_pos)):
-                break
+    def _random_food_pos(self):
+        """
+        Randomly set the position of the food to a cell not occupied by the snake
 
-        self._food.pos = candidate_pos
+        If the snake occupies all cells, the food stays at the same position.
+        """
+        candidate_pos = self._free_cells.sample()
+        if candidate_pos is not None:
+            self._food.pos = candidate_pos
 
     def reset(self):
         self.score = 0
         self._frame = 0
         self._status = GameStatus.GAME_ALIVE
+        self._scene_info = None
 
         self._snake = Snake()
+        self._create_free_cells()
         self._random_food_pos()
         self._draw_group.empty()
         self._draw_group.add(self._snake.head, *self._snake.body, self._food)
+        # Redraw the whole game area
+        self._area_surface = None
 
     def draw_gameobjects(self, surface):
         """
         Draw gameobjects to the given surface
+
+        The game area is blitted at the top-left corner of the surface.
         """
-        self._draw_group.draw(surface)
+        if self._area_surface is None:
+            self._area_surface = Surface(self.area_rect.size)
+            self._draw_group.draw(self._area_surface)
+        else:
+            for pos in self._changed_cells:
+                self._draw_cell(pos)
+        self._changed_cells.clear()
+
+        surface.blit(self._area_surface, (0, 0))
+
+    def _draw_cell(self, pos):
+        """
+        Redraw the cell at the position on the game area
+        """
+        if pos == self._snake.head_pos:
+            image = self._snake.head.image
+        elif self._snake.is_body_pos(pos):
+            image = self._snake.body[0].image
+        elif pos == self._food.pos:
+            image = self._food.image
+        else:
+            image = None
+
+        if image:
+            self._area_surface.blit(image, pos)
+        else:
+            self._area_surface.fill((0, 0, 0), (pos[0], pos[1], 10, 10))
 
     def update(self, action):
         """
@@ -78,30 +187,53 @@ class Scene:
         @param action The action for controlling the movement of the snake
         """
         self._frame += 1
+        self._scene_info = None
+        tail_pos = self._snake.tail_pos
+        last_head_pos = self._snake.head_pos
         self._snake.move(action)
 
+        if not self._snake.is_body_pos(tail_pos):
+            self._free_cells.release(tail_pos)
+        self._free_cells.occupy(self._snake.head_pos)
+
         if self._snake.head_pos == self._food.pos:
             self.score += 1
             self._random_food_pos()
-            new_body = self._snake.grow()
-            self._draw_group.add(new_body)
+            self.grow_snake()
 
-        if (not Scene.area_rect.collidepoint(self._snake.head_pos) or
+        if (not self.area_rect.collidepoint(self._snake.head_pos) or
             self._snake.is_body_pos(self._snake.head_pos)):
             self._status = GameStatus.GAME_OVER
 
+        if self._area_surface is not None:
+            # The food is moved only if the head reaches it
+            self._changed_cells.extend(
+                (tail_pos, last_head_pos, self._snake.head_pos, self._food.pos))
+
         return self._status
 
+    def grow_snake(self):
+        """
+        Add a new body at the tail of the snake
+        """
+        new_body = self._snake.grow()
+        self._draw_group.add(new_body)
+        self._scene_info = None
+
     def get_scene_info(self):
         """
         Get the current scene information
-        """
-        scene_info = {
-            "frame": self._frame,
-            "status": self._status.value,
-            "snake_head": self._snake.head_pos,
-            "snake_body": [body.pos for body in self._snake.body],
-            "food": self._food.pos
-        }
 
-        return scene_info
+        The scene information is generated once per frame, and the same object
+        is returned until the scene is updated or reset. It shouldn't be modified.
+        """
+        if self._scene_info is None:
+            self._scene_info = {
+                "frame": self._frame,
+                "status": self._status.value,
+                "snake_head": self._snake.head_pos,
+                "snake_body": self._snake.body_positions,
+                "food": self._food.pos
+            }
+
+        return self._scene_info
@@ -67,6 +67,14 @@ class Snake:
         self.body.append(SnakeBody((40, 20), self.body_color))
         self.body.append(SnakeBody((40, 10), self.body_color))
 
+        # The positions of the snake bodies in the same order as `body`
+        self._body_positions = deque(body.pos for body in self.body)
+        # The number of snake bodies at each position, {pos: count}.
+        # The new body overlaps the tail until the next movement.
+        self._body_pos_counts = {}
+        for body in self.body:
+            self._add_body_pos(body.pos)
+
         # Initialize the action to going down
         self._action = SnakeAction.DOWN
 
@@ -74,15 +82,32 @@ class Snake:
     def head_pos(self):
         return self.head.pos
 
+    @property
+    def tail_pos(self):
+        return self.body[-1].pos
+
+    @property
+    def body_positions(self):
+        """
+        A list of the positions of the snake bodies from the head to the tail
+        """
+        return list(self._body_positions)
+
     def is_body_pos(self, position):
         """
         Check if there has a snake body at the given position
         """
-        for body in self.body:
-            if body.pos == position:
-                return True
+        return position in self._body_pos_counts
+
+    def _add_body_pos(self, position):
+        self._body_pos_counts[position] = self._body_pos_counts.get(position, 0) + 1
 
-        return False
+    def _remove_body_pos(self, position):
+        count = self._body_pos_counts[position] - 1
+        if count:
+            self._body_pos_counts[position] = count
+        else:
+            del self._body_pos_counts[position]
 
     def grow(self):
         """
@@ -90,6 +115,8 @@ class Snake:
         """
         new_body = SnakeBody(self.body[-1].pos, self.body_color)
         self.body.append(new_body)
+        self._body_positions.append(new_body.pos)
+        self._add_body_pos(new_body.pos)
 
         return new_body
 
@@ -109,8 +136,12 @@ class Snake:
 
         # Move the body 1 step ahead
         tail = self.body.pop()
+        self._body_positions.pop()
+        self._remove_body_pos(tail.pos)
         tail.pos = self.head.pos
         self.body.appendleft(tail)
+        self._body_positions.appendleft(tail.pos)
+        self._add_body_pos(tail.pos)
 
         # Get the next head position according to the valid action
         next_head_pos = self._get_possible_head_pos(action)
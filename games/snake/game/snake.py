@@ -3,13 +3,25 @@ import pygame
 from .gamecore import Scene, GameStatus
 from .gameobject import SnakeAction
 
+# The maximum width or height in pixels of the game area on the display
+MAX_DISPLAY_AREA_SIZE = 800
+
 class Snake:
     """
     The game execution manager
     """
-    def __init__(self):
-        self._scene = Scene()
-        self._pygame_init()
+    def __init__(self, width = 30, height = 30, headless = False):
+        """
+        Constructor
+
+        @param width The number of cells in a row of the game area
+        @param height The number of cells in a column of the game area
+        @param headless Whether to run the game without the display
+        """
+        self._scene = Scene(width, height)
+        self._headless = headless
+        if not self._headless:
+            self._pygame_init()
 
     def _pygame_init(self):
         """
@@ -17,12 +29,22 @@ class Snake:
         """
         pygame.display.init()
         pygame.display.set_caption("Snake")
+
+        # Scale down the game area to fit the display if the area is too large
+        area_rect = self._scene.area_rect
+        scale = min(1, MAX_DISPLAY_AREA_SIZE / max(area_rect.width, area_rect.height))
+        self._display_area_rect = pygame.Rect(0, 0,
+            round(area_rect.width * scale), round(area_rect.height * scale))
         self._screen = pygame.display.set_mode(
-            (Scene.area_rect.width, Scene.area_rect.height + 25))
+            (self._display_area_rect.width, self._display_area_rect.height + 25))
+        if scale < 1:
+            self._area_surface = pygame.Surface(area_rect.size)
+        else:
+            self._area_surface = None
 
         pygame.font.init()
         self._font = pygame.font.Font(None, 22)
-        self._font_pos = (1, Scene.area_rect.width + 5)
+        self._font_pos = (1, self._display_area_rect.height + 5)
 
     def update(self, command):
         """
@@ -40,15 +62,20 @@ class Snake:
             print("Score: {}".format(self._scene.score))
             return "RESET"
 
-        self._draw_screen()
+        if not self._headless:
+            self._draw_screen()
 
     def _draw_screen(self):
         """
         Draw the scene to the display
         """
         self._screen.fill((50, 50, 50))
-        self._screen.fill((0, 0, 0), Scene.area_rect)
-        self._scene.draw_gameobjects(self._screen)
+        if self._area_surface is not None:
+            self._scene.draw_gameobjects(self._area_surface)
+            pygame.transform.scale(self._area_surface, self._display_area_rect.size,
+                self._screen.subsurface(self._display_area_rect))
+        else:
+            self._scene.draw_gameobjects(self._screen)
 
         # Draw score
         font_surface = self._font.render(
@@ -88,7 +115,7 @@ class Snake:
     def get_game_info(self):
         return {
             "scene": {
-                "size": [300, 300]
+                "size": list(self._scene.area_rect.size)
             },
             "game_object": [
                 { "name": "snake_head", "size": [10, 10], "color": [31, 204, 42] },
@@ -0,0 +1,199 @@
+"""
+Execute the game for several episodes in parallel and aggregate the game results
+"""
+
+import contextlib
+import importlib
+import os
+import random
+import traceback
+
+from collections import Counter
+from multiprocessing import Pool
+
+from .exceptions import GameProcessError, MLProcessError
+
+class BatchEvaluator:
+    """
+    Execute the game for several episodes in a process pool
+
+    Each episode is a single round of the game executed in the headless mode.
+    The ml clients are executed in the same worker process as the game, and
+    the game is updated as soon as all ml clients return the command,
+    which is the same as the lockstep mode. The ml clients are created once
+    in each worker process and are reset between episodes.
+    """
+    def __init__(self, execution_cmd, game_setup, ml_propties: list):
+        """
+        Constructor
+
+        @param execution_cmd The `ExecutionCommand` object
+        @param game_setup The `GAME_SETUP` defined in the game config
+        @param ml_propties A list of `MLExecutorProperty` for the ml clients
+        """
+        self._episodes = execution_cmd.episodes
+        self._workers = min(execution_cmd.workers or os.cpu_count(), self._episodes)
+        self._game_cls = game_setup["game"]
+        self._game_params = execution_cmd.game_params
+        self._ml_names = [client["name"] for client in game_setup["ml_clients"]]
+        self._ml_specs = [
+            (propty.name, propty.target_module, propty.init_args, propty.init_kwargs)
+            for propty in ml_propties
+        ]
+
+    def start(self) -> list:
+        """
+        Start executing episodes
+
+        If an exception occurred in any episode, the `ProcessError` will be raised.
+
+        @return A list of the game results returned from `get_game_result()`
+                of each episode
+        """
+        print("Running {} episode(s) with {} worker(s)..."
+            .format(self._episodes, self._workers), flush = True)
+
+        with Pool(self._workers, initializer = _init_worker,
+                initargs = (self._game_cls, self._game_params, self._ml_specs)) as pool:
+            results = list(pool.imap_unordered(_run_episode, range(self._episodes)))
+
+        return results
+
+    def print_statistics(self, results: list):
+        """
+        Print the statistics of the game results
+
+        The "result" field is counted for each ml client. For the other fields of
+        integer value, the mean, min, and max value are printed. The distribution
+        is also printed for them except for "frame_used".
+        """
+        print("Episodes:", len(results))
+
+        # The "result" field is a list of the result of each ml client
+        for i, ml_name in enumerate(self._ml_names):
+            counter = Counter(result["result"][i] for result in results
+                if len(result.get("result", [])) > i)
+            if not counter:
+                continue
+
+            print("Result of '{}':".format(ml_name))
+            for status, count in sorted(counter.items()):
+                print("  {}: {} ({:.1%})".format(status, count, count / len(results)))
+
+        for field in results[0].keys():
+            if field == "result":
+                continue
+
+            values = [result[field] for result in results]
+            if not all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+                continue
+
+            print("{}: mean {:.2f}, min {}, max {}".format(
+                field, sum(values) / len(values), min(values), max(values)))
+
+            if field == "frame_used":
+                continue
+
+            print("  distribution:", ", ".join("{}: {}".format(value, count)
+                for value, count in sorted(Counter(values).items())))
+
+# The episode runner of the worker process
+_episode_runner = None
+
+def _init_worker(game_cls, game_params, ml_specs):
+    """
+    The initializer of the worker process
+    """
+    global _episode_runner
+
+    # The worker processes may be forked with the same random state
+    random.seed()
+    _episode_runner = _EpisodeRunner(game_cls, game_params, ml_specs)
+
+def _run_episode(episode_id):
+    """
+    The task of the worker process
+    """
+    return _episode_runner.run()
+
+class _EpisodeRunner:
+    """
+    Execute a single round of the game with the ml clients in the current process
+
+    The output of the game to the stdout, such as the game status printed at
+    the end of the round, is discarded, so that it won't be interleaved with
+    the output of other workers and the statistics.
+    """
+    def __init__(self, game_cls, game_params, ml_specs):
+        self._game_cls = game_cls
+        self._game_params = game_params
+        self._ml_specs = ml_specs
+        self._mls = None
+        self._devnull = open(os.devnull, "w")
+
+    def run(self) -> dict:
+        """
+        Execute an episode and return the game result
+        """
+        if self._mls is None:
+            self._mls = {}
+            for name, target_module, init_args, init_kwargs in self._ml_specs:
+                self._mls[name] = self._call_ml(name, self._create_ml,
+                    target_module, init_args, init_kwargs)
+
+        try:
+            return self._loop()
+        except MLProcessError:
+            raise
+        except Exception:
+            raise GameProcessError("game", traceback.format_exc())
+
+    def _loop(self):
+        game = self._call_game(self._game_cls, *self._game_params, headless = True)
+
+        while True:
+            scene_info_dict = game.get_player_scene_info()
+            cmd_dict = {}
+            for name, ml in self._mls.items():
+                command = self._call_ml(name, ml.update, scene_info_dict[name])
+                # The ml client resets before the game ends
+                if command == "RESET":
+                    self._call_ml(name, ml.reset)
+                    command = None
+                cmd_dict[name] = command
+
+            result = self._call_game(game.update, cmd_dict)
+            if result == "RESET" or result == "QUIT":
+                break
+
+        # Send the last scene information and reset ml clients for the next episode
+        scene_info_dict = game.get_player_scene_info()
+        for name, ml in self._mls.items():
+            self._call_ml(name, ml.update, scene_info_dict[name])
+            self._call_ml(name, ml.reset)
+
+        return self._call_game(game.get_game_result)
+
+    def _create_ml(self, target_module, init_args, init_kwargs):
+        ml_module = importlib.import_module(target_module, __package__)
+        return ml_module.MLPlay(*init_args, **init_kwargs)
+
+    def _call_game(self, func, *args, **kwargs):
+        """
+        Invoke the function of the game and discard its output to the stdout
+        """
+        with contextlib.redirect_stdout(self._devnull):
+            return func(*args, **kwargs)
+
+    def _call_ml(self, name, func, *args):
+        """
+        Invoke the function of the ml client and wrap the exception
+        """
+        try:
+            return func(*args)
+        except Exception:
+            raise MLProcessError(name, traceback.format_exc())
+        except SystemExit:  # Catch the exception made by 'sys.exit()'
+            raise MLProcessError(name,
+                "The process '{}' is exited by itself. {}"
+                .format(name, traceback.format_exc()))
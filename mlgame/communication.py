@@ -1,4 +1,8 @@
-from threading import Thread
+import time
+
+from multiprocessing.connection import wait
+from multiprocessing.reduction import ForkingPickler
+from threading import Condition, Thread
 from queue import Queue
 
 from .exceptions import MLProcessError
@@ -12,6 +16,8 @@ class CommunicationSet:
     and them used for sending objects must provide `send()`.
     For example, the object of `multiprocessing.connection.Connection` is a valid
     communication object for both sending and receiving.
+    To use `wait()`, the communication objects used for receiving must be also
+    waitable by `multiprocessing.connection.wait()`.
 
     @var _recv_end A dictionary storing communication objects which are used to
          receive objects
@@ -70,28 +76,48 @@ class CommunicationSet:
         """
         return self._send_end.keys()
 
-    def poll(self, name: str):
+    def poll(self, name: str, timeout = 0):
         """
         Check whether the specified communication object has data to read
 
         @param name The name of the communication object
+        @param timeout The maximum time in seconds to block for the data.
+               If it's None, block until the data is arrived.
         """
-        return self._recv_end[name].poll()
+        return self._recv_end[name].poll(timeout)
 
-    def recv(self, name: str, to_wait: bool = False):
+    def recv(self, name: str, to_wait: bool = False, timeout = None):
         """
         Receive object from the specified communication object
 
         @param name The name of the communication object
         @param to_wait Whether to wait until the object is arrived
-        @return The received object. If `to_wait` is False and nothing available from
-                the specified communication object, return None.
+        @param timeout The maximum time in seconds to wait if `to_wait` is True.
+               If it's None, wait until the object is arrived.
+        @return The received object. If nothing available from the specified
+                communication object, or `to_wait` is True but the object doesn't
+                arrive within `timeout`, return None.
         """
-        if not to_wait and not self.poll(name):
+        if not self.poll(name, timeout if to_wait else 0):
             return None
 
         return self._recv_end[name].recv()
 
+    def wait(self, names, timeout = None):
+        """
+        Wait until any of the specified communication objects has data to read
+
+        @param names An iterable of the name of communication objects to be waited
+        @param timeout The maximum time in seconds to block.
+               If it's None, block until any of them has data to read.
+        @return A list of the name of communication objects which have data to read.
+                It's an empty list if timeout.
+        """
+        comm_obj_names = {self._recv_end[name]: name for name in names}
+        ready_objs = wait(comm_obj_names.keys(), timeout)
+
+        return [comm_obj_names[comm_obj] for comm_obj in ready_objs]
+
     def recv_all(self, to_wait: bool = False):
         """
         Receive objects from all communication object registered for receiving
@@ -118,6 +144,23 @@ class CommunicationSet:
         """
         self._send_end[name].send(obj)
 
+    def send_bytes(self, data, name: str):
+        """
+        Send the pickled object via the specified communication object
+
+        The receiver gets the unpickled object from its `recv()`.
+        If the communication object doesn't provide `send_bytes()`, the data
+        is unpickled and sent by `send()`.
+
+        @param data The object pickled by `ForkingPickler.dumps()`
+        @param name The name of the communication object
+        """
+        comm_obj = self._send_end[name]
+        if hasattr(comm_obj, "send_bytes"):
+            comm_obj.send_bytes(data)
+        else:
+            comm_obj.send(ForkingPickler.loads(data))
+
     def send_all(self, obj):
         """
         Send object via all communication objects registered for sending
@@ -167,12 +210,202 @@ class CommunicationHandler:
     def send(self, obj):
         self._send_end.send(obj)
 
+class LatestObjectMailbox:
+    """
+    A mailbox that only keeps the latest object
+
+    The object not got yet will be replaced by the newly put object,
+    and the number of replaced objects is counted. However, `None` which is
+    used as the termination signal doesn't replace the object in the mailbox.
+    It is got after that object, and no more objects are accepted.
+    """
+    def __init__(self):
+        self._condition = Condition()
+        self._obj = None
+        self._has_obj = False
+        self._terminated = False
+        # The number of objects replaced by the object in the mailbox
+        self._num_replaced_objs = 0
+        # The number of objects skipped before the objects already got
+        self._num_skipped_objs = 0
+
+    def put(self, obj):
+        """
+        Put the object to the mailbox and replace the object not got yet
+        """
+        with self._condition:
+            if self._terminated:
+                return
+
+            if obj is None:
+                self._terminated = True
+            else:
+                if self._has_obj:
+                    self._num_replaced_objs += 1
+                self._obj = obj
+                self._has_obj = True
+
+            self._condition.notify()
+
+    def get(self):
+        """
+        Get the latest object. Block until an object is put.
+
+        @return The latest object. None if the termination signal is received.
+        """
+        with self._condition:
+            while not self._has_obj and not self._terminated:
+                self._condition.wait()
+
+            if not self._has_obj:
+                return None
+
+            obj = self._obj
+            self._obj = None
+            self._has_obj = False
+            self._num_skipped_objs += self._num_replaced_objs
+            self._num_replaced_objs = 0
+            return obj
+
+    def pop_num_skipped_objs(self) -> int:
+        """
+        Get the number of objects skipped before the objects got since the last call
+        """
+        with self._condition:
+            num_skipped_objs = self._num_skipped_objs
+            self._num_skipped_objs = 0
+            return num_skipped_objs
+
+class SceneInfoDelta:
+    """
+    The difference of a scene information from the previous one
+
+    @var changed A dict storing the fields which are added or whose value is changed
+    @var removed A list of the name of the fields which are removed
+    """
+    __slots__ = ("changed", "removed")
+
+    def __init__(self, changed: dict, removed: list):
+        self.changed = changed
+        self.removed = removed
+
+    def __reduce__(self):
+        # Make the pickled data smaller than the default one of `__slots__`
+        return (SceneInfoDelta, (self.changed, self.removed))
+
+class SceneInfoDeltaEncoder:
+    """
+    Encode the scene information dict to the keyframe or the delta
+
+    The keyframe is the scene information itself, and the delta is a
+    `SceneInfoDelta` to the previously encoded scene information.
+    The keyframe is generated periodically or when most fields are changed.
+    The object which is not a dict is not encoded.
+    """
+    def __init__(self, keyframe_interval: int):
+        """
+        Constructor
+
+        @param keyframe_interval The maximum number of deltas between two keyframes
+        """
+        self._keyframe_interval = keyframe_interval
+        self._prev_scene_info = None
+        self._num_deltas = 0
+
+    def reset(self):
+        """
+        Make the next encoded scene information be a keyframe
+        """
+        self._prev_scene_info = None
+
+    def encode(self, obj):
+        """
+        Encode the object
+
+        @return The keyframe or the `SceneInfoDelta` if the object is a dict.
+                Otherwise, the object itself.
+        """
+        if not isinstance(obj, dict):
+            return obj
+
+        prev_scene_info = self._prev_scene_info
+        # Keep a shallow copy in case that the game modifies the dict later
+        self._prev_scene_info = dict(obj)
+
+        if (prev_scene_info is None or
+                self._num_deltas >= self._keyframe_interval):
+            self._num_deltas = 0
+            return obj
+
+        changed = {}
+        for key, value in obj.items():
+            if key not in prev_scene_info or prev_scene_info[key] != value:
+                changed[key] = value
+        removed = [key for key in prev_scene_info.keys() if key not in obj]
+
+        # The delta doesn't save anything
+        if len(changed) == len(obj):
+            self._num_deltas = 0
+            return obj
+
+        self._num_deltas += 1
+        return SceneInfoDelta(changed, removed)
+
+class SceneInfoDeltaDecoder:
+    """
+    Rebuild the scene information from the keyframes and the deltas
+    generated by `SceneInfoDeltaEncoder`
+
+    The rebuilt scene information is a new dict, but the values of the unchanged
+    fields are shared with the previous one.
+    """
+    def __init__(self):
+        self._scene_info = None
+
+    def decode(self, obj):
+        """
+        Decode the object
+
+        @return The rebuilt scene information if the object is a keyframe or
+                a `SceneInfoDelta`. Otherwise, the object itself.
+        """
+        if isinstance(obj, dict):
+            self._scene_info = obj
+            return obj
+        if not isinstance(obj, SceneInfoDelta):
+            return obj
+
+        if self._scene_info is None:
+            raise RuntimeError("Received the delta of scene information "
+                "before the keyframe")
+
+        scene_info = dict(self._scene_info)
+        scene_info.update(obj.changed)
+        for key in obj.removed:
+            del scene_info[key]
+
+        self._scene_info = scene_info
+        return scene_info
+
 class GameCommManager:
     """
     The commnuication manager for the game process
     """
-    def __init__(self):
+    def __init__(self, delta_keyframe_interval: int = None):
+        """
+        Constructor
+
+        @param delta_keyframe_interval If it's specified, the scene information
+               sent by `send_dict_to_ml()` is delta-encoded by `SceneInfoDeltaEncoder`,
+               and the value is the maximum number of deltas between keyframes.
+               Otherwise, the scene information is sent as it is.
+        """
         self._comm_to_ml_set = CommunicationSet()
+        self._delta_keyframe_interval = delta_keyframe_interval
+        # {tuple of ml names: SceneInfoDeltaEncoder}
+        self._delta_encoders = {}
+        # {ml name: the key of the encoder used at the last sending}
+        self._last_delta_encoder_keys = {}
 
     def add_comm_to_ml(self, ml_name, recv_end, send_end):
         """
@@ -193,19 +426,77 @@ class GameCommManager:
         """
         self._comm_to_ml_set.send(obj, ml_name)
 
+    def send_dict_to_ml(self, obj_dict: dict, ml_names):
+        """
+        Send the object in the dict to the ml process of the corresponding key
+
+        The same object shared by several ml processes is pickled only once,
+        and the pickled data is sent to all of them. If the delta encoding is
+        enabled, the object is encoded before sending.
+
+        @param obj_dict A dict of which the key is the name of the ml process and
+               the value is the object to be sent to it
+        @param ml_names The name of ml processes to send the object to
+        """
+        # Group the ml names by the object to be sent
+        obj_groups = {}
+        for ml_name in ml_names:
+            obj = obj_dict[ml_name]
+            obj_groups.setdefault(id(obj), (obj, []))[1].append(ml_name)
+
+        for obj, target_names in obj_groups.values():
+            if self._delta_keyframe_interval is not None:
+                obj = self._delta_encode(obj, target_names)
+
+            if len(target_names) == 1:
+                self.send_to_ml(obj, target_names[0])
+                continue
+
+            data = bytes(ForkingPickler.dumps(obj))
+            for ml_name in target_names:
+                self._comm_to_ml_set.send_bytes(data, ml_name)
+
+    def _delta_encode(self, obj, target_names):
+        """
+        Encode the object for the ml processes which are sent the same object
+
+        The ml processes sent the same object share an encoder. If any of them
+        used another encoder at the last sending, its decoder doesn't have
+        the state of this encoder, so a keyframe is generated.
+        """
+        key = tuple(target_names)
+        encoder = self._delta_encoders.get(key)
+        if encoder is None:
+            encoder = SceneInfoDeltaEncoder(self._delta_keyframe_interval)
+            self._delta_encoders[key] = encoder
+        elif any(self._last_delta_encoder_keys.get(name) != key
+                for name in target_names):
+            encoder.reset()
+
+        for name in target_names:
+            self._last_delta_encoder_keys[name] = key
+
+        return encoder.encode(obj)
+
     def send_to_all_ml(self, obj):
         """
         Send the object to all ml process
         """
         self._comm_to_ml_set.send_all(obj)
 
-    def recv_from_ml(self, ml_name):
+    def recv_from_ml(self, ml_name, to_wait = False, timeout = None):
         """
         Receive the object from the specified ml process
 
         If the received object is `MLProcessError`, raise the exception.
+
+        @param ml_name The name of the ml process
+        @param to_wait Whether to wait until the object is arrived
+        @param timeout The maximum time in seconds to wait if `to_wait` is True.
+               If it's None, wait until the object is arrived.
+        @return The received object. None if nothing is received.
         """
-        obj = self._comm_to_ml_set.recv(ml_name, to_wait = False)
+        obj = self._comm_to_ml_set.recv(ml_name, to_wait, timeout)
         if isinstance(obj, MLProcessError):
             raise obj
         return obj
@@ -219,13 +510,67 @@ class GameCommManager:
             obj_dict[ml_name] = self.recv_from_ml(ml_name)
         return obj_dict
 
+    def wait_from_all_ml(self, deadline = None, accept = None):
+        """
+        Wait for an object from each ml process until all arrive or the deadline passes
+
+        The objects are received in the order of arrival. If the received object
+        is `MLProcessError`, raise the exception immediately.
+
+        @param deadline The absolute time of `time.perf_counter()` to stop waiting.
+               If it's None, wait until all objects arrive.
+        @param accept A function `accept(ml_name, obj)` which returns whether
+               the object received from the ml process is the one to be waited
+               for. The object not accepted is dropped, and the ml process is
+               still waited. If it's None, accept any object.
+        @return A tuple (`obj_dict`, `arrival_time_dict`). `obj_dict` stores the
+                received object of each ml process, and `arrival_time_dict` stores
+                the time of `time.perf_counter()` when the object is received.
+                If the object of the ml process doesn't arrive in time, both values
+                are None.
+        """
+        obj_dict = {}
+        arrival_time_dict = {}
+        pending_names = set()
+        for ml_name in self.get_ml_names():
+            obj_dict[ml_name] = None
+            arrival_time_dict[ml_name] = None
+            pending_names.add(ml_name)
+
+        while pending_names:
+            timeout = (None if deadline is None
+                else max(deadline - time.perf_counter(), 0))
+            ready_names = self._comm_to_ml_set.wait(pending_names, timeout)
+            if not ready_names and timeout is not None:
+                break
+
+            for ml_name in ready_names:
+                obj = self.recv_from_ml(ml_name)
+                if accept is None or accept(ml_name, obj):
+                    obj_dict[ml_name] = obj
+                    arrival_time_dict[ml_name] = time.perf_counter()
+                    pending_names.remove(ml_name)
+
+        return obj_dict, arrival_time_dict
+
 class MLCommManager:
     """
     The communication manager for the ml process
     """
-    def __init__(self, ml_name):
+    def __init__(self, ml_name, conflate: bool = False):
+        """
+        Constructor
+
+        @param ml_name The name of the ml process
+        @param conflate Whether to only keep the latest object received from the game.
+               If it's True, `recv_from_game()` always returns the newest object and
+               the older ones not received are skipped. Otherwise, the objects are
+               queued, and the oldest one is dropped if the queue is full.
+        """
         self._comm_to_game = CommunicationHandler()
         self._ml_name = ml_name
+        self._conflate = conflate
+        self._delta_decoder = SceneInfoDeltaDecoder()
 
     def set_comm_to_game(self, recv_end, send_end):
         """
@@ -241,7 +586,10 @@ class MLCommManager:
         """
         Start a thread to keep receiving objects from the game
         """
-        self._obj_queue = Queue(15)
+        if self._conflate:
+            self._obj_queue = LatestObjectMailbox()
+        else:
+            self._obj_queue = Queue(15)
 
         thread = Thread(target = self._keep_recv_obj_from_game)
         thread.start()
@@ -251,15 +599,18 @@ class MLCommManager:
         Keep receiving object from the game and put it in the queue
 
         If the queue is full, the received object will be dropped.
+        In the conflating mode, the object not received yet is replaced.
+        The delta-encoded scene information is decoded before putting in the queue,
+        so that every delta is applied even if the object is dropped later.
         """
         while True:
-            if self._obj_queue.full():
+            if not self._conflate and self._obj_queue.full():
                 self._obj_queue.get()
                 print("Warning: The object queue for the process '{}' is full. "
                     "Drop the oldest object."
                     .format(self._ml_name))
 
-            obj = self._comm_to_game.recv()
+            obj = self._delta_decoder.decode(self._comm_to_game.recv())
             self._obj_queue.put(obj)
             if obj is None: # Received `None` from the game, quit the loop.
                 break
@@ -272,6 +623,17 @@ class MLCommManager:
         """
         return self._obj_queue.get()
 
+    def pop_num_skipped_objs(self) -> int:
+        """
+        Get the number of objects skipped before the objects received since
+        the last call in the conflating mode
+
+        @return The number of skipped objects. Always 0 if not in the conflating mode.
+        """
+        if not self._conflate:
+            return 0
+        return self._obj_queue.pop_num_skipped_objs()
+
     def send_to_game(self, obj):
         """
         Send an object to the game process
@@ -0,0 +1,350 @@
+"""
+Convert the log files of a game to a consolidated dataset
+
+Usage: `python -m mlgame.dataset build <game> [--workers N] [--output PATH]`
+
+The log files of all formats in "games/<game>/log/", including the compressed
+ones, are converted to columns,
+which are the same as the ones of the "npz" format, in a process pool.
+The converted columns of each log file are cached in "games/<game>/log/.dataset/",
+and only the log files which are new or changed (by the modification time and
+the size) are converted again. The cache is discarded if it's built by the other
+`RECORD_FORMAT_VERSION`.
+
+The columns of all log files are concatenated to a single `.npz` file,
+"games/<game>/dataset.npz" in default. The name of the array is
+"<ml_name>/<column>" as the "npz" format, and:
+- The codes of the string column are remapped to the merged "<column>__vocab".
+- The "<column>__offsets" of the list column are shifted to index the
+  concatenated "<column>__values".
+- "<ml_name>/episode_offsets" is an array of shape (num_episodes + 1, ).
+  The frames of the i-th episode are `[episode_offsets[i]:episode_offsets[i + 1]]`.
+- "episodes" is an array of the filenames of the log files.
+
+Use `load_dataset()` to load the dataset in one read. NumPy is required.
+"""
+
+import json
+import os
+import sys
+import traceback
+
+from argparse import ArgumentParser
+from multiprocessing import Pool
+from pathlib import Path
+
+from . import npz_record
+from .recorder import COMPRESSION_CODECS, RECORD_FORMAT_VERSION, load_log_file
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CACHE_DIRNAME = ".dataset"
+CACHE_MANIFEST_FILENAME = "manifest.json"
+LOG_FILE_SUFFIXES = (".pickle", ".stream", ".npz")
+
+def get_log_dir(game_name: str) -> Path:
+    """
+    Get the path of the log directory of the game
+    """
+    return Path(__file__).parent.parent.joinpath("games", game_name, "log")
+
+def build_dataset(log_dir, output_path, workers: int = None) -> dict:
+    """
+    Convert the log files in the directory and write the consolidated dataset
+
+    @param log_dir The directory of the log files
+    @param output_path The path of the consolidated `.npz` file
+    @param workers The number of worker processes. Default is the number of CPUs.
+    @return A dict of the statistics which has "converted", "cached", "failed",
+            and "removed" keys. The value is a list of the filenames.
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for building the dataset")
+
+    log_dir = Path(log_dir)
+    output_path = Path(output_path)
+    cache_dir = log_dir.joinpath(CACHE_DIRNAME)
+    if not cache_dir.exists():
+        cache_dir.mkdir(parents = True)
+
+    old_manifest = _load_cache_manifest(cache_dir)
+    manifest = {}
+    stats = {"converted": [], "cached": [], "failed": [], "removed": []}
+
+    log_paths = sorted(p for p in log_dir.iterdir()
+        if p.is_file() and _get_log_file_suffix(p) in LOG_FILE_SUFFIXES)
+    to_convert = []
+    for log_path in log_paths:
+        stat = log_path.stat()
+        entry = old_manifest.get(log_path.name)
+        if (entry is not None and entry["mtime"] == stat.st_mtime and
+                entry["size"] == stat.st_size and
+                cache_dir.joinpath(entry["cache"]).exists()):
+            manifest[log_path.name] = entry
+            stats["cached"].append(log_path.name)
+        else:
+            to_convert.append((log_path, cache_dir.joinpath(log_path.name + ".npz"),
+                stat.st_mtime, stat.st_size))
+
+    for filename in old_manifest.keys() - set(p.name for p in log_paths):
+        cache_path = cache_dir.joinpath(old_manifest[filename]["cache"])
+        if cache_path.exists():
+            cache_path.unlink()
+        stats["removed"].append(filename)
+
+    if to_convert:
+        workers = min(workers or os.cpu_count(), len(to_convert))
+        with Pool(workers) as pool:
+            for log_path, cache_path, mtime, size, error in pool.imap_unordered(
+                    _convert_log_file, to_convert):
+                if error is not None:
+                    print("Failed to convert '{}':\n{}".format(log_path.name, error),
+                        file = sys.stderr)
+                    stats["failed"].append(log_path.name)
+                    continue
+
+                manifest[log_path.name] = {
+                    "mtime": mtime,
+                    "size": size,
+                    "cache": cache_path.name
+                }
+                stats["converted"].append(log_path.name)
+
+    _save_cache_manifest(cache_dir, manifest)
+
+    if stats["converted"] or stats["removed"] or not output_path.exists():
+        filenames = sorted(manifest.keys())
+        _write_dataset(output_path, filenames,
+            [cache_dir.joinpath(manifest[f]["cache"]) for f in filenames])
+
+    return stats
+
+def load_dataset(filepath) -> dict:
+    """
+    Load the consolidated dataset
+
+    @param filepath The path of the dataset file
+    @return A dict which has "record_format_version" and "episodes" keys, and
+            the key of each ml client name. The value of the ml client is a dict
+            of which the key is the column name and the value is the array.
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for loading the dataset")
+
+    with np.load(filepath, allow_pickle = False) as npz_file:
+        arrays = {key: npz_file[key] for key in npz_file.files}
+
+    dataset = {
+        "record_format_version": int(arrays.pop("record_format_version")),
+        "episodes": arrays.pop("episodes")
+    }
+    for key, array in arrays.items():
+        name, column_name = key.split("/", 1)
+        dataset.setdefault(name, {})[column_name] = array
+
+    return dataset
+
+def _load_cache_manifest(cache_dir):
+    try:
+        with open(cache_dir.joinpath(CACHE_MANIFEST_FILENAME), "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if manifest.get("record_format_version") != RECORD_FORMAT_VERSION:
+        return {}
+    return manifest["logs"]
+
+def _save_cache_manifest(cache_dir, manifest):
+    manifest_path = cache_dir.joinpath(CACHE_MANIFEST_FILENAME)
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({
+            "record_format_version": RECORD_FORMAT_VERSION,
+            "logs": manifest
+        }, f, indent = 1)
+    os.replace(tmp_path, manifest_path)
+
+def _convert_log_file(task):
+    """
+    The task of the worker process. Convert a log file to columns and save them
+    to the cache file.
+
+    @return A tuple (`log_path`, `cache_path`, `mtime`, `size`, `error`).
+            `error` is the error message or None.
+    """
+    log_path, cache_path, mtime, size = task
+    try:
+        columns = _load_log_file_as_columns(log_path)
+
+        arrays = {"ml_names": np.array(list(columns.keys()), dtype = str)}
+        for name, ml_columns in columns.items():
+            for column_name, array in ml_columns.items():
+                arrays[name + "/" + column_name] = array
+
+        # Make sure that the incomplete file is not regarded as the cache
+        tmp_path = cache_path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        return log_path, cache_path, mtime, size, traceback.format_exc()
+
+    return log_path, cache_path, mtime, size, None
+
+def _get_log_file_suffix(log_path):
+    """
+    Get the suffix of the log file without the suffix of the compression codec
+    """
+    compression_suffixes = [codec[1] for codec in COMPRESSION_CODECS.values()]
+    if log_path.suffix in compression_suffixes:
+        return Path(log_path.stem).suffix
+    return log_path.suffix
+
+def _load_log_file_as_columns(log_path):
+    """
+    Load the log file of any format and convert it to columns
+    """
+    if log_path.suffix == ".npz":
+        game_progress = npz_record.load_npz_record(log_path)
+    else:
+        game_progress = load_log_file(log_path)
+
+    version = game_progress.get("record_format_version")
+    if version != RECORD_FORMAT_VERSION:
+        raise ValueError("The record format version {} is not supported. "
+            "Expect version {}.".format(version, RECORD_FORMAT_VERSION))
+
+    if log_path.suffix == ".npz":
+        del game_progress["record_format_version"]
+        return game_progress
+
+    return npz_record.to_columns(game_progress)
+
+def _write_dataset(output_path, filenames, cache_paths):
+    """
+    Concatenate the columns in the cache files and write them to the dataset file
+    """
+    # {ml_name: [columns of each log file]}
+    columns_of_logs = {}
+    for i, cache_path in enumerate(cache_paths):
+        with np.load(cache_path, allow_pickle = False) as npz_file:
+            for name in npz_file["ml_names"]:
+                columns_of_logs.setdefault(str(name), [{} for _ in cache_paths])
+            for key in npz_file.files:
+                if "/" in key:
+                    name, column_name = key.split("/", 1)
+                    columns_of_logs[name][i][column_name] = npz_file[key]
+
+    arrays = {
+        "record_format_version": np.array(RECORD_FORMAT_VERSION),
+        "episodes": np.array(filenames, dtype = str)
+    }
+    for name, columns_list in columns_of_logs.items():
+        for column_name, array in _concatenate_columns(columns_list).items():
+            arrays[name + "/" + column_name] = array
+
+    output_path.parent.mkdir(parents = True, exist_ok = True)
+    tmp_path = output_path.with_suffix(".tmp.npz")
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, output_path)
+
+def _concatenate_columns(columns_list):
+    """
+    Concatenate the columns of the log files of an ml client
+
+    @param columns_list A list of the columns of each log file.
+           The empty dict is for the log file without records.
+    """
+    episode_offsets = [0]
+    for columns in columns_list:
+        num_frames = len(columns["command"]) if columns else 0
+        episode_offsets.append(episode_offsets[-1] + num_frames)
+
+    non_empty_list = [columns for columns in columns_list if columns]
+    arrays = {"episode_offsets": np.array(episode_offsets, dtype = np.int64)}
+    if not non_empty_list:
+        return arrays
+
+    column_names = non_empty_list[0].keys()
+    for columns in non_empty_list:
+        if columns.keys() != column_names:
+            raise ValueError("The fields of the scene information are "
+                "different between log files")
+
+    for column_name in column_names:
+        if column_name.endswith("__vocab") or column_name.endswith("__values"):
+            continue
+
+        if column_name.endswith("__offsets"):
+            field = column_name[:-len("__offsets")]
+            values_list = [columns[field + "__values"] for columns in non_empty_list]
+            offsets = [np.zeros(1, dtype = np.int64)]
+            base = 0
+            for columns, values in zip(non_empty_list, values_list):
+                offsets.append(columns[column_name][1:] + base)
+                base += len(values)
+            arrays[field + "__values"] = np.concatenate(values_list)
+            arrays[column_name] = np.concatenate(offsets)
+        elif column_name + "__vocab" in column_names:
+            vocab = {}
+            codes_list = []
+            for columns in non_empty_list:
+                # The code -1 stands for None, and maps to the last element -1
+                code_map = np.array([vocab.setdefault(str(s), len(vocab))
+                    for s in columns[column_name + "__vocab"]] + [-1], dtype = np.int32)
+                codes_list.append(code_map[columns[column_name]])
+            arrays[column_name] = np.concatenate(codes_list)
+            arrays[column_name + "__vocab"] = np.array(list(vocab.keys()), dtype = str)
+        else:
+            arrays[column_name] = np.concatenate(
+                [columns[column_name] for columns in non_empty_list])
+
+    return arrays
+
+def get_command_parser():
+    """
+    Generate an ArgumentParser for parse the arguments in the command line
+    """
+    parser = ArgumentParser(prog = "python -m mlgame.dataset",
+        description = "Convert the log files of a game to a consolidated dataset")
+    subparsers = parser.add_subparsers(dest = "command", required = True)
+
+    build_parser = subparsers.add_parser("build",
+        help = "convert the log files in 'games/<game>/log/' to a dataset")
+    build_parser.add_argument("game", type = str,
+        help = "the name of the game")
+    build_parser.add_argument("--workers", type = int, default = None, metavar = "N",
+        help = "the number of worker processes for converting the log files "
+        "[default: the number of CPUs]")
+    build_parser.add_argument("--output", type = str, default = None, metavar = "PATH",
+        help = "the path of the dataset file [default: games/<game>/dataset.npz]")
+
+    return parser
+
+def main(argv = None):
+    parser = get_command_parser()
+    args = parser.parse_args(argv)
+
+    if np is None:
+        parser.error("NumPy is required for building the dataset")
+    if args.workers is not None and args.workers < 1:
+        parser.error("The number of workers should be positive")
+
+    log_dir = get_log_dir(args.game)
+    if not log_dir.is_dir():
+        parser.error("The log directory '{}' does not exist".format(log_dir))
+
+    output_path = (Path(args.output) if args.output else
+        log_dir.parent.joinpath("dataset.npz"))
+    stats = build_dataset(log_dir, output_path, args.workers)
+
+    print("Converted: {}, cached: {}, failed: {}, removed: {}".format(
+        len(stats["converted"]), len(stats["cached"]),
+        len(stats["failed"]), len(stats["removed"])))
+    print("The dataset is written to '{}'".format(output_path))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+The single-process environment for driving a game directly from the python code
+"""
+
+from .exceptions import GameConfigError
+from .gameconfig import GameConfig
+
+def make(game_name: str, *game_params, headless: bool = True):
+    """
+    Create an environment of the specified game
+
+    For example:
+    ```python
+    env = make("arkanoid", "NORMAL", 3)
+    scene_info = env.reset()
+    done = False
+    while not done:
+        scene_info, status, done = env.step({"ml": "MOVE_LEFT"})
+    print(env.get_game_result())
+    ```
+
+    @param game_name The name of the game
+    @param game_params The game parameters. They are parsed by the `GAME_PARAMS`
+           defined in the game config as the command line does.
+    @param headless Whether to run the game without the display.
+           The game must support the headless mode if it's True.
+    @return An `Env` object
+    """
+    return Env(GameConfig(game_name), game_params, headless)
+
+class Env:
+    """
+    Execute the game in the current process without the ml processes
+
+    The game is updated by `step()` with the command dict which is the same as
+    the one passed to the `update()` of the game.
+
+    @var ml_names The name of ml clients defined by the game
+    """
+
+    def __init__(self, game_config: GameConfig, game_params, headless: bool):
+        """
+        Constructor
+
+        Use `make()` to create the `Env` instead.
+
+        @param game_config The `GameConfig` of the game
+        @param game_params A list of game parameters to be parsed
+        @param headless Whether to run the game without the display
+        """
+        game_setup = game_config.game_setup
+        if headless and not game_setup["support_headless"]:
+            raise GameConfigError("The game doesn't support the headless mode.")
+
+        self._game_cls = game_setup["game"]
+        self._game_params = game_config.parse_game_params(game_params)
+        self._headless = headless
+        self.ml_names = [client["name"] for client in game_setup["ml_clients"]]
+
+        self._game = self._create_game()
+        # The value returned from `update()` of the game at the last step
+        self._update_result = None
+        # Whether the game is updated in this round
+        self._is_updated = False
+
+    def _create_game(self):
+        if self._headless:
+            return self._game_cls(*self._game_params, headless = True)
+        return self._game_cls(*self._game_params)
+
+    @property
+    def game(self):
+        """
+        The game instance
+        """
+        return self._game
+
+    def reset(self) -> dict:
+        """
+        Reset the game for the next round
+
+        A new round is started even if the current round doesn't end, such as
+        stopping the round at a time limit. If the game has quit, a new game
+        instance will be created.
+
+        @return The scene information of the new round, which is the dict
+                returned from `get_player_scene_info()` of the game
+        """
+        if self._update_result == "QUIT":
+            self._game = self._create_game()
+        elif self._is_updated:
+            self._game.reset()
+
+        self._update_result = None
+        self._is_updated = False
+        return self._game.get_player_scene_info()
+
+    def step(self, cmd_dict: dict):
+        """
+        Update the game with the command dict for one frame
+
+        @param cmd_dict The command of each ml client, such as `{"ml": "MOVE_LEFT"}`
+        @return A tuple (`scene_info_dict`, `status`, `done`).
+                `scene_info_dict` is the scene information returned from
+                `get_player_scene_info()` of the game after updating.
+                `status` is the game status in the scene information, such as
+                "GAME_ALIVE" or "GAME_OVER", which is the same for all ml clients.
+                `done` indicates whether the round ends, which is True if
+                `update()` of the game returns "RESET" or "QUIT". If it's True,
+                invoke `reset()` before the next `step()`.
+        """
+        if self._update_result is not None:
+            raise RuntimeError("The round is ended. Invoke 'reset()' first.")
+
+        if not self._headless:
+            # Keep the window responsive
+            import pygame
+            pygame.event.pump()
+
+        self._update_result = self._game.update(cmd_dict)
+        self._is_updated = True
+        done = self._update_result == "RESET" or self._update_result == "QUIT"
+
+        scene_info_dict = self._game.get_player_scene_info()
+        status = scene_info_dict[self.ml_names[0]]["status"]
+
+        return scene_info_dict, status, done
+
+    def get_game_result(self):
+        """
+        Get the result of the game, which is returned from `get_game_result()`
+        of the game
+        """
+        return self._game.get_game_result()
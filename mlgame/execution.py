@@ -27,6 +27,8 @@ def execute():
 
     if execution_cmd.game_mode == GameMode.MANUAL:
         _run_manual_mode(execution_cmd, game_config.game_setup)
+    elif execution_cmd.episodes is not None:
+        _run_batch_mode(execution_cmd, game_config.game_setup)
     else:
         _run_ml_mode(execution_cmd, game_config.game_setup)
 
@@ -69,6 +71,17 @@ def _parse_command_line():
     except ExecutionCommandError:
         raise
 
+    if exec_cmd.headless and not game_config.game_setup["support_headless"]:
+        raise ExecutionCommandError(
+            f"The game '{exec_cmd.game_name}' doesn't support the headless mode.")
+
+    ml_names = [client["name"] for client in game_config.game_setup["ml_clients"]]
+    for ml_name in exec_cmd.conflated_ml_names:
+        if ml_name not in ml_names:
+            raise ExecutionCommandError(
+                f"The ml client '{ml_name}' specified by '--conflate' doesn't exist. "
+                f"Available clients: {ml_names}")
+
     return exec_cmd, game_config
 
 def _list_games():
@@ -139,6 +152,28 @@ def _run_ml_mode(execution_cmd: ExecutionCommand, game_setup):
     if returncode == -1:
         sys.exit(errno.GAME_EXECUTION_ERROR)
 
+def _run_batch_mode(execution_cmd: ExecutionCommand, game_setup):
+    """
+    Execute the game for several episodes in ml mode and print the statistics
+
+    @param execution_cmd The `ExecutionCommand` object
+    @param game_setup The `GAME_SETUP` defined in the game config
+    """
+    from .batch import BatchEvaluator
+    from .exceptions import ProcessError
+
+    ml_propties = _get_ml_executor_propties(execution_cmd, game_setup)
+
+    evaluator = BatchEvaluator(execution_cmd, game_setup, ml_propties)
+    try:
+        results = evaluator.start()
+    except ProcessError as e:
+        print("Error: Exception occurred in '{}' process:".format(e.process_name))
+        print(e.message)
+        sys.exit(errno.GAME_EXECUTION_ERROR)
+
+    evaluator.print_statistics(results)
+
 def _get_game_executor_propty(
         execution_cmd: ExecutionCommand, game_setup) -> GameMLModeExecutorProperty:
     """
@@ -196,7 +231,8 @@ def _get_ml_executor_propties(execution_cmd: ExecutionCommand, game_setup) -> li
             args = ()
             kwargs = module_kwargs
 
-        propties.append(MLExecutorProperty(ml_name, ml_module, args, kwargs))
+        propties.append(MLExecutorProperty(ml_name, ml_module, args, kwargs,
+            ml_name in execution_cmd.conflated_ml_names))
 
     return propties
 
@@ -5,6 +5,7 @@ import re
 
 from ._version import version
 from .exceptions import ExecutionCommandError
+from . import shared_memory_ring
 
 def get_command_parser():
     """
@@ -38,6 +39,36 @@ def get_command_parser():
         description = "Game execution options must be specified before <game> arguments.")
     group.add_argument("-f", "--fps", type = int, default = 30,
         help = "the updating frequency of the game process [default: %(default)s]")
+    group.add_argument("--lockstep", action = "store_true",
+        help = "[ml mode only] advance the game to the next frame as soon as "
+        "all ml clients send the command for the current frame, instead of "
+        "updating the game at the fixed FPS. [default: %(default)s]")
+    group.add_argument("--frame-deadline", type = float, default = None,
+        metavar = "MSEC",
+        help = "[lockstep only] the maximum time in milliseconds to wait for "
+        "the commands of a frame. The command of the client which doesn't respond "
+        "in time is regarded as None. [default: wait until all clients respond]")
+    group.add_argument("--headless", action = "store_true",
+        help = "[ml mode only] run the game without the display. The game screen "
+        "is not drawn and the window events are not handled. "
+        "The game must support the headless mode. [default: %(default)s]")
+    group.add_argument("--transport", choices = ("pipe", "shm"), default = "pipe",
+        help = "[ml mode only] the way to send the scene information to the ml clients. "
+        "'pipe' sends it via the pipe, and 'shm' writes it to a ring buffer in "
+        "the shared memory which requires python 3.8 or later. [default: %(default)s]")
+    group.add_argument("--conflate", type = str, action = "append", default = None,
+        metavar = "ML_NAME", dest = "conflated_ml_names",
+        help = "[ml mode only] make the specified ml client always receive the latest "
+        "scene information and skip the older ones it hasn't received, instead of "
+        "queuing them. For multiple clients, use this flag multiple times.")
+    group.add_argument("--delta-encoding", action = "store_true",
+        help = "[ml mode only] send the scene information to the ml clients as "
+        "the difference from the previous one, and send the full scene information "
+        "periodically. The ml clients still receive the full scene information. "
+        "Not available with '--transport shm'. [default: %(default)s]")
+    group.add_argument("--keyframe-interval", type = int, default = None, metavar = "N",
+        help = "[delta encoding only] the maximum number of frames between two "
+        "full scene information [default: 60]")
     group.add_argument("-m", "--manual-mode", action = "store_true",
         help = "start the game in the manual mode instead of "
         "the machine learning mode [default: %(default)s]")
@@ -45,6 +76,20 @@ def get_command_parser():
         help = "pickle the game progress (a list of SceneInfo) to the log file. "
         "One file for a round, and stored in '<game>/log/' directory. "
         "[default: %(default)s]")
+    group.add_argument("--record-format", choices = ("pickle", "stream", "npz"),
+        default = None,
+        help = "[record only] the format of the log file. 'pickle' pickles the whole "
+        "game progress of a round to a '.pickle' file at the end of the round. "
+        "'stream' appends the progress of each frame to a '.stream' file during "
+        "the round. 'npz' stores the game progress as typed NumPy arrays in a '.npz' "
+        "file, which requires NumPy. [default: pickle]")
+    group.add_argument("--record-compression", choices = ("gzip", "bz2", "lzma"),
+        default = None,
+        help = "[record only] compress the log file with the specified codec. "
+        "The compression is done in a background thread, and the suffix of the codec "
+        "('.gz', '.bz2', or '.xz') is appended to the filename. For the 'npz' format, "
+        "the arrays are stored in the compressed '.npz' file regardless of the codec. "
+        "[default: no compression]")
     group.add_argument("-1", "--one-shot", action = "store_true", dest = "one_shot_mode",
         help = "quit the game when the game is passed or is over. "
         "Otherwise, the game will restart automatically. [default: %(default)s]")
@@ -58,6 +103,18 @@ def get_command_parser():
         "If the script is in the subdirectory of the 'ml' directory, make sure the "
         "subdirectory has '__init__.py' file.")
 
+    group = parser.add_argument_group(title = "batch evaluation options",
+        description = "Run the game for several episodes in parallel. "
+        "Each episode is a single round executed in the headless and lockstep mode. "
+        "The ml clients are executed in the same process as the game, "
+        "and only python scripts are supported.")
+    group.add_argument("--episodes", type = int, default = None, metavar = "N",
+        help = "the number of episodes to be executed, and print the statistics of "
+        "the game results at the end")
+    group.add_argument("--workers", type = int, default = None, metavar = "N",
+        help = "the number of worker processes for executing episodes "
+        "[default: the number of CPUs]")
+
     return parser
 
 class GameMode(Enum):
@@ -79,8 +136,26 @@ class ExecutionCommand:
     @var game_mode The mode of the game to be executed.
          It will be one of attributes of `GameMode`.
     @var record_progress Whether to record the game progress
+    @var record_format The format of the log file.
+         It will be "pickle", "stream", or "npz".
+    @var record_compression The codec for compressing the log file.
+         It will be "gzip", "bz2", "lzma", or None.
     @var fps The FPS of the game
+    @var headless Whether to run the game without the display
+    @var transport The way to send the scene information to the ml clients.
+         It will be "pipe" or "shm".
+    @var conflated_ml_names A list of the name of ml clients which only receive
+         the latest scene information
+    @var delta_keyframe_interval The maximum number of frames between two
+         full scene information if the delta encoding is enabled. None if the
+         delta encoding is not enabled.
+    @var lockstep Whether to advance the game as soon as all ml clients respond
+    @var frame_deadline The maximum time in seconds to wait for the commands of
+         a frame in the lockstep mode. None for waiting until all clients respond.
     @var input_modules A list of user modules for running the ML mode
+    @var episodes The number of episodes to be executed in the batch evaluation.
+         None if the batch evaluation is not enabled.
+    @var workers The number of worker processes for the batch evaluation
     """
 
     def __init__(self, parsed_args):
@@ -93,14 +168,137 @@ class ExecutionCommand:
         self.game_mode = GameMode.MANUAL if parsed_args.manual_mode else GameMode.ML
         self.one_shot_mode = parsed_args.one_shot_mode
         self.record_progress = parsed_args.record_progress
+        if parsed_args.record_format is None:
+            self.record_format = "pickle"
+        elif not self.record_progress:
+            raise ExecutionCommandError(
+                "'--record-format' is only available when the game progress is recorded.")
+        else:
+            self.record_format = parsed_args.record_format
+
+        if self.record_format == "npz":
+            self._check_npz_available()
+
+        self.record_compression = parsed_args.record_compression
+        if self.record_compression is not None and not self.record_progress:
+            raise ExecutionCommandError(
+                "'--record-compression' is only available when the game progress "
+                "is recorded.")
 
         self.fps = parsed_args.fps
+        if self.fps <= 0:
+            raise ExecutionCommandError("The FPS should be a positive integer.")
+
+        self.headless = parsed_args.headless
+        if self.headless and self.game_mode == GameMode.MANUAL:
+            raise ExecutionCommandError(
+                "The headless mode is only available in the machine learning mode.")
+
+        self.transport = parsed_args.transport
+        if self.transport != "pipe" and self.game_mode == GameMode.MANUAL:
+            raise ExecutionCommandError(
+                "'--transport' is only available in the machine learning mode.")
+        if self.transport == "shm" and not shared_memory_ring.is_available():
+            raise ExecutionCommandError(
+                "The shared memory transport requires python 3.8 or later.")
+
+        self.conflated_ml_names = parsed_args.conflated_ml_names or []
+        if self.conflated_ml_names and self.game_mode == GameMode.MANUAL:
+            raise ExecutionCommandError(
+                "'--conflate' is only available in the machine learning mode.")
+
+        self._parse_delta_options(parsed_args.delta_encoding, parsed_args.keyframe_interval)
+
+        self.lockstep = parsed_args.lockstep
+        if self.lockstep and self.game_mode == GameMode.MANUAL:
+            raise ExecutionCommandError(
+                "The lockstep mode is only available in the machine learning mode.")
+
+        if parsed_args.frame_deadline is None:
+            self.frame_deadline = None
+        elif not self.lockstep:
+            raise ExecutionCommandError(
+                "'--frame-deadline' is only available in the lockstep mode.")
+        elif parsed_args.frame_deadline <= 0:
+            raise ExecutionCommandError("The frame deadline should be positive.")
+        else:
+            self.frame_deadline = parsed_args.frame_deadline / 1000
 
         self.input_modules = self._parse_ml_scripts(parsed_args.input_script)
         if self.game_mode == GameMode.ML and len(self.input_modules) == 0:
             raise ExecutionCommandError("No script or module is specified. "
                 "Cannot start the game in the machine learning mode.")
 
+        self._parse_batch_options(parsed_args.episodes, parsed_args.workers)
+
+    def _parse_delta_options(self, delta_encoding, keyframe_interval):
+        """
+        Check the options of the delta encoding
+        """
+        if not delta_encoding:
+            if keyframe_interval is not None:
+                raise ExecutionCommandError(
+                    "'--keyframe-interval' is only available with '--delta-encoding'.")
+            self.delta_keyframe_interval = None
+            return
+
+        if self.game_mode == GameMode.MANUAL:
+            raise ExecutionCommandError(
+                "'--delta-encoding' is only available in the machine learning mode.")
+        # The ring buffer may overwrite the delta not received yet
+        if self.transport == "shm":
+            raise ExecutionCommandError(
+                "'--delta-encoding' is not available with '--transport shm'.")
+        if keyframe_interval is not None and keyframe_interval <= 0:
+            raise ExecutionCommandError("The keyframe interval should be positive.")
+
+        self.delta_keyframe_interval = keyframe_interval or 60
+
+    def _parse_batch_options(self, episodes, workers):
+        """
+        Check the options of the batch evaluation
+
+        If the batch evaluation is enabled, the game is executed in the headless
+        and lockstep mode.
+        """
+        self.episodes = episodes
+        self.workers = workers
+
+        if self.episodes is None:
+            if self.workers is not None:
+                raise ExecutionCommandError(
+                    "'--workers' is only available in the batch evaluation.")
+            return
+
+        if self.episodes <= 0:
+            raise ExecutionCommandError("The number of episodes should be positive.")
+        if self.workers is not None and self.workers <= 0:
+            raise ExecutionCommandError("The number of workers should be positive.")
+        if self.game_mode == GameMode.MANUAL:
+            raise ExecutionCommandError(
+                "The batch evaluation is only available in the machine learning mode.")
+        if self.record_progress:
+            raise ExecutionCommandError(
+                "The game progress cannot be recorded in the batch evaluation.")
+        for module in self.input_modules:
+            if isinstance(module, tuple):
+                raise ExecutionCommandError(
+                    "The non-python script is not supported in the batch evaluation.")
+
+        self.one_shot_mode = True
+        self.headless = True
+        self.lockstep = True
+
+    def _check_npz_available(self):
+        """
+        Check whether NumPy is installed for the npz record format
+        """
+        # Import here for avoiding the circular import
+        from .npz_record import is_available
+
+        if not is_available():
+            raise ExecutionCommandError("NumPy is required for the npz record format.")
+
     def _parse_ml_scripts(self, input_scripts):
         """
         Check whether the provided input scripts are all existing or not
@@ -144,6 +342,16 @@ class ExecutionCommand:
             "'game_mode': {}, ".format(self.game_mode) +
             "'one_shot_mode': {}, ".format(self.one_shot_mode) +
             "'record_progress': {}, ".format(self.record_progress) +
+            "'record_format': {}, ".format(self.record_format) +
+            "'record_compression': {}, ".format(self.record_compression) +
             "'fps': {}, ".format(self.fps) +
-            "'input_modules': {}".format(self.input_modules) +
+            "'headless': {}, ".format(self.headless) +
+            "'transport': {}, ".format(self.transport) +
+            "'conflated_ml_names': {}, ".format(self.conflated_ml_names) +
+            "'delta_keyframe_interval': {}, ".format(self.delta_keyframe_interval) +
+            "'lockstep': {}, ".format(self.lockstep) +
+            "'frame_deadline': {}, ".format(self.frame_deadline) +
+            "'input_modules': {}, ".format(self.input_modules) +
+            "'episodes': {}, ".format(self.episodes) +
+            "'workers': {}".format(self.workers) +
             "}")
@@ -6,6 +6,7 @@ import importlib
 import inspect
 
 from .exceptions import GameConfigError
+from .utils.argparser_generator import get_parser_from_dict
 
 CONFIG_FILE_NAME = "config.py"
 
@@ -36,6 +37,24 @@ class GameConfig:
 
         self._process_game_setup_dict()
 
+    def parse_game_params(self, game_params) -> list:
+        """
+        Parse the game parameters by the `GAME_PARAMS` as the command line does
+
+        @param game_params A list of game parameters. The parameter will be
+               converted to `str` before parsing, such as `["NORMAL", 3]`.
+        @return A list of the parsed game parameters
+        """
+        param_parser = get_parser_from_dict(self.game_params)
+        try:
+            parsed_game_params = param_parser.parse_args(
+                [str(param) for param in game_params])
+        except SystemExit:
+            raise GameConfigError(
+                "Invalid game parameters {}".format(list(game_params)))
+
+        return [value for value in vars(parsed_game_params).values()]
+
     def _load_game_config(self, game_name):
         """
         Load the game config
@@ -82,6 +101,10 @@ class GameConfig:
         - "game": Specify the class of the game to be execute
         - "dynamic_ml_clients": (Optional) Whether the number of ml clients is decided by
           the number of input scripts.
+        - "support_headless": (Optional) Whether the game can be executed without
+          the display. If it's True, the game class must accept a keyword argument
+          `headless`, and skip creating the display and drawing the screen
+          when it's True.
         - "ml_clients": A list containing the information of the ml client.
             Each element in the list is a dictionary in which members are:
             - "name": A string which is the name of the ml client.
@@ -111,6 +134,9 @@ class GameConfig:
                     f"in '{CONFIG_FILE_NAME}'")
             ml_names.append(client_name)
 
+        if not self.game_setup.get("support_headless"):
+            self.game_setup["support_headless"] = False
+
         if not self.game_setup.get("dynamic_ml_clients"):
             self.game_setup["dynamic_ml_clients"] = False
 
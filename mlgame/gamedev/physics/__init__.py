@@ -0,0 +1,420 @@
+"""
+The helper functions for physics
+
+The functions suffixed with `_xy` are the scalar versions of the functions
+of the same name. They take `pygame.Rect` or tuples (x, y, width, height) and
+scalars, and return tuples instead of creating `Vector2` and `Rect` objects,
+so they are suitable for being invoked every frame. The results are the same
+as the original functions.
+"""
+
+import math
+
+from pygame import Rect
+from pygame.sprite import Sprite
+
+def collide_or_contact(sprite_a: Sprite, sprite_b: Sprite) -> bool:
+    """
+    Check if two sprites are colliding or contacting
+    """
+    rect_a = sprite_a.rect
+    rect_b = sprite_b.rect
+
+    if (rect_a.left <= rect_b.right and
+        rect_a.right >= rect_b.left and
+        rect_a.top <= rect_b.bottom and
+        rect_a.bottom >= rect_b.top):
+        return True
+    return False
+
+def moving_collide_or_contact(moving_sprite: Sprite, sprite: Sprite) -> bool:
+    """
+    Check if the moving sprite collides or contacts another sprite.
+
+    @param moving_sprite The sprite that moves in the scene.
+           It must contain `rect` and `last_pos` attributes, which both are `pygame.Rect`.
+    @param sprite The sprite that will be collided or contacted by `moving_sprite`.
+           It must contain `rect` attribute, which is also `pygame.Rect`.
+    """
+    return moving_collide_or_contact_xy(
+        moving_sprite.last_pos, moving_sprite.rect, sprite.rect)
+
+def moving_collide_or_contact_xy(last_rect, rect, target_rect) -> bool:
+    """
+    The scalar version of `moving_collide_or_contact()`. It has the same result
+    without creating `Vector2` and `Rect` objects.
+
+    @param last_rect The rect of the moving object at the last frame
+    @param rect The rect of the moving object at the current frame
+    @param target_rect The rect that will be collided or contacted by the moving object
+    The rects are `pygame.Rect` or tuples (x, y, width, height) of integers.
+    """
+    last_left, last_top, last_width, last_height = last_rect
+    last_right = last_left + last_width
+    last_bottom = last_top + last_height
+    left, top, width, height = rect
+    right = left + width
+    bottom = top + height
+
+    # Check the routine of 4 corners of the moving object
+    return (
+        _routine_collide_or_contact(target_rect, last_left, last_top, left, top) or
+        _routine_collide_or_contact(target_rect, last_right, last_top, right, top) or
+        _routine_collide_or_contact(target_rect, last_left, last_bottom, left, bottom) or
+        _routine_collide_or_contact(target_rect, last_right, last_bottom, right, bottom))
+
+def _routine_collide_or_contact(target_rect, start_x, start_y, end_x, end_y) -> bool:
+    """
+    Check if the routine collides the rect, excluding the case that
+    the routine starts from the surface of the rect
+    """
+    target_left, target_top, target_width, target_height = target_rect
+    if (target_left <= start_x <= target_left + target_width and
+        target_top <= start_y <= target_top + target_height):
+        return False
+
+    return rect_collideline_xy(target_rect, start_x, start_y, end_x, end_y)
+
+def swept_aabb(last_rect, rect, target_rect):
+    """
+    Compute the time of impact and the contact normal of the moving rect
+    against the static target rect
+
+    The moving rect moves from `last_rect` to `rect` linearly in a frame, and
+    the whole swept area is checked at once, so it won't miss the contact
+    at the high speed. As `collide_or_contact()`, contacting the surface is
+    regarded as a collision, including touching the corner when passing by it.
+    If the moving rect already overlaps the target rect at `last_rect`, or
+    it touches the target rect at `last_rect` and then leaves, it's not regarded
+    as a collision, which is similar to excluding the routines starting from
+    the surface of the target rect in `moving_collide_or_contact()`.
+
+    @param last_rect The rect of the moving object at the last frame
+    @param rect The rect of the moving object at the current frame.
+           Its size should be the same as `last_rect`.
+    @param target_rect The rect of the target object
+    The rects are `pygame.Rect` or tuples (x, y, width, height).
+    @return None if the moving rect doesn't collide the target rect in the movement.
+            Otherwise, a tuple (`time`, `normal_x`, `normal_y`). `time` is in [0, 1],
+            which is the fraction of the movement when the moving rect starts
+            contacting the target rect. (`normal_x`, `normal_y`) is the normal of
+            the contacted surface of the target rect, such as (0, -1) for
+            the top surface. Both are non-zero if it contacts the corner.
+    """
+    last_left, last_top, width, height = last_rect
+    target_left, target_top, target_width, target_height = target_rect
+    move_x = rect[0] - last_left
+    move_y = rect[1] - last_top
+
+    entry_x, exit_x = _sweep_axis(last_left, last_left + width,
+        target_left, target_left + target_width, move_x)
+    if entry_x is None:
+        return None
+    entry_y, exit_y = _sweep_axis(last_top, last_top + height,
+        target_top, target_top + target_height, move_y)
+    if entry_y is None:
+        return None
+
+    # `_sweep_axis()` may return -0.0 for the contact at the beginning,
+    # which is the same as 0.0.
+    entry_time = max(entry_x, entry_y) + 0.0
+    exit_time = min(exit_x, exit_y)
+    if entry_time < 0 or entry_time > 1 or entry_time > exit_time:
+        return None
+    # The moving rect which touches the target rect at the beginning but
+    # doesn't overlap it along the path, such as leaving the corner, is excluded
+    # as the routines starting from the surface of the target rect.
+    if entry_time == 0 and exit_time == 0:
+        return None
+
+    normal_x = 0 if entry_x < entry_y else (-1 if move_x > 0 else 1)
+    normal_y = 0 if entry_y < entry_x else (-1 if move_y > 0 else 1)
+
+    return entry_time, normal_x, normal_y
+
+def _sweep_axis(low, high, target_low, target_high, move):
+    """
+    Compute the time interval of the overlap of a moving segment [low, high]
+    and the target segment on an axis
+
+    @return A tuple (`entry_time`, `exit_time`), or (None, None) if they never overlap
+    """
+    if move > 0:
+        return (target_low - high) / move, (target_high - low) / move
+    if move < 0:
+        return (target_high - low) / move, (target_low - high) / move
+    if low <= target_high and high >= target_low:
+        return -math.inf, math.inf
+    return None, None
+
+def line_intersect(line_a, line_b) -> bool:
+    """
+    Check if two line segments intersect
+
+    @param line_a A tuple (Vector2, Vector2) representing both end points
+           of line segment
+    @param line_b Same as `line_a`
+    """
+    return line_intersect_xy(
+        line_a[0][0], line_a[0][1], line_a[1][0], line_a[1][1],
+        line_b[0][0], line_b[0][1], line_b[1][0], line_b[1][1])
+
+def line_intersect_xy(a_x0, a_y0, a_x1, a_y1, b_x0, b_y0, b_x1, b_y1) -> bool:
+    """
+    The scalar version of `line_intersect()`
+
+    @param a_x0,a_y0,a_x1,a_y1 Both end points (a_x0, a_y0) and (a_x1, a_y1)
+           of the line segment a
+    @param b_x0,b_y0,b_x1,b_y1 Both end points of the line segment b
+    """
+    # line_a and line_b have the same end point
+    if ((a_x0 == b_x0 and a_y0 == b_y0) or
+        (a_x1 == b_x0 and a_y1 == b_y0) or
+        (a_x0 == b_x1 and a_y0 == b_y1) or
+        (a_x1 == b_x1 and a_y1 == b_y1)):
+        return True
+
+    # Set line_a to (u0, u0 + v0) and p0 = u0 + s * v0, and
+    # set line_b to (u1, u1 + v1) and p1 = u1 + t * v1,
+    # where u, v, p are vectors and s, t is in [0, 1].
+    # If line_a and line_b intersects, then p0 = p1
+    # -> u0 - u1 = -s * v0 + t * v1
+    # -> | u0.x - u1.x |   | v0.x  v1.x | |-s |
+    #    | u0.y - u1.y | = | v0.y  v1.y | | t |
+    #
+    # If left-hand vector is a zero vector, then two line segments has the same end point.
+    # If the right-hand matrix is not invertible, then two line segments are parallel.
+    # If none of above conditions is matched, find the solution of s and t,
+    # if both s and t are in [0, 1], then two line segments intersect.
+
+    v0_x = a_x1 - a_x0
+    v0_y = a_y1 - a_y0
+    v1_x = b_x1 - b_x0
+    v1_y = b_y1 - b_y0
+    det = v0_x * v1_y - v0_y * v1_x
+    # Two line segments are parallel
+    if det == 0:
+        # TODO Determine if two lines overlap
+        return False
+
+    du_x = a_x0 - b_x0
+    du_y = a_y0 - b_y0
+    s_det = v1_x * du_y - v1_y * du_x
+    t_det = v0_x * du_y - v0_y * du_x
+
+    if ((det > 0 and 0 <= s_det <= det and 0 <= t_det <= det) or
+        (det < 0 and det <= s_det <= 0 and det <= t_det <= 0)):
+        return True
+
+    return False
+
+def rect_collideline(rect: Rect, line) -> bool:
+    """
+    Check if line segment intersects with a rect
+
+    @param rect The Rect of the target rectangle
+    @param line A tuple (Vector2, Vector2) representing both end points
+           of line segment
+    """
+    return rect_collideline_xy(rect, line[0][0], line[0][1], line[1][0], line[1][1])
+
+def rect_collideline_xy(rect, x0, y0, x1, y1) -> bool:
+    """
+    The scalar version of `rect_collideline()`
+
+    @param rect The `pygame.Rect` or a tuple (x, y, width, height) of
+           the target rectangle
+    @param x0,y0,x1,y1 Both end points (x0, y0) and (x1, y1) of line segment.
+           They are integers as the corners of the rect.
+    """
+    left, top, width, height = rect
+    right = left + width
+    bottom = top + height
+
+    # Either of line ends is in the target rect.
+    # Take the bottom and right line into account.
+    if ((left <= x0 <= right and top <= y0 <= bottom) or
+        (left <= x1 <= right and top <= y1 <= bottom)):
+        return True
+
+    return (
+        line_intersect_xy(left, top, right, top, x0, y0, x1, y1) or         # top
+        line_intersect_xy(left, bottom, right, bottom, x0, y0, x1, y1) or   # bottom
+        line_intersect_xy(left, top, left, bottom, x0, y0, x1, y1) or       # left
+        line_intersect_xy(right, top, right, bottom, x0, y0, x1, y1))       # right
+
+def rect_break_or_contact_box(rect: Rect, box: Rect):
+    """
+    Determine if the `rect` breaks the `box` or it contacts the border of `box`
+
+    @param rect The Rect of the target rectangle
+    @param box The target box
+    """
+    return (
+        rect.left <= box.left or
+        rect.right >= box.right or
+        rect.top <= box.top or
+        rect.bottom >= box.bottom)
+
+def bounce_off_ip(bounce_obj_rect: Rect, bounce_obj_speed,
+    hit_obj_rect: Rect, hit_obj_speed):
+    """
+    Calculate the speed and position of the `bounce_obj` after it bounces off the `hit_obj`.
+    The position of `bounce_obj_rect` and the value of `bounce_obj_speed` will be updated.
+
+    This function should be called only when two objects are colliding.
+
+    @param bounce_obj_rect The Rect of the bouncing object
+    @param bounce_obj_speed The 2D speed vector of the bouncing object.
+    @param hit_obj_rect The Rect of the hit object
+    @param hit_obj_speed The 2D speed vector of the hit object
+    """
+    (bounce_obj_rect.x, bounce_obj_rect.y,
+     bounce_obj_speed[0], bounce_obj_speed[1]) = bounce_off_xy(
+        bounce_obj_rect, bounce_obj_speed, hit_obj_rect, hit_obj_speed)
+
+def bounce_off_xy(bounce_obj_rect, bounce_obj_speed, hit_obj_rect, hit_obj_speed):
+    """
+    The scalar version of `bounce_off_ip()`. The function returns the result
+    instead of updating the value of `bounce_obj_rect` and `bounce_obj_speed`.
+
+    This function should be called only when two objects are colliding.
+
+    @param bounce_obj_rect The `pygame.Rect` or a tuple (x, y, width, height) of
+           the bouncing object
+    @param bounce_obj_speed The 2D speed vector of the bouncing object.
+    @param hit_obj_rect The `pygame.Rect` or a tuple (x, y, width, height) of
+           the hit object
+    @param hit_obj_speed The 2D speed vector of the hit object
+    @return A tuple (`x`, `y`, `speed_x`, `speed_y`) of the bouncing object
+    """
+    bounce_x, bounce_y, bounce_width, bounce_height = bounce_obj_rect
+    hit_x, hit_y, hit_width, hit_height = hit_obj_rect
+    speed_x, speed_y = bounce_obj_speed
+    new_x = bounce_x
+    new_y = bounce_y
+
+    # Treat the hit object as an unmovable object
+    speed_diff_x = speed_x - hit_obj_speed[0]
+    speed_diff_y = speed_y - hit_obj_speed[1]
+
+    # The relative position between top and bottom, and left and right
+    # of two objects at the last frame
+    rect_diff_bT_hB = hit_y + hit_height - bounce_y + speed_diff_y
+    rect_diff_bB_hT = hit_y - (bounce_y + bounce_height) + speed_diff_y
+    rect_diff_bL_hR = hit_x + hit_width - bounce_x + speed_diff_x
+    rect_diff_bR_hL = hit_x - (bounce_x + bounce_width) + speed_diff_x
+
+    # Get the surface distance from the bouncing object to the hit object
+    # and the new position for the bouncing object if it really hit the object
+    # according to their relative position
+    ## The bouncing object is at the bottom
+    if rect_diff_bT_hB < 0 and rect_diff_bB_hT < 0:
+        surface_diff_y = rect_diff_bT_hB
+        extract_pos_y = hit_y + hit_height
+    ## The bouncing object is at the top
+    elif rect_diff_bT_hB > 0 and rect_diff_bB_hT > 0:
+        surface_diff_y = rect_diff_bB_hT
+        extract_pos_y = hit_y - bounce_height
+    else:
+        surface_diff_y = -1 if speed_diff_y > 0 else 1
+
+    ## The bouncing object is at the right
+    if rect_diff_bL_hR < 0 and rect_diff_bR_hL < 0:
+        surface_diff_x = rect_diff_bL_hR
+        extract_pos_x = hit_x + hit_width
+    ## The bouncing object is at the left
+    elif rect_diff_bL_hR > 0 and rect_diff_bR_hL > 0:
+        surface_diff_x = rect_diff_bR_hL
+        extract_pos_x = hit_x - bounce_width
+    else:
+        surface_diff_x = -1 if speed_diff_x > 0 else 1
+
+    # Calculate the duration to hit the surface for x and y coordination.
+    time_hit_y = surface_diff_y / speed_diff_y
+    time_hit_x = surface_diff_x / speed_diff_x
+
+    if time_hit_y >= 0 and time_hit_y >= time_hit_x:
+        speed_y *= -1
+        new_y = extract_pos_y
+
+    if time_hit_x >= 0 and time_hit_y <= time_hit_x:
+        speed_x *= -1
+        new_x = extract_pos_x
+
+    return new_x, new_y, speed_x, speed_y
+
+def bounce_off(bounce_obj_rect: Rect, bounce_obj_speed,
+    hit_obj_rect: Rect, hit_obj_speed):
+    """
+    The alternative version of `bounce_off_ip`. The function returns the result
+    instead of updating the value of `bounce_obj_rect` and `bounce_obj_speed`.
+
+    @return A tuple (`new_bounce_obj_rect`, `new_bounce_obj_speed`)
+    """
+    new_bounce_obj_rect = bounce_obj_rect.copy()
+    new_bounce_obj_speed = bounce_obj_speed.copy()
+
+    bounce_off_ip(new_bounce_obj_rect, new_bounce_obj_speed,
+        hit_obj_rect, hit_obj_speed)
+
+    return new_bounce_obj_rect, new_bounce_obj_speed
+
+def bounce_in_box_ip(bounce_obj_rect: Rect, bounce_obj_speed,
+    box_rect: Rect):
+    """
+    Bounce the object if it hits the border of the box.
+    The speed and the position of the `bounce_obj` will be updated.
+
+    @param bounce_obj_rect The Rect of the bouncing object
+    @param bounce_obj_speed The 2D speed vector of the bouncing object.
+    """
+    (bounce_obj_rect.x, bounce_obj_rect.y,
+     bounce_obj_speed[0], bounce_obj_speed[1]) = bounce_in_box_xy(
+        bounce_obj_rect, bounce_obj_speed, box_rect)
+
+def bounce_in_box_xy(bounce_obj_rect, bounce_obj_speed, box_rect):
+    """
+    The scalar version of `bounce_in_box_ip()`. The function returns the result
+    instead of updating the value of `bounce_obj_rect` and `bounce_obj_speed`.
+
+    @param bounce_obj_rect The `pygame.Rect` or a tuple (x, y, width, height) of
+           the bouncing object
+    @param bounce_obj_speed The 2D speed vector of the bouncing object.
+    @param box_rect The `pygame.Rect` or a tuple (x, y, width, height) of the box
+    @return A tuple (`x`, `y`, `speed_x`, `speed_y`) of the bouncing object
+    """
+    x, y, width, height = bounce_obj_rect
+    box_x, box_y, box_width, box_height = box_rect
+    speed_x, speed_y = bounce_obj_speed
+
+    if x <= box_x:
+        x = box_x
+        speed_x *= -1
+    elif x + width >= box_x + box_width:
+        x = box_x + box_width - width
+        speed_x *= -1
+
+    if y <= box_y:
+        y = box_y
+        speed_y *= -1
+    elif y + height >= box_y + box_height:
+        y = box_y + box_height - height
+        speed_y *= -1
+
+    return x, y, speed_x, speed_y
+
+def bounce_in_box(bounce_obj_rect: Rect, bounce_obj_speed,
+    box_rect: Rect):
+    """
+    The alternative version of `bounce_in_box_ip`. The function returns the result
+    instead of updating the value of `bounce_obj_rect` and `bounce_obj_speed`.
+
+    @return A tuple (new_bounce_obj_rect, new_bounce_obj_speed)
+    """
+    new_bounce_obj_rect = bounce_obj_rect.copy()
+    new_bounce_obj_speed = bounce_obj_speed.copy()
+
+    bounce_in_box_ip(new_bounce_obj_rect, new_bounce_obj_speed, box_rect)
+
+    return (new_bounce_obj_rect, new_bounce_obj_speed)
@@ -0,0 +1,334 @@
+"""
+The batched versions of the physics functions for many objects at once
+
+The rects are NumPy arrays of shape (M, 4) or (N, 4), of which each row is
+(x, y, width, height) as `pygame.Rect`, and the speeds are arrays of shape (M, 2).
+The results are the same as the scalar functions in `mlgame.gamedev.physics`
+applied to each row, including the integer or float type of the values.
+
+NumPy is required for this module.
+"""
+
+import numpy as np
+
+def _rect_edges(rects):
+    """
+    Get the (left, top, right, bottom) columns of the rects
+    """
+    rects = np.asarray(rects)
+    left = rects[..., 0]
+    top = rects[..., 1]
+    return left, top, left + rects[..., 2], top + rects[..., 3]
+
+def collide_or_contact(rects_a, rects_b):
+    """
+    Check if each rect in `rects_a` collides or contacts each rect in `rects_b`
+
+    @param rects_a The rects of shape (M, 4)
+    @param rects_b The rects of shape (N, 4)
+    @return A bool array of shape (M, N). The element (i, j) is the result of
+            `physics.collide_or_contact()` of `rects_a[i]` and `rects_b[j]`.
+    """
+    a_left, a_top, a_right, a_bottom = (v[:, None] for v in _rect_edges(rects_a))
+    b_left, b_top, b_right, b_bottom = (v[None, :] for v in _rect_edges(rects_b))
+
+    return ((a_left <= b_right) & (a_right >= b_left) &
+        (a_top <= b_bottom) & (a_bottom >= b_top))
+
+def moving_collide_or_contact(last_rects, rects, target_rects):
+    """
+    Check if each moving rect collides or contacts each target rect
+
+    @param last_rects The rects of shape (M, 4) of the moving objects at the last frame
+    @param rects The rects of shape (M, 4) of the moving objects at the current frame
+    @param target_rects The rects of shape (N, 4)
+    @return A bool array of shape (M, N). The element (i, j) is the result of
+            `physics.moving_collide_or_contact_xy()` of `last_rects[i]`, `rects[i]`,
+            and `target_rects[j]`.
+    """
+    last_left, last_top, last_right, last_bottom = (
+        v[:, None] for v in _rect_edges(last_rects))
+    left, top, right, bottom = (v[:, None] for v in _rect_edges(rects))
+    target_edges = tuple(v[None, :] for v in _rect_edges(target_rects))
+
+    # The routine of 4 corners of the moving object
+    routines = (
+        (last_left, last_top, left, top),
+        (last_right, last_top, right, top),
+        (last_left, last_bottom, left, bottom),
+        (last_right, last_bottom, right, bottom)
+    )
+
+    result = np.zeros(np.broadcast(left, target_edges[0]).shape, dtype = bool)
+    for start_x, start_y, end_x, end_y in routines:
+        # Exclude the case that the routine starts from the surface of the target
+        start_inside = _point_in_rect(start_x, start_y, *target_edges)
+        result |= ~start_inside & _rect_collideline(
+            target_edges, start_x, start_y, end_x, end_y)
+
+    return result
+
+def rect_collideline(rects, lines):
+    """
+    Check if each line segment intersects with each rect
+
+    @param rects The rects of shape (N, 4)
+    @param lines The line segments of shape (M, 4), of which each row is
+           (x0, y0, x1, y1) of both end points
+    @return A bool array of shape (M, N). The element (i, j) is the result of
+            `physics.rect_collideline_xy()` of `rects[j]` and `lines[i]`.
+    """
+    lines = np.asarray(lines)
+    x0, y0, x1, y1 = (lines[:, i, None] for i in range(4))
+    rect_edges = tuple(v[None, :] for v in _rect_edges(rects))
+
+    return _rect_collideline(rect_edges, x0, y0, x1, y1)
+
+def _point_in_rect(x, y, left, top, right, bottom):
+    """
+    Check if the point is in the rect, including the right and bottom border
+    """
+    return (left <= x) & (x <= right) & (top <= y) & (y <= bottom)
+
+def _rect_collideline(rect_edges, x0, y0, x1, y1):
+    left, top, right, bottom = rect_edges
+
+    return (
+        _point_in_rect(x0, y0, *rect_edges) |
+        _point_in_rect(x1, y1, *rect_edges) |
+        _line_intersect(left, top, right, top, x0, y0, x1, y1) |         # top
+        _line_intersect(left, bottom, right, bottom, x0, y0, x1, y1) |   # bottom
+        _line_intersect(left, top, left, bottom, x0, y0, x1, y1) |       # left
+        _line_intersect(right, top, right, bottom, x0, y0, x1, y1))      # right
+
+def _line_intersect(a_x0, a_y0, a_x1, a_y1, b_x0, b_y0, b_x1, b_y1):
+    """
+    The element-wise version of `physics.line_intersect_xy()`
+    """
+    same_end_point = (
+        ((a_x0 == b_x0) & (a_y0 == b_y0)) |
+        ((a_x1 == b_x0) & (a_y1 == b_y0)) |
+        ((a_x0 == b_x1) & (a_y0 == b_y1)) |
+        ((a_x1 == b_x1) & (a_y1 == b_y1)))
+
+    v0_x = a_x1 - a_x0
+    v0_y = a_y1 - a_y0
+    v1_x = b_x1 - b_x0
+    v1_y = b_y1 - b_y0
+    det = v0_x * v1_y - v0_y * v1_x
+
+    du_x = a_x0 - b_x0
+    du_y = a_y0 - b_y0
+    s_det = v1_x * du_y - v1_y * du_x
+    t_det = v0_x * du_y - v0_y * du_x
+
+    # The parallel line segments (det == 0) don't intersect
+    return (same_end_point |
+        ((det > 0) & (0 <= s_det) & (s_det <= det) & (0 <= t_det) & (t_det <= det)) |
+        ((det < 0) & (det <= s_det) & (s_det <= 0) & (det <= t_det) & (t_det <= 0)))
+
+def swept_aabb(last_rects, rects, target_rects):
+    """
+    Compute the time of impact and the contact normal of each moving rect
+    against the target rect
+
+    The rects are broadcast against each other by the leading dimensions.
+    For example, the moving rects of shape (M, 4) and the target rects of shape
+    (M, 4) are paired row by row, and the moving rects of shape (M, 1, 4) and
+    the target rects of shape (N, 4) are checked for all (M, N) pairs.
+
+    @param last_rects The rects of the moving objects at the last frame
+    @param rects The rects of the moving objects at the current frame
+    @param target_rects The rects of the target objects
+    @return A tuple (`times`, `normals_x`, `normals_y`) of the broadcast shape.
+            The elements are the result of `physics.swept_aabb()`. If they
+            don't collide, the time is `np.inf` and the normal is (0, 0).
+    """
+    rects = np.asarray(rects)
+    last_left, last_top, last_right, last_bottom = _rect_edges(last_rects)
+    target_left, target_top, target_right, target_bottom = _rect_edges(target_rects)
+    move_x = rects[..., 0] - last_left
+    move_y = rects[..., 1] - last_top
+
+    entry_x, exit_x = _sweep_axis(last_left, last_right, target_left, target_right, move_x)
+    entry_y, exit_y = _sweep_axis(last_top, last_bottom, target_top, target_bottom, move_y)
+
+    # Turn -0.0 into 0.0, and exclude the rects which only touch at the beginning
+    # as `physics.swept_aabb()`
+    entry_time = np.maximum(entry_x, entry_y) + 0.0
+    exit_time = np.minimum(exit_x, exit_y)
+    hit = ((entry_time >= 0) & (entry_time <= 1) & (entry_time <= exit_time) &
+        ((entry_time > 0) | (exit_time > 0)))
+
+    normals_x = np.where(hit & (entry_x >= entry_y), np.where(move_x > 0, -1, 1), 0)
+    normals_y = np.where(hit & (entry_y >= entry_x), np.where(move_y > 0, -1, 1), 0)
+
+    return np.where(hit, entry_time, np.inf), normals_x, normals_y
+
+def _sweep_axis(low, high, target_low, target_high, move):
+    """
+    The element-wise version of `physics._sweep_axis()`. If they never overlap,
+    the entry time is `np.inf`, so it won't be regarded as a collision.
+    """
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        to_low = (target_low - high) / move
+        to_high = (target_high - low) / move
+    entry = np.where(move > 0, to_low, to_high)
+    exit = np.where(move > 0, to_high, to_low)
+
+    overlap = (low <= target_high) & (high >= target_low)
+    entry = np.where(move == 0, np.where(overlap, -np.inf, np.inf), entry)
+    exit = np.where(move == 0, np.where(overlap, np.inf, -np.inf), exit)
+
+    return entry, exit
+
+def first_hit_indices(hit_matrix):
+    """
+    Get the index of the first hit target of each moving object
+
+    @param hit_matrix The bool array of shape (M, N) returned from
+           `collide_or_contact()` or `moving_collide_or_contact()`
+    @return An int array of shape (M, ). The element is the smallest index j of
+            which `hit_matrix[i, j]` is True, or -1 if none of them is True.
+    """
+    hit_matrix = np.asarray(hit_matrix)
+    if hit_matrix.shape[1] == 0:
+        return np.full(hit_matrix.shape[0], -1, dtype = np.intp)
+
+    return np.where(hit_matrix.any(axis = 1), hit_matrix.argmax(axis = 1), -1)
+
+def rect_break_or_contact_box(rects, box_rect):
+    """
+    Check if each rect breaks the box or contacts the border of the box
+
+    @param rects The rects of shape (M, 4)
+    @param box_rect The box (x, y, width, height)
+    @return A bool array of shape (M, )
+    """
+    left, top, right, bottom = _rect_edges(rects)
+    box_left, box_top, box_right, box_bottom = _rect_edges(box_rect)
+
+    return ((left <= box_left) | (right >= box_right) |
+        (top <= box_top) | (bottom >= box_bottom))
+
+def bounce_off(bounce_obj_rects, bounce_obj_speeds, hit_obj_rects, hit_obj_speeds):
+    """
+    Calculate the rects and the speeds of the bouncing objects after they bounce off
+    the hit objects
+
+    Each row is calculated as `physics.bounce_off_xy()`, so it should be invoked
+    only for the colliding pairs. If the relative speed of any pair is 0 in
+    either axis, `ZeroDivisionError` is raised as the scalar version.
+
+    @param bounce_obj_rects The rects of shape (M, 4) of the bouncing objects
+    @param bounce_obj_speeds The speeds of shape (M, 2) of the bouncing objects
+    @param hit_obj_rects The rects of shape (M, 4) of the hit object of each
+           bouncing object
+    @param hit_obj_speeds The speeds of shape (M, 2) of the hit objects
+    @return A tuple (`new_bounce_obj_rects`, `new_bounce_obj_speeds`)
+    """
+    new_rects = np.array(bounce_obj_rects)
+    new_speeds = np.array(bounce_obj_speeds)
+    bounce_off_ip(new_rects, new_speeds, hit_obj_rects, hit_obj_speeds)
+
+    return new_rects, new_speeds
+
+def bounce_off_ip(bounce_obj_rects, bounce_obj_speeds, hit_obj_rects, hit_obj_speeds):
+    """
+    The in-place version of `bounce_off()`. The position in `bounce_obj_rects`
+    and the value of `bounce_obj_speeds` will be updated.
+    """
+    hit_obj_rects = np.asarray(hit_obj_rects)
+    hit_obj_speeds = np.asarray(hit_obj_speeds)
+
+    x = bounce_obj_rects[:, 0]
+    y = bounce_obj_rects[:, 1]
+    width = bounce_obj_rects[:, 2]
+    height = bounce_obj_rects[:, 3]
+    hit_left, hit_top, hit_right, hit_bottom = _rect_edges(hit_obj_rects)
+    speed_x = bounce_obj_speeds[:, 0]
+    speed_y = bounce_obj_speeds[:, 1]
+
+    # Treat the hit object as an unmovable object
+    speed_diff_x = speed_x - hit_obj_speeds[:, 0]
+    speed_diff_y = speed_y - hit_obj_speeds[:, 1]
+    if np.any(speed_diff_x == 0) or np.any(speed_diff_y == 0):
+        raise ZeroDivisionError("The relative speed of the objects is 0")
+
+    # The relative position between top and bottom, and left and right
+    # of two objects at the last frame
+    rect_diff_bT_hB = hit_bottom - y + speed_diff_y
+    rect_diff_bB_hT = hit_top - (y + height) + speed_diff_y
+    rect_diff_bL_hR = hit_right - x + speed_diff_x
+    rect_diff_bR_hL = hit_left - (x + width) + speed_diff_x
+
+    ## The bouncing object is at the bottom or at the top
+    at_bottom = (rect_diff_bT_hB < 0) & (rect_diff_bB_hT < 0)
+    at_top = (rect_diff_bT_hB > 0) & (rect_diff_bB_hT > 0)
+    surface_diff_y = np.where(at_bottom, rect_diff_bT_hB,
+        np.where(at_top, rect_diff_bB_hT, np.where(speed_diff_y > 0, -1, 1)))
+    extract_pos_y = np.where(at_bottom, hit_bottom, hit_top - height)
+
+    ## The bouncing object is at the right or at the left
+    at_right = (rect_diff_bL_hR < 0) & (rect_diff_bR_hL < 0)
+    at_left = (rect_diff_bL_hR > 0) & (rect_diff_bR_hL > 0)
+    surface_diff_x = np.where(at_right, rect_diff_bL_hR,
+        np.where(at_left, rect_diff_bR_hL, np.where(speed_diff_x > 0, -1, 1)))
+    extract_pos_x = np.where(at_right, hit_right, hit_left - width)
+
+    # Calculate the duration to hit the surface for x and y coordination.
+    time_hit_y = surface_diff_y / speed_diff_y
+    time_hit_x = surface_diff_x / speed_diff_x
+
+    bounce_y = (time_hit_y >= 0) & (time_hit_y >= time_hit_x)
+    bounce_x = (time_hit_x >= 0) & (time_hit_y <= time_hit_x)
+
+    # The extracted position is only valid for the bounced one
+    np.copyto(y, extract_pos_y, where = bounce_y, casting = "unsafe")
+    np.copyto(x, extract_pos_x, where = bounce_x, casting = "unsafe")
+    speed_y[bounce_y] *= -1
+    speed_x[bounce_x] *= -1
+
+def bounce_in_box(bounce_obj_rects, bounce_obj_speeds, box_rect):
+    """
+    Bounce the objects if they hit the border of the box
+
+    Each row is calculated as `physics.bounce_in_box_xy()`.
+
+    @param bounce_obj_rects The rects of shape (M, 4) of the bouncing objects
+    @param bounce_obj_speeds The speeds of shape (M, 2) of the bouncing objects
+    @param box_rect The box (x, y, width, height)
+    @return A tuple (`new_bounce_obj_rects`, `new_bounce_obj_speeds`)
+    """
+    new_rects = np.array(bounce_obj_rects)
+    new_speeds = np.array(bounce_obj_speeds)
+    bounce_in_box_ip(new_rects, new_speeds, box_rect)
+
+    return new_rects, new_speeds
+
+def bounce_in_box_ip(bounce_obj_rects, bounce_obj_speeds, box_rect):
+    """
+    The in-place version of `bounce_in_box()`. The position in `bounce_obj_rects`
+    and the value of `bounce_obj_speeds` will be updated.
+    """
+    box_x, box_y, box_width, box_height = box_rect
+
+    x = bounce_obj_rects[:, 0]
+    y = bounce_obj_rects[:, 1]
+    width = bounce_obj_rects[:, 2]
+    height = bounce_obj_rects[:, 3]
+    speed_x = bounce_obj_speeds[:, 0]
+    speed_y = bounce_obj_speeds[:, 1]
+
+    hit_left = x <= box_x
+    hit_right = ~hit_left & (x + width >= box_x + box_width)
+    hit_top = y <= box_y
+    hit_bottom = ~hit_top & (y + height >= box_y + box_height)
+
+    x[hit_left] = box_x
+    x[hit_right] = (box_x + box_width - width)[hit_right]
+    speed_x[hit_left | hit_right] *= -1
+
+    y[hit_top] = box_y
+    y[hit_bottom] = (box_y + box_height - height)[hit_bottom]
+    speed_y[hit_top | hit_bottom] *= -1
@@ -0,0 +1,336 @@
+"""
+The indexed store of the log files of the "stream" format for random access
+
+The store keeps an index directory ".index" in the log directory:
+- "<log filename>.idx": The frame offset index of a log file. It's an array of
+  native unsigned 64-bit integers. The i-th element is the position of the chunk
+  of the i-th frame in the log file, and the last element is the end position
+  of the last complete chunk.
+- "manifest.json": The information of each indexed log file, which has
+  the "mtime" and "size" of the log file when it's indexed, "game", "game_params",
+  "ml_names", "num_frames", and "result". The "result" is a dict of which
+  the key is the name of ml client and the value is the "status" in the scene
+  information of the last frame.
+
+The log file and its index are memory-mapped when accessing the frames, so
+reading the k-th frame of an episode only unpickles that frame. The compressed
+log files can not be memory-mapped, so they are not indexed.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import pickle
+import random
+
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+from .recorder import STREAM_MAGIC, RECORD_FORMAT_VERSION, _CHUNK_LENGTH
+
+INDEX_DIRNAME = ".index"
+MANIFEST_FILENAME = "manifest.json"
+LOG_FILE_SUFFIX = ".stream"
+
+class LogStore:
+    """
+    Provide the random access to the frames of the log files in a directory
+
+    For example:
+    ```python
+    store = LogStore("games/arkanoid/log")
+    frame = store.get_frame(3, 100)     # The 100th frame of the 4th episode
+    scene_info, command = frame["ml"]
+
+    for batch in store.iter_minibatches(32):
+        for episode_id, frame_id, frame in batch:
+            ...
+    ```
+
+    The episodes are the log files of the "stream" format sorted by the filename.
+    The frame of an episode is a dict of which the key is the name of ml client and
+    the value is a tuple (`scene_info`, `command`), which is the same as the one
+    yielded from `iter_stream_frames()`.
+    """
+    def __init__(self, log_dir, max_open_files: int = 64):
+        """
+        Constructor
+
+        The index of the new or modified log files are built here.
+
+        @param log_dir The directory of the log files
+        @param max_open_files The maximum number of log files kept memory-mapped
+        """
+        self._log_dir = Path(log_dir)
+        self._index_dir = self._log_dir.joinpath(INDEX_DIRNAME)
+        self._max_open_files = max_open_files
+        self._open_files = OrderedDict()
+
+        self._manifest = {}
+        self.refresh()
+
+    def refresh(self):
+        """
+        Rescan the log directory and update the index
+
+        Only the log files which are new or changed since the last indexing
+        are indexed. The entries of the removed log files are dropped.
+        """
+        self.close()
+
+        if not self._index_dir.exists():
+            self._index_dir.mkdir(parents = True)
+
+        old_manifest = self._load_manifest()
+        manifest = {}
+        for log_path in sorted(self._log_dir.glob("*" + LOG_FILE_SUFFIX)):
+            stat = log_path.stat()
+            entry = old_manifest.get(log_path.name)
+            if (entry is None or entry["mtime"] != stat.st_mtime or
+                    entry["size"] != stat.st_size or
+                    not self._index_path(log_path.name).exists()):
+                entry = self._build_index(log_path)
+                if entry is None:
+                    continue
+                entry["mtime"] = stat.st_mtime
+                entry["size"] = stat.st_size
+            manifest[log_path.name] = entry
+
+        for filename in old_manifest.keys() - manifest.keys():
+            index_path = self._index_path(filename)
+            if index_path.exists():
+                index_path.unlink()
+
+        self._manifest = manifest
+        self._filenames = list(manifest.keys())
+        self._frame_starts = [0]
+        for filename in self._filenames:
+            self._frame_starts.append(
+                self._frame_starts[-1] + manifest[filename]["num_frames"])
+
+        self._save_manifest()
+
+    def _index_path(self, filename):
+        return self._index_dir.joinpath(filename + ".idx")
+
+    def _load_manifest(self):
+        manifest_path = self._index_dir.joinpath(MANIFEST_FILENAME)
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if manifest.get("record_format_version") != RECORD_FORMAT_VERSION:
+            return {}
+        return manifest["episodes"]
+
+    def _save_manifest(self):
+        manifest_path = self._index_dir.joinpath(MANIFEST_FILENAME)
+        tmp_path = manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "record_format_version": RECORD_FORMAT_VERSION,
+                "episodes": self._manifest
+            }, f, indent = 1)
+        os.replace(tmp_path, manifest_path)
+
+    def _build_index(self, log_path):
+        """
+        Scan the chunks of the log file and write its frame offset index
+
+        @return The manifest entry of the log file, or None if the file is not
+                a valid log file of the "stream" format
+        """
+        offsets = array("Q")
+        header = None
+        last_frame = None
+        with open(log_path, "rb") as f:
+            if f.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+                return None
+
+            position = len(STREAM_MAGIC)
+            while True:
+                length_bytes = f.read(_CHUNK_LENGTH.size)
+                if len(length_bytes) < _CHUNK_LENGTH.size:
+                    break
+                length = _CHUNK_LENGTH.unpack(length_bytes)[0]
+                data = f.read(length)
+                # The last chunk is incomplete
+                if len(data) < length:
+                    break
+
+                if header is None:
+                    header = pickle.loads(data)
+                else:
+                    offsets.append(position)
+                    last_frame = data
+                position += _CHUNK_LENGTH.size + length
+
+        if header is None:
+            return None
+        offsets.append(position)
+
+        result = {}
+        if last_frame is not None:
+            try:
+                last_frame = pickle.loads(last_frame)
+            except (pickle.UnpicklingError, EOFError):
+                # Drop the broken chunk
+                offsets.pop()
+                last_frame = {}
+            for name, (scene_info, command) in last_frame.items():
+                if isinstance(scene_info, dict) and "status" in scene_info:
+                    result[name] = scene_info["status"]
+
+        with open(self._index_path(log_path.name), "wb") as f:
+            offsets.tofile(f)
+
+        return {
+            "game": header.get("game", log_path.parent.parent.name),
+            "game_params": header.get("game_params"),
+            "ml_names": header["ml_names"],
+            "num_frames": len(offsets) - 1,
+            "result": result
+        }
+
+    @property
+    def num_episodes(self) -> int:
+        """
+        The number of the indexed log files
+        """
+        return len(self._filenames)
+
+    @property
+    def num_frames(self) -> int:
+        """
+        The total number of frames of all indexed log files
+        """
+        return self._frame_starts[-1]
+
+    def get_episode_info(self, episode_id: int) -> dict:
+        """
+        Get the manifest entry of the episode
+
+        @return A dict which has "filename", "game", "game_params", "ml_names",
+                "num_frames", and "result" keys
+        """
+        filename = self._filenames[episode_id]
+        entry = self._manifest[filename]
+        return {
+            "filename": filename,
+            "game": entry["game"],
+            "game_params": entry["game_params"],
+            "ml_names": entry["ml_names"],
+            "num_frames": entry["num_frames"],
+            "result": entry["result"]
+        }
+
+    def get_frame(self, episode_id: int, frame_id: int) -> dict:
+        """
+        Read a frame of an episode
+
+        @param episode_id The index of the episode
+        @param frame_id The index of the frame in the episode.
+               The negative index is counted from the end.
+        @return A dict of which the key is the name of ml client and the value is
+                a tuple (`scene_info`, `command`)
+        """
+        return self._get_open_file(episode_id).read_frame(frame_id)
+
+    def get_global_frame(self, global_frame_id: int):
+        """
+        Read a frame by the index counted through all episodes
+
+        @return A tuple (`episode_id`, `frame_id`, `frame`)
+        """
+        if not 0 <= global_frame_id < self.num_frames:
+            raise IndexError("The frame index is out of range")
+
+        episode_id = bisect.bisect_right(self._frame_starts, global_frame_id) - 1
+        frame_id = global_frame_id - self._frame_starts[episode_id]
+        return episode_id, frame_id, self.get_frame(episode_id, frame_id)
+
+    def iter_minibatches(self, batch_size: int, shuffle: bool = True, seed = None):
+        """
+        Iterate the frames of all episodes in minibatches
+
+        @param batch_size The number of frames in a minibatch.
+               The last minibatch may be smaller.
+        @param shuffle Whether to iterate the frames in the random order
+        @param seed The seed for shuffling
+        @return A generator yielding a list of tuple (`episode_id`, `frame_id`, `frame`)
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size should be positive")
+
+        order = list(range(self.num_frames))
+        if shuffle:
+            random.Random(seed).shuffle(order)
+
+        for i in range(0, len(order), batch_size):
+            yield [self.get_global_frame(j) for j in order[i:i + batch_size]]
+
+    def _get_open_file(self, episode_id):
+        """
+        Get the memory-mapped log file. The least recently used one is closed
+        if there are too many opened files.
+        """
+        filename = self._filenames[episode_id]
+        open_file = self._open_files.get(filename)
+        if open_file is not None:
+            self._open_files.move_to_end(filename)
+            return open_file
+
+        open_file = _MappedLogFile(
+            self._log_dir.joinpath(filename), self._index_path(filename),
+            self._manifest[filename]["num_frames"])
+        self._open_files[filename] = open_file
+        if len(self._open_files) > self._max_open_files:
+            self._open_files.popitem(last = False)[1].close()
+
+        return open_file
+
+    def close(self):
+        """
+        Close all memory-mapped files
+        """
+        for open_file in self._open_files.values():
+            open_file.close()
+        self._open_files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class _MappedLogFile:
+    """
+    The memory-mapped log file and its frame offset index
+    """
+    def __init__(self, log_path, index_path, num_frames):
+        with open(log_path, "rb") as f:
+            self._log_mmap = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        with open(index_path, "rb") as f:
+            self._index_mmap = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        self._offsets = memoryview(self._index_mmap).cast("Q")
+        self._num_frames = num_frames
+
+    def read_frame(self, frame_id):
+        if frame_id < 0:
+            frame_id += self._num_frames
+        if not 0 <= frame_id < self._num_frames:
+            raise IndexError("The frame index is out of range")
+
+        start = self._offsets[frame_id] + _CHUNK_LENGTH.size
+        end = self._offsets[frame_id + 1]
+        return pickle.loads(self._log_mmap[start:end])
+
+    def close(self):
+        # The exported memoryview should be released before closing the mmap
+        self._offsets.release()
+        self._index_mmap.close()
+        self._log_mmap.close()
@@ -72,7 +72,7 @@ class GameMLModeExecutorProperty:
         self.execution_cmd = execution_cmd
         self.game_cls = game_cls
         self.ml_names = ml_names
-        self.comm_manager = GameCommManager()
+        self.comm_manager = GameCommManager(execution_cmd.delta_keyframe_interval)
 
 class GameMLModeExecutor:
     """
@@ -88,9 +88,16 @@ class GameMLModeExecutor:
         # Get the active ml names from the created ml processes
         self._active_ml_names = self._comm_manager.get_ml_names()
         self._ml_execution_time = 1 / self._execution_cmd.fps
+        self._headless = self._execution_cmd.headless
+        self._lockstep = self._execution_cmd.lockstep
+        self._frame_deadline = self._execution_cmd.frame_deadline
         self._ml_delayed_frames = {}
+        # The game frame of the frame 0 of the ml process. The ml process counts
+        # the frame from 0 again if it resets before the game ends.
+        self._ml_frame_offsets = {}
         for name in self._active_ml_names:
             self._ml_delayed_frames[name] = 0
+            self._ml_frame_offsets[name] = 0
         self._recorder = get_recorder(self._execution_cmd, self._ml_names)
         self._frame_count = 0
 
@@ -112,10 +119,14 @@ class GameMLModeExecutor:
         The loop for sending scene information to the ml process, recevied the command
         sent from the ml process, and pass command to the game for execution.
         """
-        game = self._game_cls(*self._execution_cmd.game_params)
+        if self._headless:
+            game = self._game_cls(*self._execution_cmd.game_params, headless = True)
+        else:
+            game = self._game_cls(*self._execution_cmd.game_params)
 
         self._wait_all_ml_ready()
-        while not quit_or_esc():
+        # There is no window event to be handled in the headless mode
+        while self._headless or not quit_or_esc():
             scene_info_dict = game.get_player_scene_info()
             cmd_dict = self._make_ml_execute(scene_info_dict)
             self._recorder.record(scene_info_dict, cmd_dict)
@@ -126,8 +137,7 @@ class GameMLModeExecutor:
             # Do reset stuff
             if result == "RESET" or result == "QUIT":
                 scene_info_dict = game.get_player_scene_info()
-                for ml_name in self._active_ml_names:
-                    self._comm_manager.send_to_ml(scene_info_dict[ml_name], ml_name)
+                self._comm_manager.send_dict_to_ml(scene_info_dict, self._active_ml_names)
                 self._recorder.record(scene_info_dict, {})
                 self._recorder.flush_to_file()
 
@@ -138,46 +148,81 @@ class GameMLModeExecutor:
                 self._frame_count = 0
                 for name in self._active_ml_names:
                     self._ml_delayed_frames[name] = 0
+                    self._ml_frame_offsets[name] = 0
                 self._wait_all_ml_ready()
 
     def _wait_all_ml_ready(self):
         """
         Wait until receiving "READY" commands from all ml processes
         """
-        # Wait the ready command one by one
-        for ml_name in self._active_ml_names:
-            while self._comm_manager.recv_from_ml(ml_name) != "READY":
-                pass
+        self._comm_manager.wait_from_all_ml(
+            accept = lambda ml_name, obj: obj == "READY")
 
     def _make_ml_execute(self, scene_info_dict) -> dict:
         """
         Send the scene information to all ml processes and wait for commands
 
+        In the lockstep mode, the commands are waited until all ml processes respond
+        or the frame deadline passes. Otherwise, the commands are waited within
+        the frame interval, and the frame interval is kept even if all commands
+        arrive early.
+
         @return A dict of the recevied command from the ml clients
                 If the client didn't send the command, it will be `None`.
         """
         try:
-            for ml_name in self._active_ml_names:
-                self._comm_manager.send_to_ml(scene_info_dict[ml_name], ml_name)
+            self._comm_manager.send_dict_to_ml(scene_info_dict, self._active_ml_names)
         except KeyError as e:
             raise KeyError(
                 "The game doesn't provide scene information "
-                f"for the client '{ml_name}'")
-
-        time.sleep(self._ml_execution_time)
-        response_dict = self._comm_manager.recv_from_all_ml()
+                f"for the client {e}")
+
+        if self._lockstep:
+            deadline = (None if self._frame_deadline is None
+                else time.perf_counter() + self._frame_deadline)
+        else:
+            deadline = time.perf_counter() + self._ml_execution_time
+
+        # The "READY" command sent from the ml process which resets before
+        # the game ends is regarded as the response to this frame.
+        # In the lockstep mode, the command of the previous frame which misses
+        # the deadline is ignored, so that the command is for this frame.
+        def accept(ml_name, obj):
+            if obj == "READY":
+                return True
+            if not isinstance(obj, dict):
+                return False
+            return (not self._lockstep or
+                self._to_game_frame(ml_name, obj["frame"]) >= self._frame_count)
+
+        response_dict, _ = self._comm_manager.wait_from_all_ml(deadline, accept)
+
+        if not self._lockstep:
+            remaining_time = deadline - time.perf_counter()
+            if remaining_time > 0:
+                time.sleep(remaining_time)
 
         cmd_dict = {}
         for ml_name in self._active_ml_names:
             cmd_received = response_dict[ml_name]
             if isinstance(cmd_received, dict):
-                self._check_delay(ml_name, cmd_received["frame"])
+                self._check_delay(ml_name,
+                    self._to_game_frame(ml_name, cmd_received["frame"]))
                 cmd_dict[ml_name] = cmd_received["command"]
             else:
+                # The ml process which sent "READY" counts the next frame as frame 0
+                if cmd_received == "READY":
+                    self._ml_frame_offsets[ml_name] = self._frame_count + 1
                 cmd_dict[ml_name] = None
 
         return cmd_dict
 
+    def _to_game_frame(self, ml_name, ml_frame) -> int:
+        """
+        Convert the frame counted by the ml process to the frame of the game
+        """
+        return ml_frame + self._ml_frame_offsets[ml_name]
+
     def _check_delay(self, ml_name, cmd_frame):
         """
         Check if the timestamp of the received command is delayed
@@ -191,7 +236,8 @@ class MLExecutorProperty:
     """
     The data class that helps build `MLExecutor`
     """
-    def __init__(self, name, target_module, init_args = (), init_kwargs = {}):
+    def __init__(self, name, target_module, init_args = (), init_kwargs = {},
+            conflate = False):
         """
         Constructor
 
@@ -200,12 +246,13 @@ class MLExecutorProperty:
         @param name The name of the ml process
         @param init_args The positional arguments to be passed to the `MLPlay.__init__()`
         @param init_kwargs The keyword arguments to be passed to the `MLPlay.__init__()`
+        @param conflate Whether the ml process only receives the latest scene information
         """
         self.name = name
         self.target_module = target_module
         self.init_args = init_args
         self.init_kwargs = init_kwargs
-        self.comm_manager = MLCommManager(name)
+        self.comm_manager = MLCommManager(name, conflate)
 
 class MLExecutor:
     """
@@ -219,6 +266,7 @@ class MLExecutor:
         self._init_kwargs = propty.init_kwargs
         self._comm_manager = propty.comm_manager
         self._frame_count = 0
+        self._num_skipped_scenes = 0
 
     def start(self):
         """
@@ -250,19 +298,27 @@ class MLExecutor:
             scene_info = self._comm_manager.recv_from_game()
             if scene_info is None:
                 break
+
+            # Count the skipped scene information as handled frames
+            num_skipped = self._comm_manager.pop_num_skipped_objs()
+            self._frame_count += num_skipped
+            self._num_skipped_scenes += num_skipped
+
             command = ml.update(scene_info)
 
             if command == "RESET":
+                self._report_skipped_scenes()
                 ml.reset()
                 self._frame_count = 0
                 self._ml_ready()
                 continue
 
-            if command is not None:
-                self._comm_manager.send_to_game({
-                    "frame": self._frame_count,
-                    "command": command
-                })
+            # Send the command even if it is None, so that the game executor
+            # in the lockstep mode knows that this frame is handled.
+            self._comm_manager.send_to_game({
+                "frame": self._frame_count,
+                "command": command
+            })
 
             self._frame_count += 1
 
@@ -270,6 +326,15 @@ class MLExecutor:
         if self._target_module == "mlgame.crosslang.ml_play":
             ml.stop_client()
 
+    def _report_skipped_scenes(self):
+        """
+        Print the number of scene information skipped in this round
+        """
+        if self._num_skipped_scenes > 0:
+            print("The client '{}' skipped {} scene(s) in this round"
+                .format(self._name, self._num_skipped_scenes))
+            self._num_skipped_scenes = 0
+
     def _ml_ready(self):
         """
         Send a "READY" command to the game process
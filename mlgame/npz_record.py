@@ -0,0 +1,290 @@
+"""
+Record the game progress as typed columns in a NumPy `.npz` file
+
+The scene information and the command of each ml client are stored as columns.
+The name of the array in the `.npz` file is "<ml_name>/<column>", and the columns
+are generated according to the type of the value of each field in the scene
+information:
+
+- `int` or `float`: A 1-D array "<field>" of the value at each frame.
+- `str`: A 1-D int array "<field>" of the code at each frame, and a 1-D str array
+  "<field>__vocab" of which the i-th element is the string of the code i.
+- `tuple` or `list` of numbers, such as `(x, y)`: A 2-D array "<field>" of shape
+  (num_frames, length).
+- `list` of tuples of numbers, such as a list of `(x, y)`: A 2-D array
+  "<field>__values" of shape (total_length, tuple_length) which concatenates
+  the tuples of all frames, and a 1-D int array "<field>__offsets" of shape
+  (num_frames + 1, ). The tuples at the frame i are
+  `values[offsets[i]:offsets[i + 1]]`.
+
+The commands are stored as the same as the `str` field, which is "command" and
+"command__vocab". The `None` command is stored as the code -1.
+There are also arrays "record_format_version" and "ml_names" in the file.
+
+NumPy is required for this format.
+"""
+
+from pathlib import Path
+
+from .recorder import RECORD_FORMAT_VERSION, _generate_filepath
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def is_available() -> bool:
+    """
+    Check if NumPy is installed
+    """
+    return np is not None
+
+class NpzRecorder:
+    """
+    Record the scene information and the game command to a `.npz` file as columns
+
+    The values are appended to the columns at each frame, and the columns are
+    converted to arrays and saved at `flush_to_file()`.
+    """
+    def __init__(
+            self, ml_names: list, saving_directory: Path,
+            filename_prefix: str = "", compressed: bool = False):
+        """
+        Constructor
+
+        @param ml_names A list containing the name of all ml clients
+        @param saving_directory Specify the directory for saving files
+        @param filename_prefix Specify the prefix of the filename to be generated.
+               The filename will be "<prefix>_YYYY-MM-DD_hh-mm-ss.npz".
+        @param compressed Whether to save the arrays by `np.savez_compressed()`.
+               The file can be loaded by `load_npz_record()` as well.
+        """
+        if not is_available():
+            raise RuntimeError("NumPy is required for recording in the npz format")
+
+        self._saving_directory = saving_directory
+        if not self._saving_directory.exists():
+            self._saving_directory.mkdir()
+
+        if not isinstance(filename_prefix, str):
+            raise TypeError("'filename_prefix' should be the type of 'str'")
+        self._filename_prefix = filename_prefix
+
+        self._compressed = compressed
+        self._ml_names = ml_names
+        self._column_sets = {name: _ColumnSet() for name in ml_names}
+
+    def record(self, scene_info_dict: dict, cmd_dict: dict):
+        """
+        Append the scene information and the command to the columns
+
+        @param scene_info_dict A dict storing the scene information for each client
+        @param cmd_dict A dict storing the command received from each client
+        """
+        for name in self._ml_names:
+            scene_info = scene_info_dict.get(name, None)
+            if scene_info:
+                self._column_sets[name].append(scene_info, cmd_dict.get(name, None))
+
+    def flush_to_file(self):
+        """
+        Save the columns to the file and clear them
+        """
+        arrays = {
+            "record_format_version": np.array(RECORD_FORMAT_VERSION),
+            "ml_names": np.array(self._ml_names, dtype = str)
+        }
+        for name in self._ml_names:
+            for column_name, array in self._column_sets[name].to_arrays().items():
+                arrays[name + "/" + column_name] = array
+            self._column_sets[name] = _ColumnSet()
+
+        filepath = _generate_filepath(
+            self._saving_directory, self._filename_prefix, ".npz")
+        if self._compressed:
+            np.savez_compressed(filepath, **arrays)
+        else:
+            np.savez(filepath, **arrays)
+
+def load_npz_record(filepath) -> dict:
+    """
+    Load the log file of the npz format
+
+    @param filepath The path of the log file
+    @return A dict which has "record_format_version" key and the key of each
+            ml client name. The value of the ml client is a dict of which the key is
+            the column name and the value is the array, such as
+            `{"frame": array, "status": array, "status__vocab": array, ...}`.
+            The value is an empty dict if the ml client has no record.
+    """
+    if not is_available():
+        raise RuntimeError("NumPy is required for loading the npz format")
+
+    with np.load(filepath, allow_pickle = False) as npz_file:
+        game_progress = {
+            "record_format_version": int(npz_file["record_format_version"])
+        }
+        for name in npz_file["ml_names"]:
+            game_progress[str(name)] = {}
+
+        for key in npz_file.files:
+            if "/" not in key:
+                continue
+            name, column_name = key.split("/", 1)
+            game_progress[name][column_name] = npz_file[key]
+
+    return game_progress
+
+def to_columns(game_progress: dict) -> dict:
+    """
+    Convert the game progress of the layout of the "pickle" format to columns
+
+    @param game_progress The game progress loaded from the log file of
+           the "pickle" format or returned from `load_stream_record()`
+    @return A dict of which the key is the ml client name, and the value is
+            a dict of columns which is the same as the one of `load_npz_record()`
+    """
+    if not is_available():
+        raise RuntimeError("NumPy is required for converting to columns")
+
+    columns = {}
+    for name, slot in game_progress.items():
+        if name == "record_format_version":
+            continue
+
+        column_set = _ColumnSet()
+        for scene_info, command in zip(slot["scene_info"], slot["command"]):
+            column_set.append(scene_info, command)
+        columns[name] = column_set.to_arrays()
+
+    return columns
+
+class _ColumnSet:
+    """
+    The columns of the scene information and the command of an ml client
+    """
+    def __init__(self):
+        self._columns = {}
+        self._command_column = _StrColumn()
+        self._num_frames = 0
+
+    def append(self, scene_info: dict, command):
+        for field, value in scene_info.items():
+            column = self._columns.get(field)
+            if column is None:
+                column = _create_column(field, value)
+                self._columns[field] = column
+            elif column.num_values != self._num_frames:
+                raise ValueError(
+                    f"The field '{field}' is not provided in every scene information")
+
+            column.append(value)
+
+        self._command_column.append(command)
+        self._num_frames += 1
+
+    def to_arrays(self) -> dict:
+        arrays = {}
+        for field, column in self._columns.items():
+            if column.num_values != self._num_frames:
+                raise ValueError(
+                    f"The field '{field}' is not provided in every scene information")
+            arrays.update(column.to_arrays(field))
+
+        if self._num_frames > 0:
+            arrays.update(self._command_column.to_arrays("command"))
+
+        return arrays
+
+def _create_column(field, value):
+    """
+    Create the column according to the type of the value
+    """
+    if isinstance(value, str):
+        return _StrColumn()
+    if isinstance(value, (int, float)):
+        return _ScalarColumn()
+    if isinstance(value, (tuple, list)):
+        if len(value) == 0 or isinstance(value[0], (tuple, list)):
+            return _VectorListColumn()
+        return _VectorColumn()
+
+    raise TypeError(
+        f"The type '{type(value).__name__}' of the field '{field}' is not supported "
+        "by the npz format")
+
+class _ScalarColumn:
+    def __init__(self):
+        self._values = []
+
+    @property
+    def num_values(self):
+        return len(self._values)
+
+    def append(self, value):
+        self._values.append(value)
+
+    def to_arrays(self, name):
+        return {name: np.array(self._values)}
+
+class _StrColumn:
+    """
+    The column of strings stored as codes. `None` is stored as -1.
+    """
+    def __init__(self):
+        self._codes = []
+        self._vocab = {}
+
+    @property
+    def num_values(self):
+        return len(self._codes)
+
+    def append(self, value):
+        if value is None:
+            self._codes.append(-1)
+        else:
+            self._codes.append(self._vocab.setdefault(str(value), len(self._vocab)))
+
+    def to_arrays(self, name):
+        return {
+            name: np.array(self._codes, dtype = np.int32),
+            name + "__vocab": np.array(list(self._vocab.keys()), dtype = str)
+        }
+
+class _VectorColumn:
+    def __init__(self):
+        self._values = []
+
+    @property
+    def num_values(self):
+        return len(self._values)
+
+    def append(self, value):
+        self._values.append(value)
+
+    def to_arrays(self, name):
+        return {name: np.array(self._values)}
+
+class _VectorListColumn:
+    def __init__(self):
+        self._values = []
+        self._offsets = [0]
+
+    @property
+    def num_values(self):
+        return len(self._offsets) - 1
+
+    def append(self, value):
+        self._values.extend(value)
+        self._offsets.append(len(self._values))
+
+    def to_arrays(self, name):
+        values = np.array(self._values)
+        if len(self._values) == 0:
+            # The length of the tuple is unknown. Assume it's a list of (x, y).
+            values = np.zeros((0, 2), dtype = np.int64)
+
+        return {
+            name + "__values": values,
+            name + "__offsets": np.array(self._offsets, dtype = np.int64)
+        }
@@ -4,6 +4,7 @@ import traceback
 from multiprocessing import Process, Pipe
 from .loops import GameMLModeExecutorProperty, MLExecutorProperty
 from .exceptions import ProcessError
+from .shared_memory_ring import ShmPipe
 
 class ProcessManager:
     """
@@ -12,6 +13,8 @@ class ProcessManager:
     @var _game_proc_helper The helper object for the game process
     @var _ml_proc_helpers A list storing helper objects for all ml processes
     @var _ml_proces A list storing process objects running ml processes
+    @var _shm_send_ends A list storing the sending ends of the shared memory
+         which should be released at the end
     """
 
     def __init__(
@@ -26,6 +29,7 @@ class ProcessManager:
         self._game_executor_propty = game_executor_propty
         self._ml_executor_propties = ml_executor_propties
         self._ml_procs = []
+        self._shm_send_ends = []
 
     def start(self):
         """
@@ -62,10 +66,17 @@ class ProcessManager:
         """
         Create communication pipes for processes
         """
+        transport = self._game_executor_propty.execution_cmd.transport
+
         # Create pipes for Game process <-> ml process
         for ml_executor_propty in self._ml_executor_propties:
             recv_pipe_for_game, send_pipe_for_ml = Pipe(False)
-            recv_pipe_for_ml, send_pipe_for_game = Pipe(False)
+            if transport == "shm":
+                # The scene information is sent via the shared memory
+                recv_pipe_for_ml, send_pipe_for_game = ShmPipe()
+                self._shm_send_ends.append(send_pipe_for_game)
+            else:
+                recv_pipe_for_ml, send_pipe_for_game = Pipe(False)
 
             self._game_executor_propty.comm_manager.add_comm_to_ml(
                 ml_executor_propty.name,
@@ -100,6 +111,10 @@ class ProcessManager:
                 self._game_executor_propty.comm_manager.send_to_ml(
                     None, ml_process.name)
 
+        # The ml processes which attached the shared memory can still read it
+        for shm_send_end in self._shm_send_ends:
+            shm_send_end.close()
+
 def _game_process_entry_point(propty: GameMLModeExecutorProperty):
     """
     The real entry point of the game process
@@ -1,11 +1,31 @@
+import bz2
+import gzip
+import lzma
 import pickle
+import struct
 import time
 
 from pathlib import Path
+from queue import Queue
+from threading import Thread
+
 from .execution_command import GameMode
 
 RECORD_FORMAT_VERSION = 2
 
+# The leading bytes of the log file of the "stream" format
+STREAM_MAGIC = b"MLGSTRM\n"
+# The length prefix of a chunk in the log file of the "stream" format
+_CHUNK_LENGTH = struct.Struct("<Q")
+
+# The codecs for compressing the log file.
+# {name: (module, filename suffix, leading bytes of the compressed file)}
+COMPRESSION_CODECS = {
+    "gzip": (gzip, ".gz", b"\x1f\x8b"),
+    "bz2": (bz2, ".bz2", b"BZh"),
+    "lzma": (lzma, ".xz", b"\xfd7zXZ\x00"),
+}
+
 def get_recorder(execution_cmd, ml_names):
     """
     The helper function for generating a recorder object
@@ -23,15 +43,97 @@ def get_recorder(execution_cmd, ml_names):
     if game_params_str:
         filename_prefix += "_" + "_".join(game_params_str)
 
-    return Recorder(ml_names, log_dir_path, filename_prefix)
+    compression = execution_cmd.record_compression
+    if execution_cmd.record_format == "stream":
+        return StreamRecorder(ml_names, log_dir_path, filename_prefix,
+            game_name = execution_cmd.game_name, game_params = game_params_str,
+            compression = compression)
+    if execution_cmd.record_format == "npz":
+        from .npz_record import NpzRecorder
+        return NpzRecorder(ml_names, log_dir_path, filename_prefix,
+            compressed = compression is not None)
+
+    return Recorder(ml_names, log_dir_path, filename_prefix, compression)
+
+def _check_compression(compression):
+    if compression is not None and compression not in COMPRESSION_CODECS:
+        raise ValueError("Invalid compression '{}'. It should be one of {} or None."
+            .format(compression, list(COMPRESSION_CODECS.keys())))
+
+def _get_compression_suffix(compression):
+    return "" if compression is None else COMPRESSION_CODECS[compression][1]
+
+def _open_file_for_writing(filepath, compression):
+    """
+    Create the log file and return the file object in binary mode.
+    The data written to it is compressed by the specified codec.
+    """
+    if compression is None:
+        return open(filepath, "wb")
+    return COMPRESSION_CODECS[compression][0].open(filepath, "wb")
+
+def open_log_file(filepath):
+    """
+    Open the log file for reading in binary mode
+
+    If the file is compressed by one of `COMPRESSION_CODECS`, which is detected by
+    the leading bytes of the file, the returned file object decompresses it.
+    """
+    with open(filepath, "rb") as f:
+        leading_bytes = f.read(8)
+
+    for module, _, magic in COMPRESSION_CODECS.values():
+        if leading_bytes.startswith(magic):
+            return module.open(filepath, "rb")
+
+    return open(filepath, "rb")
+
+def load_log_file(filepath) -> dict:
+    """
+    Load the log file of the "pickle" or "stream" format, which may be compressed
+
+    @param filepath The path of the log file
+    @return The game progress. The log file of the "stream" format is converted
+            by `load_stream_record()`.
+    """
+    with open_log_file(filepath) as f:
+        if f.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+            f.seek(0)
+            return pickle.load(f)
+
+    return load_stream_record(filepath)
+
+def _generate_filepath(saving_directory: Path, filename_prefix: str, suffix: str):
+    """
+    Generate the path of the log file "<prefix>_YYYY-MM-DD_hh-mm-ss<suffix>"
+
+    If the file already exists, which several rounds end in the same second,
+    a serial number is appended to the time, such as "<prefix>_YYYY-MM-DD_hh-mm-ss_1".
+    """
+    filename = time.strftime("%Y-%m-%d_%H-%M-%S")
+
+    if filename_prefix:
+        filename = filename_prefix + "_" + filename
+
+    filepath = saving_directory.joinpath(filename + suffix)
+    serial_no = 1
+    while filepath.exists():
+        filepath = saving_directory.joinpath(
+            "{}_{}{}".format(filename, serial_no, suffix))
+        serial_no += 1
+
+    return filepath
 
 class Recorder:
     """
     Record the scene information and the game command to the file
+
+    If the compression is specified, the game progress is pickled and compressed
+    in a background thread, so the game is not blocked by the compression.
     """
     def __init__(
             self, ml_names: list, saving_directory: Path,
-            filename_prefix: str = ""):
+            filename_prefix: str = "", compression: str = None):
         """
         Constructor
 
@@ -39,7 +141,14 @@ class Recorder:
         @param saving_directory Specify the directory for saving files
         @param filename_prefix Specify the prefix of the filename to be generated.
                The filename will be "<prefix>_YYYY-MM-DD_hh-mm-ss.pickle".
+        @param compression The codec in `COMPRESSION_CODECS` for compressing
+               the log file, or None for no compression. The suffix of the codec
+               is appended to the filename, such as ".pickle.gz".
         """
+        _check_compression(compression)
+        self._compression = compression
+        self._dump_thread = None
+
         self._saving_directory = saving_directory
         if not self._saving_directory.exists():
             self._saving_directory.mkdir()
@@ -48,23 +157,30 @@ class Recorder:
             raise TypeError("'filename_prefix' should be the type of 'str'")
         self._filename_prefix = filename_prefix
 
-        # Create storing slots for each ml client
+        self._ml_names = ml_names
+        self._game_progress = self._create_game_progress()
+
+    def _create_game_progress(self):
+        """
+        Create storing slots for each ml client
+        """
         game_progress = {
             "record_format_version": RECORD_FORMAT_VERSION
         }
-        for name in ml_names:
+        for name in self._ml_names:
             game_progress[name] = {
                 "scene_info": [],
                 "command": []
             }
-        self._game_progress = game_progress
-        self._ml_names = ml_names
+        return game_progress
 
     def record(self, scene_info_dict: dict, cmd_dict: dict):
         """
         Record the scene information and the command
 
-        The received scene information will be stored in a list.
+        The received scene information will be stored in a list. The scene
+        information shared by several clients is stored as the same object,
+        so it's pickled only once when flushing to the file.
 
         @param scene_info_dict A dict storing the scene information for each client
         @param cmd_dict A dict storing the command received from each client
@@ -80,19 +196,271 @@ class Recorder:
         """
         Flush the stored objects to the file
         """
-        filename = time.strftime("%Y-%m-%d_%H-%M-%S") + ".pickle"
+        filepath = _generate_filepath(self._saving_directory, self._filename_prefix,
+            ".pickle" + _get_compression_suffix(self._compression))
+
+        if self._compression is None:
+            with open(filepath, "wb") as f:
+                pickle.dump(self._game_progress, f)
+
+            for name in self._ml_names:
+                target_slot = self._game_progress[name]
+                target_slot["scene_info"].clear()
+                target_slot["command"].clear()
+            return
+
+        # Create the file here to make the next round generate another filename
+        file = _open_file_for_writing(filepath, self._compression)
+        # Only one round is being compressed at a time to bound the memory usage
+        if self._dump_thread is not None:
+            self._dump_thread.join()
+        self._dump_thread = Thread(target = _dump_to_file,
+            args = (file, self._game_progress), name = "RecorderDumper")
+        self._dump_thread.start()
+
+        self._game_progress = self._create_game_progress()
+
+def _dump_to_file(file, obj):
+    """
+    Pickle the object to the file and close it
+
+    The pickled data is written to the file in frames, so the compression of
+    the file is done chunk by chunk.
+    """
+    with file as f:
+        pickle.dump(obj, f, pickle.HIGHEST_PROTOCOL)
+
+class StreamRecorder:
+    """
+    Record the scene information and the game command to the file frame by frame
+
+    The recorded frames are passed to a background thread, which pickles and appends
+    them to the log file during the round, so only a bounded number of frames are
+    kept in the memory. The log file is closed at `flush_to_file()`.
+
+    The log file starts with `STREAM_MAGIC`, followed by length-prefixed chunks.
+    Each chunk is 8-byte little-endian length and the pickled object.
+    The first chunk is the header dict, which has "record_format_version",
+    "ml_names", "game", and "game_params" keys. Each of the other chunks is a frame, which is a dict of
+    which the key is the name of ml client, and the value is a tuple
+    (`scene_info`, `command`). The client without scene information at that
+    frame is not in the dict. Use `iter_stream_frames()` to read the frames, or
+    `load_stream_record()` to convert the file to the layout of `Recorder`.
+    If the compression is specified, the whole file is compressed, and
+    the compression is also done in the background thread.
+    """
+    def __init__(
+            self, ml_names: list, saving_directory: Path,
+            filename_prefix: str = "", max_pending_frames: int = 256,
+            game_name: str = None, game_params: list = None,
+            compression: str = None):
+        """
+        Constructor
+
+        @param ml_names A list containing the name of all ml clients
+        @param saving_directory Specify the directory for saving files
+        @param filename_prefix Specify the prefix of the filename to be generated.
+               The filename will be "<prefix>_YYYY-MM-DD_hh-mm-ss.stream",
+               where the time is the start time of the round.
+        @param max_pending_frames The maximum number of frames waiting to be written.
+               If it's reached, `record()` will block until the frames are written.
+        @param game_name The name of the game to be written in the header
+        @param game_params A list of game parameters in string to be written
+               in the header
+        @param compression The codec in `COMPRESSION_CODECS` for compressing
+               the log file, or None for no compression. The suffix of the codec
+               is appended to the filename, such as ".stream.gz".
+        """
+        _check_compression(compression)
+        self._compression = compression
+
+        self._saving_directory = saving_directory
+        if not self._saving_directory.exists():
+            self._saving_directory.mkdir()
+
+        if not isinstance(filename_prefix, str):
+            raise TypeError("'filename_prefix' should be the type of 'str'")
+        self._filename_prefix = filename_prefix
+
+        self._ml_names = ml_names
+        self._max_pending_frames = max_pending_frames
+        self._game_name = game_name
+        self._game_params = list(game_params or [])
+        self._writer = None
+
+    def record(self, scene_info_dict: dict, cmd_dict: dict):
+        """
+        Record the scene information and the command
 
-        if self._filename_prefix:
-            filename = self._filename_prefix + "_" + filename
+        The log file is created at the first frame of the round.
 
-        filepath = self._saving_directory.joinpath(filename)
-        with open(filepath, "wb") as f:
-            pickle.dump(self._game_progress, f)
+        @param scene_info_dict A dict storing the scene information for each client
+        @param cmd_dict A dict storing the command received from each client
+        """
+        if self._writer is None:
+            # Create the file here to make the next round generate another filename
+            filepath = _generate_filepath(self._saving_directory, self._filename_prefix,
+                ".stream" + _get_compression_suffix(self._compression))
+            self._writer = _StreamWriter(
+                _open_file_for_writing(filepath, self._compression),
+                {
+                    "record_format_version": RECORD_FORMAT_VERSION,
+                    "ml_names": list(self._ml_names),
+                    "game": self._game_name,
+                    "game_params": self._game_params
+                },
+                self._max_pending_frames)
+            self._writer.start()
 
+        frame = {}
         for name in self._ml_names:
-            target_slot = self._game_progress[name]
-            target_slot["scene_info"].clear()
-            target_slot["command"].clear()
+            scene_info = scene_info_dict.get(name, None)
+            if scene_info:
+                frame[name] = (scene_info, cmd_dict.get(name, None))
+
+        self._writer.write(frame)
+
+    def flush_to_file(self):
+        """
+        Close the log file of the current round
+
+        It doesn't wait for the remaining frames to be written.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+class _StreamWriter(Thread):
+    """
+    The thread for writing the frames to the log file of the "stream" format
+
+    The thread is not a daemon thread, so the remaining frames will be written
+    before the program exits.
+    """
+    # The object for notifying the thread to close the file
+    _CLOSE = object()
+
+    def __init__(self, file, header: dict, max_pending_frames: int):
+        """
+        Constructor
+
+        @param file The file object opened in binary mode, which may compress
+               the written data. It will be closed by the thread.
+        @param header The header dict to be written at first
+        @param max_pending_frames The maximum number of frames waiting to be written
+        """
+        super().__init__(name = "StreamWriter")
+
+        self._file = file
+        self._header = header
+        self._pending_frames = Queue(max_pending_frames)
+        self._error = None
+
+    def write(self, frame):
+        """
+        Pass the frame to the thread for writing
+
+        If an error occurred in the thread, it will be raised here.
+        """
+        if self._error is not None:
+            raise self._error
+        self._pending_frames.put(frame)
+
+    def close(self):
+        """
+        Notify the thread to close the file after the remaining frames are written
+        """
+        self._pending_frames.put(_StreamWriter._CLOSE)
+
+    def run(self):
+        try:
+            with self._file as f:
+                f.write(STREAM_MAGIC)
+                self._write_chunk(f, self._header)
+
+                while True:
+                    frame = self._pending_frames.get()
+                    if frame is _StreamWriter._CLOSE:
+                        break
+                    # The scene information shared by several clients
+                    # is pickled only once in a frame.
+                    self._write_chunk(f, frame)
+        except Exception as e:
+            self._error = e
+            # Keep consuming frames to not block the caller
+            while self._pending_frames.get() is not _StreamWriter._CLOSE:
+                pass
+
+    def _write_chunk(self, f, obj):
+        data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        f.write(_CHUNK_LENGTH.pack(len(data)))
+        f.write(data)
+
+def iter_stream_frames(filepath):
+    """
+    Lazily read the frames from the log file of the "stream" format
+
+    The compressed log file is decompressed transparently.
+
+    @param filepath The path of the log file
+    @return A generator yielding the header dict at first, and then each frame,
+            which is a dict of which the key is the name of ml client and
+            the value is a tuple (`scene_info`, `command`).
+    """
+    with open_log_file(filepath) as f:
+        if f.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+            raise ValueError("'{}' is not a log file of the stream format"
+                .format(filepath))
+
+        while True:
+            try:
+                length_bytes = f.read(_CHUNK_LENGTH.size)
+                if len(length_bytes) < _CHUNK_LENGTH.size:
+                    # Reach the end of the file, or the last chunk is incomplete
+                    # because the program was terminated while writing.
+                    return
+
+                data = f.read(_CHUNK_LENGTH.unpack(length_bytes)[0])
+            except EOFError:
+                # The compressed file is truncated
+                return
+
+            try:
+                yield pickle.loads(data)
+            except (pickle.UnpicklingError, EOFError):
+                return
+
+def load_stream_record(filepath) -> dict:
+    """
+    Load the log file of the "stream" format and convert it to the layout of
+    the log file generated by `Recorder`
+
+    The returned dict can be dumped by `pickle.dump()` to get the same log file
+    as the one of the "pickle" format.
+
+    @param filepath The path of the log file
+    @return The game progress of which "record_format_version" is
+            `RECORD_FORMAT_VERSION`
+    """
+    frames = iter_stream_frames(filepath)
+    header = next(frames)
+
+    game_progress = {
+        "record_format_version": header["record_format_version"]
+    }
+    for name in header["ml_names"]:
+        game_progress[name] = {
+            "scene_info": [],
+            "command": []
+        }
+
+    for frame in frames:
+        for name, (scene_info, command) in frame.items():
+            target_slot = game_progress[name]
+            target_slot["scene_info"].append(scene_info)
+            target_slot["command"].append(command)
+
+    return game_progress
 
 class DummyRecorder:
     """
@@ -0,0 +1,241 @@
+"""
+The one-way communication objects based on a ring buffer in the shared memory
+
+The sending end pickles the object into a fixed-size slot of the ring buffer,
+and the receiving end unpickles the object from it. If the receiving end falls
+behind the sending end for more than the size of the ring buffer, the oldest
+objects are overwritten and dropped.
+
+The pickled object larger than the slot is sent via an overflow pipe instead,
+and its slot only records that the object is in the pipe. The data in the pipe
+is prefixed with the sequence number of the object, so that the data of
+the dropped objects can be skipped.
+
+The layout of the shared memory:
+- Header: The sequence number of the next object to be written (8 bytes)
+- Slots: `num_slots` slots. Each slot stores
+    - The sequence number of the stored object plus 1. It's 0 when the slot
+      is empty or being written (8 bytes)
+    - The length of the pickled object, or `_OVERFLOW_LENGTH` if the object
+      is sent via the overflow pipe (8 bytes)
+    - The pickled object (`slot_size` bytes)
+"""
+
+import pickle
+import struct
+
+from multiprocessing import Pipe, Semaphore
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:     # Python < 3.8
+    shared_memory = None
+
+DEFAULT_NUM_SLOTS = 16
+DEFAULT_SLOT_SIZE = 64 * 1024
+
+_HEADER_SIZE = 8
+_SLOT_HEADER_SIZE = 16
+_UINT64 = struct.Struct("Q")
+_OVERFLOW_LENGTH = 2 ** 64 - 1
+
+def is_available() -> bool:
+    """
+    Check if the shared memory is supported by the python
+    """
+    return shared_memory is not None
+
+def ShmPipe(num_slots: int = DEFAULT_NUM_SLOTS, slot_size: int = DEFAULT_SLOT_SIZE):
+    """
+    Create a pair of communication objects connected by a shared memory ring buffer
+
+    It's similar to `multiprocessing.Pipe(False)`, but the objects can only be
+    sent from the sending end to the receiving end.
+
+    @param num_slots The number of slots in the ring buffer
+    @param slot_size The maximum size in bytes of the pickled object in a slot.
+           The larger one is sent via the overflow pipe.
+    @return A tuple (`recv_end`, `send_end`)
+    """
+    if not is_available():
+        raise RuntimeError("The shared memory requires python 3.8 or later")
+    if num_slots < 2:
+        raise ValueError("The number of slots should be at least 2")
+
+    shm = shared_memory.SharedMemory(create = True,
+        size = _HEADER_SIZE + num_slots * (_SLOT_HEADER_SIZE + slot_size))
+    shm.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+    for i in range(num_slots):
+        _UINT64.pack_into(shm.buf, _slot_offset(i, slot_size), 0)
+
+    # Signaled once for each sent object
+    doorbell = Semaphore(0)
+    overflow_recv_end, overflow_send_end = Pipe(False)
+
+    return (ShmRecvEnd(shm, doorbell, num_slots, slot_size, overflow_recv_end),
+        ShmSendEnd(shm, doorbell, num_slots, slot_size, overflow_send_end))
+
+def _slot_offset(slot_id, slot_size):
+    return _HEADER_SIZE + slot_id * (_SLOT_HEADER_SIZE + slot_size)
+
+class ShmSendEnd:
+    """
+    The sending end of the shared memory ring buffer
+    """
+    def __init__(self, shm, doorbell, num_slots, slot_size, overflow_send_end):
+        self._shm = shm
+        self._doorbell = doorbell
+        self._num_slots = num_slots
+        self._slot_size = slot_size
+        self._overflow_send_end = overflow_send_end
+        self._overflow_warned = False
+        self._write_seq = 0
+
+    def send(self, obj):
+        """
+        Pickle the object to the next slot of the ring buffer
+        """
+        self.send_bytes(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+    def send_bytes(self, data):
+        """
+        Write the pickled object to the next slot of the ring buffer
+
+        The receiving end will unpickle it in `recv()`. If the data is larger
+        than the slot, it's sent via the overflow pipe.
+        """
+        buf = self._shm.buf
+        seq = self._write_seq
+        offset = _slot_offset(seq % self._num_slots, self._slot_size)
+        data_offset = offset + _SLOT_HEADER_SIZE
+        is_overflow = len(data) > self._slot_size
+
+        # Mark the slot as being written
+        _UINT64.pack_into(buf, offset, 0)
+        if is_overflow:
+            _UINT64.pack_into(buf, offset + 8, _OVERFLOW_LENGTH)
+        else:
+            buf[data_offset:data_offset + len(data)] = data
+            _UINT64.pack_into(buf, offset + 8, len(data))
+        _UINT64.pack_into(buf, offset, seq + 1)
+
+        self._write_seq = seq + 1
+        _UINT64.pack_into(buf, 0, self._write_seq)
+        self._doorbell.release()
+
+        # Send the data after the slot is written, so that the receiving end
+        # knows that it should read the pipe. Otherwise, sending the large data
+        # may block forever.
+        if is_overflow:
+            if not self._overflow_warned:
+                print("Warning: The pickled object ({} bytes) is larger than "
+                    "the slot size of the shared memory ({} bytes). "
+                    "Send it via the pipe instead."
+                    .format(len(data), self._slot_size))
+                self._overflow_warned = True
+            self._overflow_send_end.send_bytes(_UINT64.pack(seq) + data)
+
+    def close(self):
+        """
+        Release the shared memory
+
+        The receiving end which already attached the shared memory can still read it.
+        """
+        self._shm.close()
+        self._shm.unlink()
+        self._overflow_send_end.close()
+
+class ShmRecvEnd:
+    """
+    The receiving end of the shared memory ring buffer
+    """
+    def __init__(self, shm, doorbell, num_slots, slot_size, overflow_recv_end):
+        self._shm = shm
+        self._doorbell = doorbell
+        self._num_slots = num_slots
+        self._slot_size = slot_size
+        self._overflow_recv_end = overflow_recv_end
+        self._read_seq = 0
+        self._doorbell_acquired = False
+
+    def _has_data(self):
+        return _UINT64.unpack_from(self._shm.buf, 0)[0] > self._read_seq
+
+    def poll(self, timeout = 0):
+        """
+        Check whether there is an object to read
+
+        @param timeout The maximum time in seconds to block.
+               If it's None, block until an object is arrived.
+        """
+        if self._has_data():
+            return True
+
+        if not self._doorbell_acquired:
+            if timeout is not None and timeout <= 0:
+                return False
+            self._doorbell_acquired = self._doorbell.acquire(timeout = timeout)
+
+        return self._has_data()
+
+    def recv(self):
+        """
+        Receive the next object. Block until an object is arrived.
+        """
+        # Consume a signal for each received object, and the signal of
+        # the overwritten object will be consumed by an empty loop.
+        while True:
+            if not self._doorbell_acquired:
+                self._doorbell.acquire()
+            self._doorbell_acquired = False
+
+            obj_found, obj = self._read_next()
+            if obj_found:
+                return obj
+
+    def _read_next(self):
+        """
+        Read the next object in the ring buffer
+
+        @return A tuple (`obj_found`, `obj`)
+        """
+        buf = self._shm.buf
+        while True:
+            write_seq = _UINT64.unpack_from(buf, 0)[0]
+            if write_seq <= self._read_seq:
+                return False, None
+
+            # Skip the objects which may be overwritten. The slot of `write_seq`
+            # may be being written.
+            self._read_seq = max(self._read_seq, write_seq - self._num_slots + 1)
+
+            seq = self._read_seq
+            offset = _slot_offset(seq % self._num_slots, self._slot_size)
+            data_offset = offset + _SLOT_HEADER_SIZE
+
+            # Check the sequence number before and after copying the data
+            # to make sure that the slot is not overwritten while copying.
+            if _UINT64.unpack_from(buf, offset)[0] != seq + 1:
+                continue
+            length = _UINT64.unpack_from(buf, offset + 8)[0]
+            if length != _OVERFLOW_LENGTH:
+                data = bytes(buf[data_offset:data_offset + length])
+            if _UINT64.unpack_from(buf, offset)[0] != seq + 1:
+                continue
+
+            self._read_seq = seq + 1
+            if length == _OVERFLOW_LENGTH:
+                data = self._recv_overflow(seq)
+            return True, pickle.loads(data)
+
+    def _recv_overflow(self, seq):
+        """
+        Receive the data of the specified object from the overflow pipe
+
+        The data of the objects before it was sent but dropped from the ring
+        buffer, so it's skipped.
+        """
+        while True:
+            data = self._overflow_recv_end.recv_bytes()
+            if _UINT64.unpack_from(data)[0] == seq:
+                return data[_UINT64.size:]
@@ -0,0 +1,122 @@
+"""
+The vectorized environment for running several instances of a game in one process
+"""
+
+from .exceptions import GameConfigError
+from .gameconfig import GameConfig
+
+class VecGame:
+    """
+    Run `n` instances of a game in the current process and update them together
+
+    The games are executed in the headless mode, so the game must support it.
+    There is no ml process and no communication pipe. The caller generates
+    the commands from the scene information and passes them to `step()`.
+
+    For example:
+    ```python
+    vec_game = VecGame("arkanoid", 8, ["NORMAL", "3"])
+    scene_infos = vec_game.reset()
+    while True:
+        commands = [{"ml": my_policy(s["ml"])} for s in scene_infos]
+        scene_infos, dones, infos = vec_game.step(commands)
+    ```
+
+    @var num_games The number of the game instances
+    @var ml_names The name of ml clients defined by the game
+    """
+
+    def __init__(self, game_name: str, n: int, game_params = ()):
+        """
+        Constructor
+
+        @param game_name The name of the game
+        @param n The number of the game instances to be created
+        @param game_params A list of game parameters. They are parsed by the
+               `GAME_PARAMS` defined in the game config as the command line does,
+               so the string is acceptable, such as `["NORMAL", "3"]`.
+        """
+        if n < 1:
+            raise ValueError("The number of game instances should be positive")
+
+        game_config = GameConfig(game_name)
+        game_setup = game_config.game_setup
+        if not game_setup["support_headless"]:
+            raise GameConfigError(
+                f"The game '{game_name}' doesn't support the headless mode. "
+                "Cannot run it in the vectorized environment.")
+
+        self._game_cls = game_setup["game"]
+        self._game_params = game_config.parse_game_params(game_params)
+        self.num_games = n
+        self.ml_names = [client["name"] for client in game_setup["ml_clients"]]
+        self._games = [self._create_game() for _ in range(n)]
+
+    def _create_game(self):
+        """
+        Create a game instance in the headless mode
+        """
+        return self._game_cls(*self._game_params, headless = True)
+
+    def reset(self) -> list:
+        """
+        Recreate all game instances
+
+        @return A list of the scene information of each game. Each element is
+                the dict returned from `get_player_scene_info()` of the game.
+        """
+        self._games = [self._create_game() for _ in range(self.num_games)]
+        return [game.get_player_scene_info() for game in self._games]
+
+    def step(self, commands: list):
+        """
+        Update all game instances with the given commands for one frame
+
+        The game which ends at this frame is reset automatically. Its returned
+        scene information is the one of the next round, and the last scene
+        information of the ended round is stored in the info.
+
+        @param commands A list of command dicts, one for each game. The command dict
+               is the same as the one passed to the `update()` of the game,
+               such as `{"ml": "MOVE_LEFT"}`.
+        @return A tuple (`scene_infos`, `dones`, `infos`).
+                `scene_infos` is a list of the scene information of each game.
+                `dones` is a list of bool indicating whether the game ended at
+                this frame.
+                `infos` is a list of dict. For the ended game, it has
+                "terminal_scene_info" and "game_result" keys, which are the last
+                scene information and the return value of `get_game_result()` of
+                the ended round. Otherwise, it's an empty dict.
+        """
+        if len(commands) != self.num_games:
+            raise ValueError("The number of commands should be the same as "
+                f"the number of game instances ({self.num_games})")
+
+        scene_infos = []
+        dones = []
+        infos = []
+        for i, (game, command) in enumerate(zip(self._games, commands)):
+            result = game.update(command)
+
+            if result == "RESET" or result == "QUIT":
+                info = {
+                    "terminal_scene_info": game.get_player_scene_info(),
+                    "game_result": game.get_game_result()
+                }
+
+                # The game which quits can't be reset, create a new one instead.
+                if result == "QUIT":
+                    game = self._create_game()
+                    self._games[i] = game
+                else:
+                    game.reset()
+
+                dones.append(True)
+                infos.append(info)
+            else:
+                dones.append(False)
+                infos.append({})
+
+            scene_infos.append(game.get_player_scene_info())
+
+        return scene_infos, dones, infos
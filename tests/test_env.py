@@ -0,0 +1,49 @@
+"""
+The tests of `mlgame.env`
+
+Usage: `python -m unittest discover tests` or `python -m pytest tests`
+"""
+
+import unittest
+
+from mlgame.env import make
+
+class EnvResetTest(unittest.TestCase):
+    def setUp(self):
+        self.env = make("arkanoid", "NORMAL", 1)
+
+    def test_reset_in_the_middle_of_round(self):
+        self.env.reset()
+        for _ in range(50):
+            scene_info, status, done = self.env.step({"ml": "NONE"})
+        self.assertEqual(scene_info["ml"]["frame"], 50)
+        self.assertEqual(status, "GAME_ALIVE")
+        self.assertFalse(done)
+
+        scene_info = self.env.reset()
+        self.assertEqual(scene_info["ml"]["frame"], 0)
+        scene_info, _, _ = self.env.step({"ml": "NONE"})
+        self.assertEqual(scene_info["ml"]["frame"], 1)
+
+    def test_reset_after_round_ends(self):
+        self.env.reset()
+        done = False
+        while not done:
+            scene_info, status, done = self.env.step({"ml": "SERVE_TO_LEFT"})
+        self.assertEqual(status, "GAME_OVER")
+        self.assertEqual(status, self.env.get_game_result()["result"][0])
+
+        scene_info = self.env.reset()
+        self.assertEqual(scene_info["ml"]["frame"], 0)
+        self.assertEqual(scene_info["ml"]["status"], "GAME_ALIVE")
+
+    def test_step_after_round_ends(self):
+        self.env.reset()
+        done = False
+        while not done:
+            _, _, done = self.env.step({"ml": "SERVE_TO_LEFT"})
+        with self.assertRaises(RuntimeError):
+            self.env.step({"ml": "NONE"})
+
+if __name__ == "__main__":
+    unittest.main()